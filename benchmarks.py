@@ -0,0 +1,160 @@
+"""
+BENCHMARKS DO SISTEMA DE SIMULAÇÃO DE INVESTIMENTOS
+
+Medições simples com timeit para acompanhar o desempenho de caminhos
+críticos. Execute com:
+
+    python benchmarks.py
+"""
+
+import csv
+import io
+import itertools
+import json
+import os
+import subprocess
+import sys
+import timeit
+from dataclasses import asdict
+from datetime import datetime
+
+from main import (SistemaSimulacaoInvestimentos, Simulacao, ResultadoMensal,
+                  HistoricoModificacao, TipoTaxa, _texto_csv_lote, _valores_resultado)
+
+def _to_dict_legado(simulacao: Simulacao) -> dict:
+    """Serialização antiga: asdict recursivo e resultados um objeto por mês"""
+    data = asdict(simulacao)
+    data['tipo_taxa'] = simulacao.tipo_taxa.value
+    data['data_criacao'] = simulacao.data_criacao.isoformat()
+    data['data_modificacao'] = simulacao.data_modificacao.isoformat()
+    data['historico'] = [h.to_dict() for h in simulacao.historico]
+    return data
+
+def _from_dict_legado(data: dict) -> Simulacao:
+    """Desserialização antiga: reconstrói cada mês via **kwargs"""
+    data = dict(data)  # a versão antiga alterava o dicionário recebido
+    data['data_criacao'] = datetime.fromisoformat(data['data_criacao'])
+    data['data_modificacao'] = datetime.fromisoformat(data['data_modificacao'])
+    data['tipo_taxa'] = TipoTaxa(data['tipo_taxa'])
+    data['resultados'] = [ResultadoMensal(**r) for r in data['resultados']]
+    data['historico'] = [HistoricoModificacao.from_dict(h) for h in data['historico']]
+    return Simulacao(**data)
+
+def _medir(funcao, repeticoes: int) -> float:
+    """Melhor tempo médio por chamada, em milissegundos"""
+    return min(timeit.repeat(funcao, number=repeticoes, repeat=5)) / repeticoes * 1000
+
+def benchmark_codec_json(prazo_meses: int = 360, repeticoes: int = 200) -> None:
+    """Compara o codec JSON antigo com o atual em uma simulação de 360 meses"""
+    sistema = SistemaSimulacaoInvestimentos()
+    id_simulacao = sistema.criar_simulacao("Benchmark")
+    sistema.configurar_simulacao(id_simulacao, aporte_inicial=1000.0, aporte_mensal=500.0,
+                                 prazo_meses=prazo_meses, tipo_taxa=TipoTaxa.FIXA, taxa_fixa=0.8)
+    sistema.calcular_simulacao(id_simulacao)
+    simulacao = sistema.gerenciador.obter_simulacao(id_simulacao)
+
+    legado = _to_dict_legado(simulacao)
+    atual = simulacao.to_dict()
+    texto_legado = json.dumps(legado)
+    texto_atual = json.dumps(atual)
+
+    medidas = [
+        ("to_dict", lambda: _to_dict_legado(simulacao), simulacao.to_dict),
+        ("from_dict", lambda: _from_dict_legado(legado), lambda: Simulacao.from_dict(atual)),
+        ("salvar (to_dict + dumps)", lambda: json.dumps(_to_dict_legado(simulacao)),
+         lambda: json.dumps(simulacao.to_dict())),
+        ("carregar (loads + from_dict)", lambda: _from_dict_legado(json.loads(texto_legado)),
+         lambda: Simulacao.from_dict(json.loads(texto_atual))),
+    ]
+
+    print(f"\nCodec JSON - {prazo_meses} meses")
+    print(f"{'operação':<30}{'antigo (ms)':>12}{'atual (ms)':>12}{'ganho':>8}")
+    for nome, funcao_legada, funcao_atual in medidas:
+        antes = _medir(funcao_legada, repeticoes)
+        depois = _medir(funcao_atual, repeticoes)
+        print(f"{nome:<30}{antes:>12.3f}{depois:>12.3f}{antes / depois:>7.1f}x")
+    print(f"{'tamanho do JSON (bytes)':<30}{len(texto_legado):>12}{len(texto_atual):>12}")
+
+def _escrever_csv_lote_legado(arquivo, simulacoes: list) -> None:
+    """Escrita antiga do CSV em lote: format por célula e csv.writer por linha"""
+    writer = csv.writer(arquivo)
+    formatar = '{:.2f}'.format
+    for id_simulacao, resultados in simulacoes:
+        mes, *valores = zip(*map(_valores_resultado, resultados))
+        writer.writerows(zip(itertools.repeat(id_simulacao), mes, *(map(formatar, c) for c in valores)))
+
+def benchmark_csv_lote(total_simulacoes: int = 100, prazo_meses: int = 360, repeticoes: int = 3) -> None:
+    """Compara a formatação célula a célula do CSV em lote com a atual (uma % por linha)"""
+    sistema = SistemaSimulacaoInvestimentos()
+    simulacoes = []
+    for numero in range(total_simulacoes):
+        id_simulacao = sistema.criar_simulacao(f"Benchmark {numero}")
+        sistema.configurar_simulacao(id_simulacao, aporte_inicial=1000.0, aporte_mensal=500.0,
+                                     prazo_meses=prazo_meses, tipo_taxa=TipoTaxa.FIXA, taxa_fixa=0.8)
+        sistema.calcular_simulacao(id_simulacao)
+        simulacoes.append((id_simulacao, sistema.gerenciador.obter_simulacao(id_simulacao).resultados))
+
+    def legado():
+        _escrever_csv_lote_legado(io.StringIO(newline=''), simulacoes)
+
+    def atual():
+        io.StringIO(newline='').write(''.join(_texto_csv_lote(i, r) for i, r in simulacoes))
+
+    saida = io.StringIO(newline='')
+    _escrever_csv_lote_legado(saida, simulacoes)
+    assert saida.getvalue() == ''.join(_texto_csv_lote(i, r) for i, r in simulacoes)
+
+    antes = _medir(legado, repeticoes)
+    depois = _medir(atual, repeticoes)
+    print(f"\nCSV em lote - {total_simulacoes} simulações x {prazo_meses} meses")
+    print(f"{'operação':<30}{'antigo (ms)':>12}{'atual (ms)':>12}{'ganho':>8}")
+    print(f"{'formatar linhas':<30}{antes:>12.1f}{depois:>12.1f}{antes / depois:>7.1f}x")
+
+# Caminho só de cálculo executado em um interpretador novo: importa o main,
+# cria o sistema e calcula uma simulação, sem tocar em gráficos
+_SCRIPT_INICIALIZACAO = """
+import sys, time
+inicio = time.perf_counter()
+import main
+importado = time.perf_counter()
+sistema = main.SistemaSimulacaoInvestimentos()
+id_simulacao = sistema.criar_simulacao("Benchmark")
+sistema.configurar_simulacao(id_simulacao, aporte_inicial=1000.0, aporte_mensal=500.0,
+                             prazo_meses=360, tipo_taxa=main.TipoTaxa.FIXA, taxa_fixa=0.8)
+sistema.calcular_simulacao(id_simulacao)
+fim = time.perf_counter()
+pesados = [m for m in ("matplotlib", "numpy", "pyarrow", "asyncio", "sqlite3") if m in sys.modules]
+print((importado - inicio) * 1000, (fim - inicio) * 1000, ",".join(pesados), file=sys.stderr)
+"""
+
+def benchmark_inicializacao(meta_ms: float = 150.0, repeticoes: int = 5) -> bool:
+    """
+    Mede a inicialização a frio do caminho só de cálculo (import + cálculo)
+
+    Cada repetição roda em um processo novo, então os módulos não ficam em
+    cache no interpretador. Vale o melhor tempo das repetições.
+
+    Returns:
+        True se o tempo ficou dentro da meta e nenhum módulo pesado foi importado
+    """
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+    medidas = []
+    for _ in range(repeticoes):
+        processo = subprocess.run([sys.executable, "-c", _SCRIPT_INICIALIZACAO], cwd=diretorio,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+        importacao, total, pesados = (processo.stderr.strip().splitlines()[-1].split(" ") + [""])[:3]
+        medidas.append((float(total), float(importacao), pesados))
+
+    total, importacao, pesados = min(medidas)
+    dentro_da_meta = total <= meta_ms and not pesados
+    print(f"\nInicialização a frio - caminho só de cálculo (melhor de {repeticoes})")
+    print(f"{'import main (ms)':<30}{importacao:>12.1f}")
+    print(f"{'import + cálculo (ms)':<30}{total:>12.1f}{'meta':>8} {meta_ms:.0f}")
+    print(f"{'módulos pesados carregados':<30}{pesados or 'nenhum':>12}")
+    print("Resultado: " + ("dentro da meta" if dentro_da_meta else "ACIMA DA META"))
+    return dentro_da_meta
+
+if __name__ == "__main__":
+    benchmark_codec_json()
+    benchmark_csv_lote()
+    sys.exit(0 if benchmark_inicializacao() else 1)
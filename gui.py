@@ -22,6 +22,8 @@ class InterfaceSimulador:
     def __init__(self):
         self.sistema = SistemaSimulacaoInvestimentos()
         self.simulacao_atual = None
+        self.diretorio_workspace = None
+        self.janelas_graficos = {}  # id da simulação -> janela de gráficos aberta
 
         # Janela principal
         self.root = tk.Tk()
@@ -139,6 +141,9 @@ class InterfaceSimulador:
         ttk.Button(parent, text="Comparar Selecionadas", command=self.comparar_simulacoes,
                   style='Accent.TButton', cursor='hand2').pack(padx=15, pady=(0, 15), fill=tk.X)
 
+        ttk.Button(parent, text="Importar Planos (CSV)", command=self.importar_planos_csv,
+                  style='Outline.TButton', cursor='hand2').pack(padx=15, pady=(0, 15), fill=tk.X)
+
         # Container para Treeview
         tree_container = tk.Frame(parent, bg=self.cores['bg_secundario'])
         tree_container.pack(fill=tk.BOTH, expand=True, padx=15, pady=(0, 15))
@@ -245,10 +250,19 @@ class InterfaceSimulador:
         ttk.Button(actions_frame, text="Ver Histórico", command=self.ver_historico,
                   style='Outline.TButton', cursor='hand2').pack(side=tk.LEFT, padx=(0, 10))
 
+        ttk.Button(actions_frame, text="Desfazer", command=self.desfazer_modificacao,
+                  style='Outline.TButton', cursor='hand2').pack(side=tk.LEFT, padx=(0, 10))
+
+        ttk.Button(actions_frame, text="Refazer", command=self.refazer_modificacao,
+                  style='Outline.TButton', cursor='hand2').pack(side=tk.LEFT, padx=(0, 10))
+
         if MATPLOTLIB_DISPONIVEL:
             ttk.Button(actions_frame, text="Ver Gráficos", command=self.ver_graficos,
                       style='Outline.TButton', cursor='hand2').pack(side=tk.LEFT, padx=(0, 10))
 
+        ttk.Button(actions_frame, text="Salvar Tudo", command=self.salvar_workspace,
+                  style='Outline.TButton', cursor='hand2').pack(side=tk.RIGHT, padx=(0, 10))
+
         ttk.Button(actions_frame, text="Exportar CSV", command=self.exportar_csv,
                   style='Outline.TButton', cursor='hand2').pack(side=tk.RIGHT, padx=(0, 10))
 
@@ -365,6 +379,24 @@ class InterfaceSimulador:
         btn_frame = tk.Frame(dialog, bg=self.cores['bg_principal'])
         btn_frame.pack(pady=10)
 
+        def importar_taxas():
+            arquivo = filedialog.askopenfilename(
+                title="Importar taxas",
+                filetypes=[("Arquivos CSV", "*.csv"), ("CSV comprimido", "*.csv.gz *.csv.xz *.csv.zz")]
+            )
+            if not arquivo:
+                return
+            sucesso, resultado = self.sistema.importar_taxas_csv(arquivo)
+            if not sucesso:
+                messagebox.showerror("Erro", resultado)
+                return
+            for entry, taxa in zip(entries, resultado):
+                entry.delete(0, tk.END)
+                entry.insert(0, str(taxa))
+            if len(resultado) != prazo:
+                messagebox.showwarning("Atenção",
+                                       f"O arquivo tem {len(resultado)} taxas e o prazo é de {prazo} meses.")
+
         def salvar_taxas():
             try:
                 taxas = [float(entry.get()) for entry in entries]
@@ -377,6 +409,8 @@ class InterfaceSimulador:
             except ValueError:
                 messagebox.showerror("Erro", "Todas as taxas devem ser números válidos!")
 
+        ttk.Button(btn_frame, text="Importar CSV", command=importar_taxas,
+                  style='Outline.TButton').pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Salvar", command=salvar_taxas,
                   style='Accent.TButton').pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Cancelar", command=dialog.destroy,
@@ -446,6 +480,7 @@ class InterfaceSimulador:
         if confirmar:
             sucesso, msg = self.sistema.excluir_simulacao(id_simulacao)
             if sucesso:
+                self.fechar_janela_graficos(id_simulacao)
                 messagebox.showinfo("Sucesso", msg)
 
                 # Se for a simulação atual, limpa os campos
@@ -552,7 +587,8 @@ class InterfaceSimulador:
 
     def carregar_dados_simulacao(self, id_simulacao):
         """Carrega dados da simulação nos campos"""
-        simulacao = self.sistema.gerenciador.obter_simulacao(id_simulacao)
+        # Os campos só usam parâmetros; resultados sob demanda continuam no disco
+        simulacao = self.sistema.gerenciador.simulacoes.get(id_simulacao)
         if not simulacao:
             return
 
@@ -599,6 +635,7 @@ class InterfaceSimulador:
             if resultado['sucesso']:
                 self.exibir_resultados(resultado)
                 self.atualizar_lista_simulacoes()
+                self.atualizar_janela_graficos(self.simulacao_atual)
             else:
                 self.text_resultados.insert(tk.END, "ERRO NO CÁLCULO:\n")
                 for erro in resultado['erros']:
@@ -646,25 +683,47 @@ class InterfaceSimulador:
         arquivo = filedialog.asksaveasfilename(
             title="Salvar simulação",
             defaultextension=".json",
-            filetypes=[("Arquivos JSON", "*.json")]
+            filetypes=[("Arquivos JSON", "*.json"), ("JSON comprimido", "*.json.gz *.json.xz *.json.zz"),
+                       ("Snapshot binário", "*.sinb")]
         )
 
         if arquivo:
-            sucesso, msg = self.sistema.salvar_simulacao(self.simulacao_atual, arquivo)
+            if arquivo.endswith('.sinb'):
+                sucesso, msg = self.sistema.salvar_simulacao_binaria(self.simulacao_atual, arquivo)
+            else:
+                sucesso, msg = self.sistema.salvar_simulacao(self.simulacao_atual, arquivo)
             if sucesso:
                 messagebox.showinfo("Sucesso", msg)
             else:
                 messagebox.showerror("Erro", msg)
 
+    def salvar_workspace(self):
+        """Salva todas as simulações alteradas no diretório do workspace"""
+        if not self.diretorio_workspace:
+            diretorio = filedialog.askdirectory(title="Diretório do workspace")
+            if not diretorio:
+                return
+            self.diretorio_workspace = diretorio
+
+        sucesso, msg = self.sistema.salvar_workspace(self.diretorio_workspace)
+        if sucesso:
+            messagebox.showinfo("Sucesso", msg)
+        else:
+            messagebox.showerror("Erro", msg)
+
     def carregar_simulacao(self):
         """Carrega simulação de arquivo"""
         arquivo = filedialog.askopenfilename(
             title="Carregar simulação",
-            filetypes=[("Arquivos JSON", "*.json")]
+            filetypes=[("Arquivos JSON", "*.json"), ("JSON comprimido", "*.json.gz *.json.xz *.json.zz"),
+                       ("Snapshot binário", "*.sinb")]
         )
 
         if arquivo:
-            sucesso, resultado = self.sistema.carregar_simulacao(arquivo)
+            if arquivo.endswith('.sinb'):
+                sucesso, resultado = self.sistema.carregar_simulacao_binaria(arquivo, sob_demanda=True)
+            else:
+                sucesso, resultado = self.sistema.carregar_simulacao(arquivo)
             if sucesso:
                 self.simulacao_atual = resultado
                 self.carregar_dados_simulacao(resultado)
@@ -673,6 +732,26 @@ class InterfaceSimulador:
             else:
                 messagebox.showerror("Erro", resultado)
 
+    def importar_planos_csv(self):
+        """Importa planos de um CSV como novas simulações"""
+        arquivo = filedialog.askopenfilename(
+            title="Importar planos",
+            filetypes=[("Arquivos CSV", "*.csv"), ("CSV comprimido", "*.csv.gz *.csv.xz *.csv.zz")]
+        )
+
+        if arquivo:
+            sucesso, resultado = self.sistema.importar_planos_csv(arquivo)
+            if sucesso:
+                self.atualizar_lista_simulacoes()
+                mensagem = f"{len(resultado['ids'])} planos importados."
+                if resultado['linhas_invalidas']:
+                    linha, erro = resultado['erros'][0]
+                    mensagem += (f"\n{resultado['linhas_invalidas']} linhas ignoradas "
+                                 f"(primeira: linha {linha} - {erro})")
+                messagebox.showinfo("Importação", mensagem)
+            else:
+                messagebox.showerror("Erro", resultado)
+
     def exportar_csv(self):
         """Exporta simulação atual para CSV"""
         if not self.simulacao_atual:
@@ -682,7 +761,7 @@ class InterfaceSimulador:
         arquivo = filedialog.asksaveasfilename(
             title="Exportar para CSV",
             defaultextension=".csv",
-            filetypes=[("Arquivos CSV", "*.csv")]
+            filetypes=[("Arquivos CSV", "*.csv"), ("CSV comprimido", "*.csv.gz *.csv.xz *.csv.zz")]
         )
 
         if arquivo:
@@ -750,6 +829,44 @@ class InterfaceSimulador:
         ttk.Button(dialog, text="Fechar", command=dialog.destroy,
                   style='Accent.TButton').pack(pady=10)
 
+    def desfazer_modificacao(self):
+        """Desfaz a última modificação da simulação atual"""
+        if not self.simulacao_atual:
+            messagebox.showwarning("Aviso", "Nenhuma simulação selecionada!")
+            return
+
+        sucesso, msg = self.sistema.desfazer_modificacao(self.simulacao_atual)
+        if sucesso:
+            self.recarregar_simulacao_atual()
+        else:
+            messagebox.showinfo("Desfazer", msg)
+
+    def refazer_modificacao(self):
+        """Refaz a última modificação desfeita da simulação atual"""
+        if not self.simulacao_atual:
+            messagebox.showwarning("Aviso", "Nenhuma simulação selecionada!")
+            return
+
+        sucesso, msg = self.sistema.refazer_modificacao(self.simulacao_atual)
+        if sucesso:
+            self.recarregar_simulacao_atual()
+        else:
+            messagebox.showinfo("Refazer", msg)
+
+    def recarregar_simulacao_atual(self):
+        """Atualiza campos, lista e resultados após restaurar um estado"""
+        self.carregar_dados_simulacao(self.simulacao_atual)
+        self.atualizar_lista_simulacoes()
+
+        self.text_resultados.delete(1.0, tk.END)
+        # Resultados restaurados do cache do estado; não há o que recalcular
+        resultado = self.sistema.resumir_resultados(self.simulacao_atual)
+        if resultado['sucesso']:
+            self.exibir_resultados(resultado)
+            self.atualizar_janela_graficos(self.simulacao_atual)
+        else:
+            self.text_resultados.insert(tk.END, "Parâmetros restaurados.\nClique em 'Calcular Simulação' para ver os resultados.")
+
     def ver_graficos(self):
         """Exibe gráficos da simulação"""
         if not MATPLOTLIB_DISPONIVEL:
@@ -765,15 +882,25 @@ class InterfaceSimulador:
             messagebox.showwarning("Aviso", "Calcule a simulação antes de visualizar os gráficos!")
             return
 
+        # Reaproveita a janela já aberta para esta simulação
+        janela = self.janelas_graficos.get(self.simulacao_atual)
+        if janela and janela['dialog'].winfo_exists():
+            self.atualizar_janela_graficos(self.simulacao_atual)
+            janela['dialog'].lift()
+            return
+
         # Cria janela de gráficos
+        id_simulacao = self.simulacao_atual
         dialog = tk.Toplevel(self.root)
         dialog.title(f"Gráficos - {simulacao.nome}")
         dialog.geometry("1000x900")
         dialog.configure(bg=self.cores['bg_principal'])
+        dialog.protocol("WM_DELETE_WINDOW", lambda: self.fechar_janela_graficos(id_simulacao))
 
         # Título
-        ttk.Label(dialog, text=f"Gráficos da Simulação - {simulacao.nome}",
-                 style='Titulo.TLabel').pack(pady=20)
+        titulo = ttk.Label(dialog, text=f"Gráficos da Simulação - {simulacao.nome}",
+                           style='Titulo.TLabel')
+        titulo.pack(pady=20)
 
         # Notebook para separar os gráficos
         notebook = ttk.Notebook(dialog)
@@ -783,26 +910,60 @@ class InterfaceSimulador:
         tab_evolucao = tk.Frame(notebook, bg=self.cores['bg_secundario'])
         notebook.add(tab_evolucao, text="Evolução do Investimento")
 
-        fig_evolucao = self.sistema.criar_grafico_evolucao(self.simulacao_atual)
-        if fig_evolucao:
-            canvas_evolucao = FigureCanvasTkAgg(fig_evolucao, master=tab_evolucao)
-            canvas_evolucao.draw()
-            canvas_evolucao.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
         # Aba 2: Gráfico de Composição
         tab_composicao = tk.Frame(notebook, bg=self.cores['bg_secundario'])
         notebook.add(tab_composicao, text="Composição do Saldo")
 
-        fig_composicao = self.sistema.criar_grafico_composicao(self.simulacao_atual)
-        if fig_composicao:
-            canvas_composicao = FigureCanvasTkAgg(fig_composicao, master=tab_composicao)
-            canvas_composicao.draw()
-            canvas_composicao.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
         # Botão fechar
-        ttk.Button(dialog, text="Fechar", command=dialog.destroy,
+        ttk.Button(dialog, text="Fechar", command=lambda: self.fechar_janela_graficos(id_simulacao),
                   style='Accent.TButton').pack(pady=10)
 
+        self.janelas_graficos[id_simulacao] = {
+            'dialog': dialog,
+            'titulo': titulo,
+            'abas': {
+                'evolucao': (tab_evolucao, self.sistema.criar_grafico_evolucao),
+                'composicao': (tab_composicao, self.sistema.criar_grafico_composicao),
+            },
+            'canvas': {},
+        }
+        self.atualizar_janela_graficos(id_simulacao)
+
+    def atualizar_janela_graficos(self, id_simulacao):
+        """Redesenha os gráficos de uma janela aberta após recálculo ou renomeação"""
+        janela = self.janelas_graficos.get(id_simulacao)
+        if not janela or not janela['dialog'].winfo_exists():
+            self.janelas_graficos.pop(id_simulacao, None)
+            return
+
+        simulacao = self.sistema.gerenciador.obter_simulacao(id_simulacao)
+        if not simulacao or not simulacao.resultados:
+            return
+        janela['dialog'].title(f"Gráficos - {simulacao.nome}")
+        janela['titulo'].config(text=f"Gráficos da Simulação - {simulacao.nome}")
+
+        for vista, (aba, criar_figura) in janela['abas'].items():
+            # O gerador devolve a mesma figura já atualizada; só recria o canvas se ela mudou
+            fig = criar_figura(id_simulacao)
+            canvas = janela['canvas'].get(vista)
+            if canvas is not None and fig is canvas.figure:
+                canvas.draw_idle()
+                continue
+            if canvas is not None:
+                canvas.get_tk_widget().destroy()
+                del janela['canvas'][vista]
+            if fig:
+                canvas = FigureCanvasTkAgg(fig, master=aba)
+                canvas.draw()
+                canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+                janela['canvas'][vista] = canvas
+
+    def fechar_janela_graficos(self, id_simulacao):
+        """Fecha a janela de gráficos de uma simulação, se estiver aberta"""
+        janela = self.janelas_graficos.pop(id_simulacao, None)
+        if janela and janela['dialog'].winfo_exists():
+            janela['dialog'].destroy()
+
 
     def comparar_simulacoes(self):
         """Compara simulações selecionadas"""
@@ -9,24 +9,58 @@ Membros da Equipe:
 - Nick J: Implementou UC03 - Gerenciar Simulações
 """
 
+from __future__ import annotations
+
+import gc
+import io
+import codecs
+import copy
 import json
+import weakref
 import math
-import csv
+import operator
+import gzip
+import lzma
+import os
+import sys
+import pickle
+import mmap
+import zlib
+import struct
+import time
+import threading
+import bisect
+import itertools
+import importlib.util
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable, TYPE_CHECKING
 from enum import Enum
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
-try:
-    import matplotlib
-    matplotlib.use('TkAgg')
-    import matplotlib.pyplot as plt
+# Dependências pesadas são importadas só onde são usadas (gráficos, formatos
+# colunares, async, SQLite, processos): quem só calcula não paga pelo
+# matplotlib na inicialização. Aqui apenas se verifica se estão instaladas.
+MATPLOTLIB_DISPONIVEL = importlib.util.find_spec('matplotlib') is not None
+if not MATPLOTLIB_DISPONIVEL:
+    print("Aviso: matplotlib não está instalado. Funcionalidade de gráficos desabilitada.")
+
+NUMPY_DISPONIVEL = importlib.util.find_spec('numpy') is not None
+PYARROW_DISPONIVEL = importlib.util.find_spec('pyarrow') is not None
+
+if TYPE_CHECKING:
+    import asyncio
+    import sqlite3
+    from concurrent.futures import ThreadPoolExecutor
     from matplotlib.figure import Figure
-    MATPLOTLIB_DISPONIVEL = True
+
+try:
+    import fcntl
+    FCNTL_DISPONIVEL = True
 except ImportError:
-    MATPLOTLIB_DISPONIVEL = False
-    Figure = Any  # Fallback quando matplotlib não está disponível
-    print("Aviso: matplotlib não está instalado. Funcionalidade de gráficos desabilitada.")
+    FCNTL_DISPONIVEL = False  # Windows: sem travas, mas a troca atômica continua valendo
 
 # ============================================================================
 # ENUMS E ESTRUTURAS BÁSICAS
@@ -48,7 +82,45 @@ class ResultadoMensal:
     saldo_final: float
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            'mes': self.mes,
+            'aporte_mes': self.aporte_mes,
+            'total_investido': self.total_investido,
+            'juros_mes': self.juros_mes,
+            'juros_acumulados': self.juros_acumulados,
+            'saldo_final': self.saldo_final
+        }
+
+# Campos de ResultadoMensal na ordem do construtor; no JSON os resultados são
+# gravados em colunas (uma lista por campo) em vez de um objeto por mês
+COLUNAS_RESULTADO = ('mes', 'aporte_mes', 'total_investido', 'juros_mes',
+                     'juros_acumulados', 'saldo_final')
+_valores_resultado = operator.attrgetter(*COLUNAS_RESULTADO)
+_valores_linha_json = operator.itemgetter(*COLUNAS_RESULTADO)
+
+def _resultados_para_json(resultados: List[ResultadoMensal]) -> Any:
+    """Converte os resultados para o layout em colunas do JSON"""
+    if not resultados:
+        return []
+    return dict(zip(COLUNAS_RESULTADO, map(list, zip(*map(_valores_resultado, resultados)))))
+
+def _resultados_de_json(valor: Any) -> List[ResultadoMensal]:
+    """Lê resultados em colunas ou no formato antigo (um objeto por mês)"""
+    if not valor:
+        return []
+    if isinstance(valor, dict):
+        return list(map(ResultadoMensal, *(valor[c] for c in COLUNAS_RESULTADO)))
+    return [ResultadoMensal(*_valores_linha_json(linha)) for linha in valor]
+
+# Estimativa de memória de um ResultadoMensal (objeto, atributos e ponteiro na lista)
+_AMOSTRA_RESULTADO = ResultadoMensal(1, 0.1, 0.1, 0.1, 0.1, 0.1)
+_BYTES_POR_RESULTADO = (sys.getsizeof(_AMOSTRA_RESULTADO) + sys.getsizeof(vars(_AMOSTRA_RESULTADO))
+                        + sys.getsizeof(1) + 5 * sys.getsizeof(0.1) + 8)
+del _AMOSTRA_RESULTADO
+
+def _estimar_bytes_resultados(quantidade: int) -> int:
+    """Estima a memória ocupada por uma lista de ResultadoMensal"""
+    return sys.getsizeof([]) + quantidade * _BYTES_POR_RESULTADO
 
 @dataclass
 class HistoricoModificacao:
@@ -97,6 +169,7 @@ class Simulacao:
     data_criacao: datetime = None
     data_modificacao: datetime = None
     historico: List[HistoricoModificacao] = None
+    id_origem: Optional[str] = None
 
     def __post_init__(self):
         """Inicializa campos padrão"""
@@ -139,31 +212,77 @@ class Simulacao:
 
     def to_dict(self) -> Dict[str, Any]:
         """Converte simulação para dicionário (para salvar em JSON)"""
-        data = asdict(self)
-        data['tipo_taxa'] = self.tipo_taxa.value
-        data['data_criacao'] = self.data_criacao.isoformat() if self.data_criacao else None
-        data['data_modificacao'] = self.data_modificacao.isoformat() if self.data_modificacao else None
-        if self.historico:
-            data['historico'] = [h.to_dict() for h in self.historico]
-        return data
+        return {
+            'id': self.id,
+            'nome': self.nome,
+            'aporte_inicial': self.aporte_inicial,
+            'aporte_mensal': self.aporte_mensal,
+            'prazo_meses': self.prazo_meses,
+            'tipo_taxa': self.tipo_taxa.value,
+            'taxa_fixa': self.taxa_fixa,
+            'taxas_variaveis': list(self.taxas_variaveis) if self.taxas_variaveis is not None else None,
+            'resultados': _resultados_para_json(self.resultados),
+            'data_criacao': self.data_criacao.isoformat() if self.data_criacao else None,
+            'data_modificacao': self.data_modificacao.isoformat() if self.data_modificacao else None,
+            'historico': [h.to_dict() for h in self.historico] if self.historico else [],
+            'id_origem': self.id_origem
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Simulacao':
-        """Cria simulação a partir de dicionário (para carregar de JSON)"""
-        if data.get('data_criacao'):
-            data['data_criacao'] = datetime.fromisoformat(data['data_criacao'])
-        if data.get('data_modificacao'):
-            data['data_modificacao'] = datetime.fromisoformat(data['data_modificacao'])
+        """Cria simulação a partir de dicionário (para carregar de JSON), sem alterá-lo"""
+        data_criacao = data.get('data_criacao')
+        data_modificacao = data.get('data_modificacao')
+        taxas_variaveis = data.get('taxas_variaveis')
+
+        return cls(
+            id=data['id'],
+            nome=data['nome'],
+            aporte_inicial=data['aporte_inicial'],
+            aporte_mensal=data['aporte_mensal'],
+            prazo_meses=data['prazo_meses'],
+            tipo_taxa=TipoTaxa(data['tipo_taxa']),
+            taxa_fixa=data.get('taxa_fixa'),
+            taxas_variaveis=list(taxas_variaveis) if taxas_variaveis is not None else None,
+            resultados=_resultados_de_json(data.get('resultados')),
+            data_criacao=datetime.fromisoformat(data_criacao) if data_criacao else None,
+            data_modificacao=datetime.fromisoformat(data_modificacao) if data_modificacao else None,
+            historico=[HistoricoModificacao.from_dict(h) for h in data.get('historico') or []],
+            id_origem=data.get('id_origem')
+        )
+
+# Parâmetros financeiros que podem ser alterados em uma simulação
+CAMPOS_PARAMETROS = ('aporte_inicial', 'aporte_mensal', 'prazo_meses',
+                     'tipo_taxa', 'taxa_fixa', 'taxas_variaveis')
+_nome_e_parametros = operator.attrgetter('nome', *CAMPOS_PARAMETROS)
 
-        data['tipo_taxa'] = TipoTaxa(data['tipo_taxa'])
+@dataclass(frozen=True)
+class EstadoSimulacao:
+    """
+    Fotografia imutável do nome e dos parâmetros de uma simulação
 
-        if data.get('resultados'):
-            data['resultados'] = [ResultadoMensal(**r) for r in data['resultados']]
+    Os valores são guardados com seus tipos originais e a lista de taxas
+    variáveis é referenciada, não copiada: as alterações sempre substituem
+    a lista, então cada fotografia custa O(1).
+    """
+    timestamp: datetime
+    nome: str
+    aporte_inicial: float
+    aporte_mensal: float
+    prazo_meses: int
+    tipo_taxa: TipoTaxa
+    taxa_fixa: Optional[float]
+    taxas_variaveis: Optional[List[float]]
 
-        if data.get('historico'):
-            data['historico'] = [HistoricoModificacao.from_dict(h) for h in data['historico']]
+    @classmethod
+    def capturar(cls, simulacao: Simulacao, timestamp: datetime) -> 'EstadoSimulacao':
+        return cls(timestamp, *_nome_e_parametros(simulacao))
 
-        return cls(**data)
+    def chave_resultados(self) -> tuple:
+        """Identifica os parâmetros que determinam os resultados"""
+        taxas = tuple(self.taxas_variaveis) if self.taxas_variaveis else None
+        return (self.aporte_inicial, self.aporte_mensal, self.prazo_meses,
+                self.tipo_taxa, self.taxa_fixa, taxas)
 
 # ============================================================================
 # UC01 - CONFIGURAR SIMULAÇÃO (IMPLEMENTADO POR Nick D)
@@ -175,9 +294,34 @@ class ConfiguradorSimulacao:
     IMPLEMENTADO POR: Nick D
     """
 
-    def __init__(self):
+    def __init__(self, orcamento_resultados: Optional[int] = None):
         self.simulacoes: Dict[str, Simulacao] = {}
         self._proximo_id = 1
+        # Orçamento de memória (bytes) para resultados; None = ilimitado
+        self.orcamento_resultados = orcamento_resultados
+        self._uso_resultados: 'OrderedDict[str, int]' = OrderedDict()
+        self._uso_total_bytes = 0  # Soma de _uso_resultados, mantida a cada alteração
+        self._carregadores_resultados: Dict[str, Callable[[], List[ResultadoMensal]]] = {}
+        self._recalcular: Optional[Callable[[Simulacao], List[ResultadoMensal]]] = None
+        self._descartes = 0
+        self._recalculos = 0
+        # Índice do histórico: campo -> [(timestamp, seq, simulacao, modificacao)] ordenado
+        self._indice_historico: Dict[str, list] = {}
+        self._indice_historico_geral: list = []
+        self._sequencia_historico = itertools.count()
+        # Remoção preguiçosa: seqs de cada simulação no índice e seqs já removidas,
+        # descartadas de fato quando passam da metade do índice
+        self._seqs_indice: Dict[str, List[int]] = {}
+        self._seqs_removidas: set = set()
+        # Observadores de mudanças: (evento, simulacao, modificacao)
+        self._observadores: List[Callable[[str, Simulacao, Optional[HistoricoModificacao]], None]] = []
+        # Simulações alteradas/excluídas desde o último salvamento do workspace
+        self._sujas: set = set()
+        self._excluidas: set = set()
+        # Pilhas de estados para desfazer/refazer e resultados por estado
+        self._estados: Dict[str, List[EstadoSimulacao]] = {}
+        self._posicao_estado: Dict[str, int] = {}
+        self._cache_resultados: Dict[str, Dict[tuple, List[ResultadoMensal]]] = {}
 
     def _gerar_id(self) -> str:
         """Gera ID único para nova simulação"""
@@ -211,6 +355,8 @@ class ConfiguradorSimulacao:
 
         # Armazena a simulação
         self.simulacoes[simulacao.id] = simulacao
+        self._registrar_estado(simulacao, simulacao.data_criacao)
+        self._notificar('criar', simulacao)
 
         print(f"[UC01] Simulação '{nome}' criada com ID: {simulacao.id} - Nick D")
         return simulacao.id
@@ -226,8 +372,8 @@ class ConfiguradorSimulacao:
         Returns:
             Tupla (sucesso, lista_de_erros)
         """
-        # Verifica se simulação existe
-        simulacao = self.obter_simulacao(id_simulacao)
+        # Verifica se simulação existe (sem recarregar resultados que serão descartados)
+        simulacao = self.simulacoes.get(id_simulacao)
         if not simulacao:
             erro = f"Simulação {id_simulacao} não encontrada"
             print(f"[UC01] {erro}")
@@ -252,13 +398,16 @@ class ConfiguradorSimulacao:
                         valor_antigo=valor_antigo,
                         valor_novo=novo_valor
                     )
-                    simulacao.historico.append(modificacao)
+                    self._registrar_historico(simulacao, modificacao)
 
         # Atualiza data de modificação
         simulacao.data_modificacao = timestamp
+        if parametros_alterados:
+            self._registrar_estado(simulacao, timestamp)
 
         # Limpa resultados antigos pois parâmetros mudaram
         simulacao.resultados = []
+        self._carregadores_resultados.pop(id_simulacao, None)
 
         # Valida a simulação após as mudanças
         valida, erros = simulacao.validar()
@@ -285,7 +434,7 @@ class ConfiguradorSimulacao:
         Returns:
             Tupla (sucesso, mensagem)
         """
-        simulacao = self.obter_simulacao(id_simulacao)
+        simulacao = self.simulacoes.get(id_simulacao)
         if not simulacao:
             return False, f"Simulação {id_simulacao} não encontrada"
 
@@ -305,11 +454,409 @@ class ConfiguradorSimulacao:
                 valor_antigo=nome_antigo,
                 valor_novo=novo_nome.strip()
             )
-            simulacao.historico.append(modificacao)
+            self._registrar_historico(simulacao, modificacao)
+            self._registrar_estado(simulacao, timestamp)
 
         print(f"[UC01] Nome alterado: '{nome_antigo}' → '{novo_nome.strip()}' - Nick D")
         return True, f"Nome alterado de '{nome_antigo}' para '{novo_nome.strip()}'"
 
+    def clonar_simulacao(self, id_simulacao: str, **sobrescritas) -> tuple[bool, str]:
+        """
+        UC01 - Cria um cenário derivado de uma simulação existente
+
+        O clone aproveita os resultados já calculados da origem em vez de
+        recalcular. As listas (taxas variáveis e resultados) são copiadas
+        rasamente, uma cópia de ponteiros, para que alterações no lugar em
+        uma simulação não apareçam na outra; os ResultadoMensal, que nunca
+        são alterados, continuam compartilhados.
+
+        Args:
+            id_simulacao: ID da simulação de origem
+            **sobrescritas: Nome e/ou parâmetros que diferem da origem
+
+        Returns:
+            Tupla (sucesso, id_clone_ou_erro)
+        """
+        origem = self.simulacoes.get(id_simulacao)
+        if not origem:
+            return False, f"Simulação {id_simulacao} não encontrada"
+
+        nome = sobrescritas.pop('nome') if 'nome' in sobrescritas else f"{origem.nome} (cópia)"
+        if not nome or not nome.strip():
+            return False, "Nome não pode estar vazio"
+
+        invalidos = [campo for campo in sobrescritas if campo not in CAMPOS_PARAMETROS]
+        if invalidos:
+            return False, f"Parâmetros inválidos: {', '.join(invalidos)}"
+
+        # Valida o cenário antes de reservar o ID e notificar observadores
+        if sobrescritas:
+            candidato = copy.copy(origem)
+            for campo, valor in sobrescritas.items():
+                setattr(candidato, campo, valor)
+            valida, erros = candidato.validar()
+            if not valida:
+                return False, "; ".join(erros)
+
+        timestamp = datetime.now()
+        clone = Simulacao(
+            id=self._gerar_id(),
+            nome=nome.strip(),
+            aporte_inicial=origem.aporte_inicial,
+            aporte_mensal=origem.aporte_mensal,
+            prazo_meses=origem.prazo_meses,
+            tipo_taxa=origem.tipo_taxa,
+            taxa_fixa=origem.taxa_fixa,
+            taxas_variaveis=list(origem.taxas_variaveis) if origem.taxas_variaveis is not None else None,
+            resultados=list(origem.resultados) or None,
+            data_criacao=timestamp,
+            data_modificacao=timestamp,
+            id_origem=origem.id
+        )
+        self.simulacoes[clone.id] = clone
+        self._notificar('criar', clone)
+        self._registrar_historico(clone, HistoricoModificacao(
+            timestamp=timestamp,
+            campo_alterado='id_origem',
+            valor_antigo=None,
+            valor_novo=origem.id
+        ))
+        self._registrar_estado(clone, timestamp)
+
+        if sobrescritas:
+            self.configurar_parametros(clone.id, **sobrescritas)
+
+        print(f"[UC01] Simulação '{clone.nome}' ({clone.id}) derivada de {origem.id} - Nick D")
+        return True, clone.id
+
+    def _registrar_historico(self, simulacao: Simulacao, modificacao: HistoricoModificacao,
+                             anexar: bool = True) -> None:
+        """Anexa uma modificação ao histórico e a inclui no índice"""
+        if anexar:
+            simulacao.historico.append(modificacao)
+            self._notificar('alterar', simulacao, modificacao)
+
+        sequencia = next(self._sequencia_historico)
+        self._seqs_indice.setdefault(simulacao.id, []).append(sequencia)
+        entrada = (modificacao.timestamp, sequencia, simulacao, modificacao)
+        for indice in (self._indice_historico.setdefault(modificacao.campo_alterado, []),
+                       self._indice_historico_geral):
+            # Modificações chegam em ordem cronológica; só arquivos carregados exigem inserção
+            if not indice or indice[-1][0] <= modificacao.timestamp:
+                indice.append(entrada)
+            else:
+                bisect.insort(indice, entrada, key=lambda e: e[0])
+
+    def adicionar_observador(self, observador: Callable[[str, Simulacao, Optional[HistoricoModificacao]], None]) -> None:
+        """
+        Registra uma função chamada a cada mudança no workspace
+
+        Eventos: 'criar' (simulação nova ou carregada), 'alterar' (uma
+        modificação entrou no histórico), 'restaurar' (desfazer/refazer
+        trocou um campo, sem entrada no histórico) e 'excluir'.
+        """
+        self._observadores.append(observador)
+
+    def remover_observador(self, observador: Callable[[str, Simulacao, Optional[HistoricoModificacao]], None]) -> None:
+        """Remove um observador registrado"""
+        if observador in self._observadores:
+            self._observadores.remove(observador)
+
+    def _notificar(self, evento: str, simulacao: Simulacao,
+                   modificacao: Optional[HistoricoModificacao] = None) -> None:
+        if evento == 'excluir':
+            self._sujas.discard(simulacao.id)
+            self._excluidas.add(simulacao.id)
+        else:
+            self.marcar_suja(simulacao.id)
+        for observador in self._observadores:
+            observador(evento, simulacao, modificacao)
+
+    def marcar_suja(self, id_simulacao: str) -> None:
+        """Marca a simulação como alterada desde o último salvamento"""
+        self._sujas.add(id_simulacao)
+        self._excluidas.discard(id_simulacao)
+
+    def marcar_limpas(self, ids: List[str]) -> None:
+        """Marca simulações (alteradas ou excluídas) como salvas"""
+        self._sujas.difference_update(ids)
+        self._excluidas.difference_update(ids)
+
+    def obter_pendencias(self) -> tuple[List[str], List[str]]:
+        """Retorna (IDs alterados, IDs excluídos) desde o último salvamento"""
+        return sorted(self._sujas), sorted(self._excluidas)
+
+    def _remover_do_indice(self, id_simulacao: str) -> None:
+        """
+        Remove do índice as modificações de uma simulação
+
+        As entradas só são marcadas (custo proporcional às modificações da
+        simulação); as consultas as ignoram e a compactação, que percorre o
+        índice inteiro, só acontece quando as marcadas passam da metade.
+        """
+        sequencias = self._seqs_indice.pop(id_simulacao, None)
+        if not sequencias:
+            return
+        self._seqs_removidas.update(sequencias)
+        if 2 * len(self._seqs_removidas) > len(self._indice_historico_geral):
+            self._compactar_indice()
+
+    def _compactar_indice(self) -> None:
+        """Descarta do índice as entradas marcadas como removidas"""
+        removidas = self._seqs_removidas
+        for campo, indice in list(self._indice_historico.items()):
+            indice = [e for e in indice if e[1] not in removidas]
+            if indice:
+                self._indice_historico[campo] = indice
+            else:
+                del self._indice_historico[campo]
+        self._indice_historico_geral = [e for e in self._indice_historico_geral if e[1] not in removidas]
+        self._seqs_removidas = set()
+
+    def consultar_historico(self, campo: Optional[str] = None,
+                            inicio: Optional[datetime] = None,
+                            fim: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        UC01 - Consulta modificações de todas as simulações por campo e período
+
+        Usa busca binária no índice ordenado por data, então o custo depende
+        da quantidade de modificações no período, não do histórico inteiro.
+
+        Args:
+            campo: Campo alterado (None = todos)
+            inicio: Data e hora inicial, inclusiva (None = sem limite)
+            fim: Data e hora final, inclusiva (None = sem limite)
+
+        Returns:
+            Lista de modificações em ordem cronológica, com a variação numérica
+        """
+        if campo is None:
+            indice = self._indice_historico_geral
+        else:
+            indice = self._indice_historico.get(campo, [])
+
+        chave = lambda e: e[0]
+        primeiro = bisect.bisect_left(indice, inicio, key=chave) if inicio else 0
+        ultimo = bisect.bisect_right(indice, fim, key=chave) if fim else len(indice)
+
+        removidas = self._seqs_removidas
+        consulta = []
+        for timestamp, sequencia, simulacao, modificacao in indice[primeiro:ultimo]:
+            if sequencia in removidas:
+                continue
+            try:
+                variacao = float(modificacao.valor_novo) - float(modificacao.valor_antigo)
+            except (TypeError, ValueError):
+                variacao = None
+
+            consulta.append({
+                'id_simulacao': simulacao.id,
+                'nome': simulacao.nome,
+                'timestamp': timestamp,
+                'campo_alterado': modificacao.campo_alterado,
+                'valor_antigo': modificacao.valor_antigo,
+                'valor_novo': modificacao.valor_novo,
+                'variacao': variacao
+            })
+        return consulta
+
+    def _registrar_estado(self, simulacao: Simulacao, timestamp: datetime) -> None:
+        """Empilha o estado atual, descartando o que havia para refazer"""
+        estados = self._estados.setdefault(simulacao.id, [])
+        del estados[self._posicao_estado.get(simulacao.id, -1) + 1:]
+        estados.append(EstadoSimulacao.capturar(simulacao, timestamp))
+        self._posicao_estado[simulacao.id] = len(estados) - 1
+
+    def registrar_resultados(self, id_simulacao: str, resultados: List[ResultadoMensal]) -> None:
+        """Guarda os resultados calculados para o estado atual da simulação"""
+        simulacao = self.simulacoes.get(id_simulacao)
+        if not simulacao:
+            return
+
+        simulacao.resultados = resultados
+        self._carregadores_resultados.pop(id_simulacao, None)
+        chave = EstadoSimulacao.capturar(simulacao, simulacao.data_modificacao).chave_resultados()
+        cache = self._cache_resultados.setdefault(id_simulacao, {})
+        cache[chave] = resultados
+
+        uso = sum(_estimar_bytes_resultados(len(r)) for r in cache.values())
+        self._uso_total_bytes += uso - self._uso_resultados.get(id_simulacao, 0)
+        self._uso_resultados[id_simulacao] = uso
+        self._uso_resultados.move_to_end(id_simulacao)
+        self._aplicar_orcamento()
+
+    def definir_recalculo(self, funcao: Callable[[Simulacao], List[ResultadoMensal]]) -> None:
+        """Define a função usada para recalcular resultados descartados"""
+        self._recalcular = funcao
+
+    def definir_carregador_resultados(self, id_simulacao: str,
+                                      carregador: Callable[[], List[ResultadoMensal]]) -> None:
+        """Adia a leitura dos resultados de uma simulação até o primeiro acesso"""
+        self._carregadores_resultados[id_simulacao] = carregador
+
+    def definir_orcamento_resultados(self, orcamento: Optional[int]) -> None:
+        """Altera o orçamento de memória (bytes) dos resultados; None = ilimitado"""
+        self.orcamento_resultados = orcamento
+        self._aplicar_orcamento()
+
+    def _aplicar_orcamento(self) -> None:
+        """Descarta resultados menos usados recentemente até caber no orçamento"""
+        if self.orcamento_resultados is None or self._recalcular is None:
+            return
+
+        # A simulação mais recente é mantida mesmo que sozinha exceda o orçamento
+        while len(self._uso_resultados) > 1 and self._uso_total_bytes > self.orcamento_resultados:
+            id_simulacao, uso = self._uso_resultados.popitem(last=False)
+            self._uso_total_bytes -= uso
+            self._descartar_resultados(id_simulacao)
+
+    def _descartar_resultados(self, id_simulacao: str) -> None:
+        """Libera os resultados de uma simulação, que serão recalculados no próximo acesso"""
+        simulacao = self.simulacoes[id_simulacao]
+        self._cache_resultados.pop(id_simulacao, None)
+        self._descartes += 1
+
+        if simulacao.resultados:
+            simulacao.resultados = []
+
+            def recalcular() -> List[ResultadoMensal]:
+                self._recalculos += 1
+                return self._recalcular(simulacao)
+
+            recalcular.descartado = True  # Distingue descartes de cargas sob demanda
+            self._carregadores_resultados[id_simulacao] = recalcular
+
+    def _materializar_resultados(self, simulacao: Simulacao) -> None:
+        """Carrega resultados pendentes de uma simulação"""
+        carregador = self._carregadores_resultados.pop(simulacao.id)
+        try:
+            resultados = carregador()
+        except Exception as e:
+            print(f"[UC01] Erro ao carregar resultados de {simulacao.id}: {str(e)}")
+            return
+        self.registrar_resultados(simulacao.id, resultados)
+
+    def obter_uso_memoria(self) -> Dict[str, Any]:
+        """
+        Retorna uso atual de memória dos resultados e contadores de descarte
+
+        'simulacoes_pendentes' conta todos os resultados fora da memória
+        (ainda não lidos do disco/banco ou descartados); 'simulacoes_descartadas'
+        só os que saíram da memória por causa do orçamento.
+        """
+        pendentes = self._carregadores_resultados.values()
+        return {
+            'orcamento_bytes': self.orcamento_resultados,
+            'uso_bytes': self._uso_total_bytes,
+            'simulacoes_em_memoria': len(self._uso_resultados),
+            'simulacoes_pendentes': len(pendentes),
+            'simulacoes_descartadas': sum(1 for c in pendentes if getattr(c, 'descartado', False)),
+            'descartes': self._descartes,
+            'recalculos': self._recalculos
+        }
+
+    def _ir_para_estado(self, id_simulacao: str, posicao: int) -> None:
+        """
+        Aplica um estado empilhado
+
+        Navegar pela pilha não é uma modificação nova: o histórico não
+        cresce. Os observadores recebem um evento 'restaurar' por campo
+        alterado, para que o diário acompanhe o valor vigente.
+        """
+        simulacao = self.simulacoes[id_simulacao]
+        estado = self._estados[id_simulacao][posicao]
+        timestamp = datetime.now()
+
+        for campo in ('nome',) + CAMPOS_PARAMETROS:
+            valor_antigo = getattr(simulacao, campo)
+            valor_novo = getattr(estado, campo)
+            if valor_antigo != valor_novo:
+                setattr(simulacao, campo, valor_novo)
+                self._notificar('restaurar', simulacao, HistoricoModificacao(
+                    timestamp=timestamp,
+                    campo_alterado=campo,
+                    valor_antigo=valor_antigo,
+                    valor_novo=valor_novo
+                ))
+
+        simulacao.data_modificacao = timestamp
+        self._posicao_estado[id_simulacao] = posicao
+
+        # Reaproveita resultados já calculados para esses parâmetros
+        cache = self._cache_resultados.get(id_simulacao, {})
+        simulacao.resultados = cache.get(estado.chave_resultados(), [])
+        self._carregadores_resultados.pop(id_simulacao, None)
+        if id_simulacao in self._uso_resultados:
+            self._uso_resultados.move_to_end(id_simulacao)
+
+    def desfazer(self, id_simulacao: str) -> tuple[bool, str]:
+        """
+        UC01 - Desfaz a última modificação da simulação
+
+        Args:
+            id_simulacao: ID da simulação
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        if id_simulacao not in self.simulacoes:
+            return False, f"Simulação {id_simulacao} não encontrada"
+
+        posicao = self._posicao_estado.get(id_simulacao, 0)
+        if posicao <= 0:
+            return False, "Não há modificações para desfazer"
+
+        self._ir_para_estado(id_simulacao, posicao - 1)
+        print(f"[UC01] Modificação desfeita em {id_simulacao} - Nick D")
+        return True, "Modificação desfeita"
+
+    def refazer(self, id_simulacao: str) -> tuple[bool, str]:
+        """
+        UC01 - Refaz a última modificação desfeita da simulação
+
+        Args:
+            id_simulacao: ID da simulação
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        if id_simulacao not in self.simulacoes:
+            return False, f"Simulação {id_simulacao} não encontrada"
+
+        posicao = self._posicao_estado.get(id_simulacao, 0)
+        if posicao >= len(self._estados.get(id_simulacao, [])) - 1:
+            return False, "Não há modificações para refazer"
+
+        self._ir_para_estado(id_simulacao, posicao + 1)
+        print(f"[UC01] Modificação refeita em {id_simulacao} - Nick D")
+        return True, "Modificação refeita"
+
+    def restaurar_para(self, id_simulacao: str, instante: datetime) -> tuple[bool, str]:
+        """
+        UC01 - Restaura a simulação ao estado vigente em um instante
+
+        O estado é localizado por busca binária, sem reaplicar o histórico.
+        As modificações posteriores continuam disponíveis para refazer.
+
+        Args:
+            id_simulacao: ID da simulação
+            instante: Data e hora desejadas
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        if id_simulacao not in self.simulacoes:
+            return False, f"Simulação {id_simulacao} não encontrada"
+
+        estados = self._estados.get(id_simulacao, [])
+        posicao = bisect.bisect_right(estados, instante, key=lambda e: e.timestamp) - 1
+        if posicao < 0:
+            return False, f"Nenhum estado registrado até {instante.strftime('%d/%m/%Y %H:%M:%S')}"
+
+        self._ir_para_estado(id_simulacao, posicao)
+        print(f"[UC01] Simulação {id_simulacao} restaurada para {estados[posicao].timestamp} - Nick D")
+        return True, f"Simulação restaurada para {estados[posicao].timestamp.strftime('%d/%m/%Y %H:%M:%S')}"
+
     def listar_simulacoes(self) -> List[Dict[str, Any]]:
         """Retorna lista de simulações com informações básicas"""
         return [
@@ -318,25 +865,80 @@ class ConfiguradorSimulacao:
                 'nome': s.nome,
                 'prazo_meses': s.prazo_meses,
                 'data_criacao': s.data_criacao.strftime('%d/%m/%Y %H:%M'),
-                'calculada': len(s.resultados) > 0
+                'calculada': len(s.resultados) > 0 or s.id in self._carregadores_resultados,
+                'modificada': s.id in self._sujas
             }
             for s in self.simulacoes.values()
         ]
 
     def obter_simulacao(self, id_simulacao: str) -> Optional[Simulacao]:
-        """Obtém simulação por ID"""
-        return self.simulacoes.get(id_simulacao)
+        """Obtém simulação por ID, recarregando resultados descartados"""
+        simulacao = self.simulacoes.get(id_simulacao)
+        if simulacao:
+            if id_simulacao in self._carregadores_resultados:
+                self._materializar_resultados(simulacao)
+            elif id_simulacao in self._uso_resultados:
+                self._uso_resultados.move_to_end(id_simulacao)
+        return simulacao
+
+    def consultar_resultados(self, id_simulacao: str) -> List[ResultadoMensal]:
+        """
+        Retorna os resultados de uma simulação sem mantê-los em memória
+
+        Resultados pendentes (carregados sob demanda ou descartados pelo
+        orçamento) são lidos para quem chamou e continuam pendentes, o que
+        permite percorrer workspaces grandes com memória constante.
+        """
+        carregador = self._carregadores_resultados.get(id_simulacao)
+        if carregador is not None:
+            return carregador()
+        simulacao = self.simulacoes.get(id_simulacao)
+        return simulacao.resultados if simulacao else []
 
     def obter_historico(self, id_simulacao: str) -> Optional[List[HistoricoModificacao]]:
         """Obtém histórico de modificações de uma simulação"""
-        simulacao = self.obter_simulacao(id_simulacao)
+        simulacao = self.simulacoes.get(id_simulacao)
         if simulacao:
             return simulacao.historico
         return None
 
     def adicionar_simulacao(self, simulacao: Simulacao) -> None:
         """Adiciona uma simulação ao dicionário"""
+        if simulacao.id in self.simulacoes:
+            self._remover_do_indice(simulacao.id)
         self.simulacoes[simulacao.id] = simulacao
+        for modificacao in simulacao.historico:
+            self._registrar_historico(simulacao, modificacao, anexar=False)
+        self._estados.pop(simulacao.id, None)
+        self._posicao_estado.pop(simulacao.id, None)
+        self._cache_resultados.pop(simulacao.id, None)
+        self._uso_total_bytes -= self._uso_resultados.pop(simulacao.id, 0)
+        self._carregadores_resultados.pop(simulacao.id, None)
+        self._registrar_estado(simulacao, simulacao.data_modificacao)
+        if simulacao.resultados:
+            self.registrar_resultados(simulacao.id, simulacao.resultados)
+        self._notificar('criar', simulacao)
+
+    def inserir_planos(self, planos: List[Dict[str, Any]]) -> List[str]:
+        """
+        UC01 - Cria em bloco simulações a partir de planos já validados
+
+        Cada plano traz nome e os CAMPOS_PARAMETROS. Diferente de
+        criar_simulacao + configurar_parametros, não valida nem registra
+        histórico de alteração por simulação.
+
+        Returns:
+            IDs criados, na ordem dos planos
+        """
+        agora = datetime.now()
+        ids = []
+        for plano in planos:
+            simulacao = Simulacao(id=self._gerar_id(), data_criacao=agora, data_modificacao=agora, **plano)
+            self.simulacoes[simulacao.id] = simulacao
+            self._registrar_estado(simulacao, agora)
+            self._notificar('criar', simulacao)
+            ids.append(simulacao.id)
+        return ids
 
     def excluir_simulacao(self, id_simulacao: str) -> tuple[bool, str]:
         """
@@ -351,8 +953,15 @@ class ConfiguradorSimulacao:
         if id_simulacao not in self.simulacoes:
             return False, f"Simulação {id_simulacao} não encontrada"
 
-        nome = self.simulacoes[id_simulacao].nome
-        del self.simulacoes[id_simulacao]
+        simulacao = self.simulacoes.pop(id_simulacao)
+        nome = simulacao.nome
+        self._remover_do_indice(id_simulacao)
+        self._estados.pop(id_simulacao, None)
+        self._posicao_estado.pop(id_simulacao, None)
+        self._cache_resultados.pop(id_simulacao, None)
+        self._uso_total_bytes -= self._uso_resultados.pop(id_simulacao, 0)
+        self._carregadores_resultados.pop(id_simulacao, None)
+        self._notificar('excluir', simulacao)
 
         print(f"[UC01] Simulação '{nome}' ({id_simulacao}) excluída - Nick D")
         return True, f"Simulação '{nome}' excluída com sucesso"
@@ -369,6 +978,7 @@ class CalculadoraSimulacao:
 
     def __init__(self, configurador: ConfiguradorSimulacao):
         self.configurador = configurador
+        self.configurador.definir_recalculo(self._calcular_projecao_mensal)
 
     def calcular_simulacao(self, id_simulacao: str) -> tuple[bool, List[str]]:
         """
@@ -380,8 +990,8 @@ class CalculadoraSimulacao:
         Returns:
             Tupla (sucesso, lista_de_erros)
         """
-        # Obtém a simulação
-        simulacao = self.configurador.obter_simulacao(id_simulacao)
+        # Obtém a simulação (resultados descartados não precisam ser recarregados)
+        simulacao = self.configurador.simulacoes.get(id_simulacao)
         if not simulacao:
             erro = f"Simulação {id_simulacao} não encontrada"
             print(f"[UC02] {erro}")
@@ -400,7 +1010,8 @@ class CalculadoraSimulacao:
             resultados = self._calcular_projecao_mensal(simulacao)
 
             # Salva os resultados na simulação
-            simulacao.resultados = resultados
+            self.configurador.registrar_resultados(id_simulacao, resultados)
+            self.configurador.marcar_suja(id_simulacao)
             simulacao.data_modificacao = datetime.now()
 
             print(f"[UC02] Cálculo concluído: {len(resultados)} meses processados - Nick C")
@@ -476,7 +1087,21 @@ class CalculadoraSimulacao:
                 'resultados': None
             }
 
-        # Obtém os resultados
+        resumo = self.resumir_resultados(id_simulacao)
+        if resumo['sucesso']:
+            print(f"[UC02] Teste concluído - Saldo final: R$ {resumo['resultados']['saldo_final']:,.2f} - Nick C")
+        return resumo
+
+    def resumir_resultados(self, id_simulacao: str) -> Dict[str, Any]:
+        """
+        UC02 - Monta o resumo dos resultados já disponíveis, sem recalcular
+
+        Args:
+            id_simulacao: ID da simulação
+
+        Returns:
+            Dicionário no mesmo formato de testar_simulacao
+        """
         simulacao = self.configurador.obter_simulacao(id_simulacao)
         if not simulacao or not simulacao.resultados:
             return {
@@ -505,14 +1130,416 @@ class CalculadoraSimulacao:
             }
         }
 
-        print(f"[UC02] Teste concluído - Saldo final: R$ {ultimo_resultado.saldo_final:,.2f} - Nick C")
-
         return resumo
 
 # ============================================================================
 # UC03 - GERENCIAR SIMULAÇÕES (IMPLEMENTADO POR Nick J)
 # ============================================================================
 
+# Compressão transparente: o formato de gravação vem da extensão e o de
+# leitura é detectado pelos bytes iniciais do arquivo
+EXTENSOES_COMPRESSAO = {'.gz': 'gzip', '.xz': 'lzma', '.lzma': 'lzma', '.zz': 'zlib', '.zlib': 'zlib'}
+TAMANHO_BLOCO_COMPRESSAO = 64 * 1024
+
+class _FluxoZlib(io.RawIOBase):
+    """Arquivo que comprime (escrita) ou descomprime (leitura) zlib em blocos"""
+
+    def __init__(self, caminho_arquivo: str, modo: str):
+        super().__init__()
+        self._arquivo = open(caminho_arquivo, modo + 'b')
+        self._escrita = modo == 'w'
+        self._compressor = zlib.compressobj(6) if self._escrita else None
+        self._descompressor = None if self._escrita else zlib.decompressobj()
+        self._pendente = b''
+        self._posicao = 0
+
+    def fileno(self) -> int:
+        return self._arquivo.fileno()
+
+    def readable(self) -> bool:
+        return not self._escrita
+
+    def writable(self) -> bool:
+        return self._escrita
+
+    def write(self, dados) -> int:
+        self._arquivo.write(self._compressor.compress(dados))
+        return len(dados)
+
+    def readinto(self, buffer) -> int:
+        while self._posicao >= len(self._pendente):
+            if self._descompressor.eof:
+                return 0
+            entrada = self._descompressor.unconsumed_tail or self._arquivo.read(TAMANHO_BLOCO_COMPRESSAO)
+            if not entrada:
+                raise EOFError("Fluxo zlib incompleto")
+            self._pendente = self._descompressor.decompress(entrada, TAMANHO_BLOCO_COMPRESSAO)
+            self._posicao = 0
+
+        quantidade = min(len(buffer), len(self._pendente) - self._posicao)
+        buffer[:quantidade] = self._pendente[self._posicao:self._posicao + quantidade]
+        self._posicao += quantidade
+        return quantidade
+
+    def close(self) -> None:
+        if not self.closed:
+            if self._escrita:
+                self._arquivo.write(self._compressor.flush())
+            self._arquivo.close()
+        super().close()
+
+# Bytes de controle que não aparecem em texto (tudo abaixo de 0x20 menos \t, \n e \r)
+BYTES_CONTROLE = bytes(b for b in range(32) if b not in b'\t\n\r')
+
+def _detectar_compressao(caminho_arquivo: str) -> Optional[str]:
+    """
+    Identifica gzip, LZMA/XZ ou zlib pelos bytes iniciais do arquivo
+
+    O cabeçalho zlib tem só dois bytes e coincide com texto comum ("x ",
+    "x^"), e texto pode até ser um deflate válido. O palpite é confirmado
+    descomprimindo o primeiro bloco: não pode haver erro, o fluxo tem de
+    terminar se o bloco for o arquivo todo, e a saída tem de ser texto
+    UTF-8 (os arquivos abertos aqui são JSON e CSV).
+    """
+    with open(caminho_arquivo, 'rb') as arquivo:
+        inicio = arquivo.read(TAMANHO_BLOCO_COMPRESSAO)
+    if inicio[:2] == b'\x1f\x8b':
+        return 'gzip'
+    if inicio[:6] == b'\xfd7zXZ\x00' or inicio[:3] == b'\x5d\x00\x00':
+        return 'lzma'
+    if len(inicio) >= 2 and inicio[0] == 0x78 and (inicio[0] << 8 | inicio[1]) % 31 == 0:
+        descompressor = zlib.decompressobj()
+        try:
+            saida = descompressor.decompress(inicio)
+            codecs.getincrementaldecoder('utf-8')().decode(saida)
+        except (zlib.error, UnicodeDecodeError):
+            return None
+        if len(inicio) < TAMANHO_BLOCO_COMPRESSAO and not descompressor.eof:
+            return None
+        if len(saida.translate(None, BYTES_CONTROLE)) != len(saida):
+            return None
+        return 'zlib'
+    return None
+
+def _abrir_arquivo(caminho_arquivo: str, modo: str, newline: Optional[str] = None):
+    """
+    Abre um arquivo de texto UTF-8, comprimido ou não
+
+    Na escrita ('w') a compressão é escolhida pela extensão (.gz, .xz,
+    .lzma, .zz, .zlib); na leitura ('r') é detectada pelo conteúdo. Em
+    ambos os casos os dados passam pelo compressor em blocos, sem montar
+    o arquivo inteiro em memória.
+    """
+    if modo == 'w':
+        formato = EXTENSOES_COMPRESSAO.get(os.path.splitext(caminho_arquivo)[1].lower())
+    else:
+        formato = _detectar_compressao(caminho_arquivo)
+
+    if formato == 'gzip':
+        return gzip.open(caminho_arquivo, modo + 't', encoding='utf-8', newline=newline)
+    if formato == 'lzma':
+        return lzma.open(caminho_arquivo, modo + 't', encoding='utf-8', newline=newline)
+    if formato == 'zlib':
+        fluxo = _FluxoZlib(caminho_arquivo, modo)
+        buffer = io.BufferedWriter(fluxo) if modo == 'w' else io.BufferedReader(fluxo)
+        return io.TextIOWrapper(buffer, encoding='utf-8', newline=newline)
+    return open(caminho_arquivo, modo, encoding='utf-8', newline=newline)
+
+def _eh_arquivo_auxiliar(nome: str) -> bool:
+    """Temporários de gravação ('.<nome>...tmp<ext>'), travas e demais arquivos ocultos"""
+    return nome.startswith('.') or nome.endswith('.lock')
+
+def _eh_arquivo_json(nome: str) -> bool:
+    """Aceita .json e suas variantes comprimidas (.json.gz, .json.xz, ...)"""
+    if _eh_arquivo_auxiliar(nome):
+        return False
+    base, extensao = os.path.splitext(nome)
+    if extensao.lower() in EXTENSOES_COMPRESSAO:
+        extensao = os.path.splitext(base)[1]
+    return extensao.lower() == '.json'
+
+# Diretório compartilhado: gravações em arquivo temporário trocado por
+# os.replace sob trava exclusiva por arquivo; leituras sem trava, conferindo
+# se o arquivo não foi trocado durante a leitura
+TENTATIVAS_LEITURA = 5
+
+def _caminho_temporario(caminho_arquivo: str) -> str:
+    """
+    Nome temporário oculto ao lado do destino
+
+    Começa com '.' para que as cargas de diretório o ignorem e termina com a
+    extensão do destino, da qual dependem a compressão e o formato do gráfico.
+    """
+    diretorio, nome = os.path.split(caminho_arquivo)
+    raiz, extensao = os.path.splitext(nome)
+    return os.path.join(diretorio, f".{raiz}.{os.getpid()}.{threading.get_ident()}.tmp{extensao}")
+
+@contextmanager
+def _travar_arquivo(caminho_arquivo: str):
+    """
+    Trava consultiva exclusiva (fcntl.flock) em '<arquivo>.lock'; sem fcntl não trava
+
+    O arquivo de trava é removido ao liberar. Quem esperava pela trava de um
+    arquivo já removido percebe a troca de inode e tenta de novo no atual.
+    """
+    if not FCNTL_DISPONIVEL:
+        yield
+        return
+    caminho_trava = caminho_arquivo + '.lock'
+    while True:
+        trava = open(caminho_trava, 'a')
+        try:
+            fcntl.flock(trava.fileno(), fcntl.LOCK_EX)
+            if os.fstat(trava.fileno()).st_ino == os.stat(caminho_trava).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        except BaseException:
+            trava.close()
+            raise
+        trava.close()
+    try:
+        yield
+    finally:
+        try:
+            os.remove(caminho_trava)
+        except FileNotFoundError:
+            pass
+        fcntl.flock(trava.fileno(), fcntl.LOCK_UN)
+        trava.close()
+
+def _versao_arquivo(estado: os.stat_result) -> str:
+    """Identifica uma versão do arquivo; cada os.replace gera um novo inode"""
+    return f"{estado.st_ino}-{estado.st_mtime_ns}-{estado.st_size}"
+
+def _versao_atual(caminho_arquivo: str) -> Optional[str]:
+    try:
+        return _versao_arquivo(os.stat(caminho_arquivo))
+    except FileNotFoundError:
+        return None
+
+def _gravar_atomico(caminho_arquivo: str, escrever: Callable[[Any], None],
+                    cancelado: Optional[threading.Event] = None, newline: Optional[str] = None,
+                    versoes: Optional[Dict[str, str]] = None, forcar: bool = False) -> Optional[str]:
+    """
+    Grava em arquivo temporário sincronizado e o troca pelo destino sob a trava do arquivo
+
+    Com versoes (caminho absoluto -> versão da última leitura/gravação feita
+    pela instância), o destino só é substituído se ninguém o trocou desde
+    então, a menos que forcar=True; a versão gravada é registrada em seguida.
+
+    Returns:
+        None se o destino foi substituído, senão o motivo (cancelamento ou alteração alheia)
+    """
+    temporario = _caminho_temporario(caminho_arquivo)
+    try:
+        with _abrir_arquivo(temporario, 'w', newline=newline) as arquivo:
+            escrever(arquivo)
+        _sincronizar_caminho(temporario)
+
+        with _travar_arquivo(caminho_arquivo):
+            if cancelado is not None and cancelado.is_set():
+                return "Gravação cancelada"
+            chave = os.path.abspath(caminho_arquivo)
+            if versoes is not None and not forcar:
+                esperada = versoes.get(chave)
+                atual = _versao_atual(caminho_arquivo)
+                if esperada is not None and atual is not None and atual != esperada:
+                    return f"{caminho_arquivo} foi alterado por outro processo desde a última leitura"
+            os.replace(temporario, caminho_arquivo)
+            if versoes is not None:
+                versoes[chave] = _versao_atual(caminho_arquivo)
+        return None
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+def _ler_json_consistente(caminho_arquivo: str) -> tuple[Any, str]:
+    """
+    Lê um JSON (comprimido ou não) sem travar, com verificação otimista
+
+    A leitura é aceita se o arquivo no caminho ainda é a mesma versão que foi
+    lida; caso contrário (um gravador que não usa os.replace mexeu nele) a
+    leitura é repetida.
+
+    Returns:
+        Tupla (dados, versão lida)
+    """
+    for _ in range(TENTATIVAS_LEITURA):
+        with _abrir_arquivo(caminho_arquivo, 'r') as arquivo:
+            versao = _versao_arquivo(os.fstat(arquivo.fileno()))
+            try:
+                dados = json.load(arquivo)
+            except ValueError:
+                if _versao_atual(caminho_arquivo) != versao:
+                    continue
+                raise
+        if _versao_atual(caminho_arquivo) == versao:
+            return dados, versao
+    raise RuntimeError(f"{caminho_arquivo} mudou durante {TENTATIVAS_LEITURA} leituras seguidas")
+
+@contextmanager
+def _abrir_fluxo(destino, modo: str):
+    """Abre um caminho com _abrir_arquivo ou usa um fluxo de texto já aberto (sem fechá-lo)"""
+    if isinstance(destino, str):
+        with _abrir_arquivo(destino, modo) as arquivo:
+            yield arquivo
+    else:
+        yield destino
+
+def ler_registros_jsonl(linhas):
+    """Gera os registros de um fluxo JSON Lines à medida que as linhas chegam"""
+    for numero, linha in enumerate(linhas, 1):
+        if linha.strip():
+            try:
+                yield json.loads(linha)
+            except ValueError as e:
+                raise ValueError(f"Linha {numero} inválida: {e}") from None
+
+def _sincronizar_caminho(caminho_arquivo: str) -> None:
+    """Envia ao disco um arquivo já fechado (vale também para os comprimidos)"""
+    with open(caminho_arquivo, 'rb') as arquivo:
+        os.fsync(arquivo.fileno())
+
+# Importação de CSV: taxas (uma por linha, opcionalmente precedida do mês) e
+# planos (cabeçalho com os nomes dos campos). As linhas são lidas em lotes e
+# cada lote é convertido e validado coluna a coluna antes da inserção em bloco
+COLUNAS_PLANO = ('nome', 'aporte_inicial', 'aporte_mensal', 'prazo_meses',
+                 'tipo_taxa', 'taxa_fixa', 'taxas_variaveis')
+LINHAS_POR_LOTE_IMPORTACAO = 10000
+MAXIMO_ERROS_RELATADOS = 100
+TITULO_RELATORIO_CSV = 'INFORMAÇÕES DA SIMULAÇÃO'
+COLUNAS_CURVA_TAXAS = {'mes', 'mês', 'data', 'periodo', 'período', 'taxa', 'taxa (%)', 'taxa_mensal'}
+
+@contextmanager
+def _coleta_de_lixo_pausada():
+    """Suspende o coletor cíclico em cargas em bloco, que criam muitos objetos sem ciclos"""
+    ativo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if ativo:
+            gc.enable()
+
+def _converter_ou_none(conversor: Callable, valor: str):
+    try:
+        return conversor(valor)
+    except (TypeError, ValueError):
+        return None
+
+def _converter_coluna(valores, conversor: Callable) -> list:
+    """Converte uma coluna inteira; células vazias ou inválidas viram None"""
+    try:
+        return list(map(conversor, valores))
+    except (TypeError, ValueError):
+        return [_converter_ou_none(conversor, valor) for valor in valores]
+
+def _numero_br(valor: str) -> float:
+    """Aceita '1.5', '1,5' e '1.234,56'"""
+    valor = valor.strip()
+    if ',' in valor:
+        valor = valor.replace('.', '').replace(',', '.')
+    return float(valor)
+
+def _lista_taxas(valor: str) -> List[float]:
+    """Taxas variáveis em uma célula, separadas por ';' (ou ', ' como no relatório CSV)"""
+    if ';' in valor:
+        return [_numero_br(parte) for parte in valor.split(';') if parte.strip()]
+    return [float(parte) for parte in valor.split(', ') if parte.strip()]
+
+def _eh_cabecalho_taxas(linha: List[str]) -> bool:
+    """
+    Primeira linha de uma curva de taxas é cabeçalho se nomeia colunas conhecidas
+    ou, tendo mais de uma célula, não traz nenhum número (um valor isolado
+    inválido, como 'abc', é erro e não cabeçalho)
+    """
+    celulas = [celula.strip().lower() for celula in linha]
+    if any(celula in COLUNAS_CURVA_TAXAS for celula in celulas):
+        return True
+    return len(celulas) > 1 and all(_converter_ou_none(_numero_br, celula) is None for celula in celulas)
+
+def _lotes_csv(leitor, tamanho: int):
+    """Agrupa as linhas do leitor CSV em lotes (número da primeira linha, linhas)"""
+    while True:
+        primeira = leitor.line_num + 1
+        lote = list(itertools.islice(leitor, tamanho))
+        if not lote:
+            return
+        yield primeira, lote
+
+def _colunas_do_lote(linhas: List[List[str]], posicoes: Dict[str, int]) -> Dict[str, list]:
+    """Separa um lote de linhas CSV nas colunas pedidas (células ausentes viram '')"""
+    return {campo: [linha[posicao] if posicao < len(linha) else '' for linha in linhas]
+            for campo, posicao in posicoes.items()}
+
+def _validar_taxas(taxas: list, primeira_linha: int, erros: list) -> None:
+    """Registra em erros as taxas ausentes ou fora de 0% a 100%"""
+    for posicao in (i for i, taxa in enumerate(taxas) if taxa is None or not 0 <= taxa <= 100):
+        erros.append((primeira_linha + posicao, "Taxa deve ser um número entre 0% e 100%"))
+
+def _validar_lote_planos(colunas: Dict[str, list], primeira_linha: int) -> tuple[List[Dict[str, Any]], list]:
+    """
+    Converte e valida um lote de planos já separado em colunas
+
+    Returns:
+        Tupla (planos válidos, lista de (linha, erro))
+    """
+    total = len(colunas['nome'])
+    vazio = [''] * total
+    nomes = [nome.strip() for nome in colunas['nome']]
+    aportes_iniciais = _converter_coluna(colunas['aporte_inicial'], _numero_br)
+    aportes_mensais = _converter_coluna([v or '0' for v in colunas.get('aporte_mensal', vazio)], _numero_br)
+    prazos = _converter_coluna(colunas['prazo_meses'], int)
+    taxas_fixas = _converter_coluna(colunas.get('taxa_fixa', vazio), _numero_br)
+    taxas_variaveis = _converter_coluna(colunas.get('taxas_variaveis', vazio), _lista_taxas)
+    tipos = [tipo.strip().lower() or ('fixa' if fixa is not None else 'variavel')
+             for tipo, fixa in zip(colunas.get('tipo_taxa', vazio), taxas_fixas)]
+
+    # Cada regra percorre a coluna inteira e marca as posições inválidas
+    regras = [
+        ("Nome da simulação é obrigatório", (not nome for nome in nomes)),
+        ("Aporte inicial deve ser maior que R$ 0,00", (a is None or a <= 0 for a in aportes_iniciais)),
+        ("Aporte mensal deve ser um número não negativo", (a is None or a < 0 for a in aportes_mensais)),
+        ("Prazo deve estar entre 1 e 360 meses", (p is None or not 1 <= p <= 360 for p in prazos)),
+        ("Tipo de taxa deve ser 'fixa' ou 'variavel'", (t not in ('fixa', 'variavel') for t in tipos)),
+        ("Taxa fixa deve estar entre 0% e 100%",
+         (t == 'fixa' and (f is None or not 0 <= f <= 100) for t, f in zip(tipos, taxas_fixas))),
+        ("Taxas variáveis devem ser uma por mês, entre 0% e 100%",
+         (t == 'variavel' and (v is None or len(v) != p or any(x < 0 or x > 100 for x in v))
+          for t, v, p in zip(tipos, taxas_variaveis, prazos))),
+    ]
+    invalidas: Dict[int, str] = {}
+    for mensagem, falhas in regras:
+        for posicao in itertools.compress(range(total), falhas):
+            invalidas.setdefault(posicao, mensagem)
+
+    planos = [{
+        'nome': nomes[i],
+        'aporte_inicial': aportes_iniciais[i],
+        'aporte_mensal': aportes_mensais[i],
+        'prazo_meses': prazos[i],
+        'tipo_taxa': TipoTaxa(tipos[i]),
+        'taxa_fixa': taxas_fixas[i] if tipos[i] == 'fixa' else None,
+        'taxas_variaveis': taxas_variaveis[i] if tipos[i] == 'variavel' else None
+    } for i in range(total) if i not in invalidas]
+    erros = [(primeira_linha + posicao, mensagem) for posicao, mensagem in sorted(invalidas.items())]
+    return planos, erros
+
+def _plano_de_relatorio(linhas: List[List[str]]) -> Dict[str, list]:
+    """Extrai o plano (em colunas de um elemento) do relatório gerado por exportar_csv"""
+    campos = {linha[0]: linha[1] for linha in linhas if len(linha) >= 2}
+    tipo = campos.get('Tipo de Taxa', '')
+    return {
+        'nome': [campos.get('Nome', '')],
+        'aporte_inicial': [campos.get('Aporte Inicial (R$)', '')],
+        'aporte_mensal': [campos.get('Aporte Mensal (R$)', '')],
+        'prazo_meses': [campos.get('Prazo (meses)', '')],
+        'tipo_taxa': [tipo],
+        'taxa_fixa': [campos.get('Taxa Fixa (%)', '')],
+        'taxas_variaveis': [campos.get('Taxas Variáveis (%)', '')]
+    }
+
 class GerenciadorSimulacoes:
     """
     UC03 - Permite ao usuário gerenciar simulações (salvar/carregar)
@@ -521,14 +1548,24 @@ class GerenciadorSimulacoes:
 
     def __init__(self, configurador: ConfiguradorSimulacao):
         self.configurador = configurador
+        self.diario: Optional[DiarioWorkspace] = None
+        # Versão de cada arquivo na última leitura/gravação feita por esta instância
+        self._versoes: Dict[str, str] = {}
 
-    def salvar_simulacao(self, id_simulacao: str, caminho_arquivo: str) -> tuple[bool, str]:
+    def salvar_simulacao(self, id_simulacao: str, caminho_arquivo: str,
+                         forcar: bool = False) -> tuple[bool, str]:
         """
         UC03 - Salva simulação em arquivo JSON
 
+        O arquivo é escrito à parte e trocado atomicamente, então leitores
+        nunca veem um JSON pela metade. Se esta instância já leu ou gravou o
+        arquivo e outro processo o substituiu depois, a gravação é recusada
+        para não sobrescrever a alteração alheia (a menos que forcar=True).
+
         Args:
             id_simulacao: ID da simulação
             caminho_arquivo: Caminho onde salvar
+            forcar: Grava mesmo que o arquivo tenha mudado desde a última leitura
 
         Returns:
             Tupla (sucesso, mensagem)
@@ -537,11 +1574,15 @@ class GerenciadorSimulacoes:
             return False, f"Simulação {id_simulacao} não encontrada"
 
         try:
-            simulacao = self.configurador.obter_simulacao(id_simulacao)
+            dados = self.configurador.obter_simulacao(id_simulacao).to_dict()
 
-            # Converte para dicionário e salva
-            with open(caminho_arquivo, 'w', encoding='utf-8') as arquivo:
-                json.dump(simulacao.to_dict(), arquivo, ensure_ascii=False, indent=2)
+            # Converte para dicionário e salva (comprimido se a extensão pedir)
+            recusa = _gravar_atomico(
+                caminho_arquivo, lambda arquivo: json.dump(dados, arquivo, ensure_ascii=False, indent=2),
+                versoes=self._versoes, forcar=forcar)
+            if recusa:
+                print(f"[UC03] {recusa}")
+                return False, recusa
 
             print(f"[UC03] Simulação {id_simulacao} salva em: {caminho_arquivo} - Nick J")
             return True, f"Simulação salva com sucesso em {caminho_arquivo}"
@@ -562,9 +1603,9 @@ class GerenciadorSimulacoes:
             Tupla (sucesso, id_simulacao_ou_erro)
         """
         try:
-            # Lê arquivo JSON
-            with open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
-                dados = json.load(arquivo)
+            # Lê arquivo JSON (comprimido ou não) sem travar o diretório
+            dados, versao = _ler_json_consistente(caminho_arquivo)
+            self._versoes[os.path.abspath(caminho_arquivo)] = versao
 
             # Cria simulação a partir dos dados
             simulacao = Simulacao.from_dict(dados)
@@ -573,12 +1614,7 @@ class GerenciadorSimulacoes:
             self.configurador.adicionar_simulacao(simulacao)
 
             # Atualiza contador de IDs
-            try:
-                num_id = int(simulacao.id[3:])  # Remove "SIM"
-                if num_id >= self.configurador._proximo_id:
-                    self.configurador._proximo_id = num_id + 1
-            except:
-                pass
+            self._atualizar_contador_ids(simulacao.id)
 
             print(f"[UC03] Simulação carregada: {simulacao.id} - {simulacao.nome} - Nick J")
             return True, simulacao.id
@@ -588,114 +1624,2408 @@ class GerenciadorSimulacoes:
             print(f"[UC03] {erro_msg}")
             return False, erro_msg
 
-# ============================================================================
-# UC04 - EXPORTAR SIMULAÇÃO PARA CSV
-# ============================================================================
-
-class ExportadorSimulacao:
-    """
-    UC04 - Permite exportar simulações para formato CSV
-    """
-
-    def __init__(self, configurador: ConfiguradorSimulacao):
-        self.configurador = configurador
-
-    def exportar_csv(self, id_simulacao: str, caminho_arquivo: str) -> tuple[bool, str]:
+    def carregar_jsonl(self, origem) -> tuple[bool, Any]:
         """
-        UC04 - Exporta simulação para arquivo CSV
+        UC03 - Carrega simulações ou resultados de um fluxo JSON Lines
+
+        Aceita os dois layouts de exportar_jsonl: registros de simulação
+        (com 'nome') são adicionados ao workspace; linhas por mês são
+        agrupadas por ID consecutivo e viram os resultados da simulação já
+        existente com aquele ID. As linhas são processadas conforme chegam.
 
         Args:
-            id_simulacao: ID da simulação
-            caminho_arquivo: Caminho onde salvar
+            origem: Caminho do arquivo (comprimido ou não) ou fluxo de texto, como sys.stdin
 
         Returns:
-            Tupla (sucesso, mensagem)
+            Tupla (sucesso, lista_de_ids_ou_erro)
         """
-        if id_simulacao not in self.configurador.simulacoes:
-            return False, f"Simulação {id_simulacao} não encontrada"
-
         try:
-            simulacao = self.configurador.simulacoes[id_simulacao]
-
-            with open(caminho_arquivo, 'w', encoding='utf-8', newline='') as arquivo:
-                writer = csv.writer(arquivo)
-
-                # Cabeçalho com informações da simulação
-                writer.writerow(['INFORMAÇÕES DA SIMULAÇÃO'])
-                writer.writerow(['ID', simulacao.id])
-                writer.writerow(['Nome', simulacao.nome])
-                writer.writerow(['Aporte Inicial (R$)', f'{simulacao.aporte_inicial:.2f}'])
-                writer.writerow(['Aporte Mensal (R$)', f'{simulacao.aporte_mensal:.2f}'])
-                writer.writerow(['Prazo (meses)', simulacao.prazo_meses])
-                writer.writerow(['Tipo de Taxa', simulacao.tipo_taxa.value])
-
-                if simulacao.tipo_taxa == TipoTaxa.FIXA:
-                    writer.writerow(['Taxa Fixa (%)', f'{simulacao.taxa_fixa:.2f}'])
-                else:
-                    writer.writerow(['Taxas Variáveis (%)', ', '.join(f'{t:.2f}' for t in simulacao.taxas_variaveis)])
-
-                writer.writerow(['Data de Criação', simulacao.data_criacao.strftime('%d/%m/%Y %H:%M:%S')])
-                writer.writerow(['Data de Modificação', simulacao.data_modificacao.strftime('%d/%m/%Y %H:%M:%S')])
-                writer.writerow([])
-
-                # Resultados mensais
-                if simulacao.resultados:
-                    writer.writerow(['RESULTADOS MENSAIS'])
-                    writer.writerow(['Mês', 'Aporte do Mês (R$)', 'Total Investido (R$)',
-                                   'Juros do Mês (R$)', 'Juros Acumulados (R$)', 'Saldo Final (R$)'])
-
-                    for resultado in simulacao.resultados:
-                        writer.writerow([
-                            resultado.mes,
-                            f'{resultado.aporte_mes:.2f}',
-                            f'{resultado.total_investido:.2f}',
-                            f'{resultado.juros_mes:.2f}',
-                            f'{resultado.juros_acumulados:.2f}',
-                            f'{resultado.saldo_final:.2f}'
-                        ])
-
-                    # Resumo final
-                    ultimo = simulacao.resultados[-1]
-                    writer.writerow([])
-                    writer.writerow(['RESUMO FINAL'])
-                    writer.writerow(['Saldo Final (R$)', f'{ultimo.saldo_final:.2f}'])
-                    writer.writerow(['Total Investido (R$)', f'{ultimo.total_investido:.2f}'])
-                    writer.writerow(['Juros Acumulados (R$)', f'{ultimo.juros_acumulados:.2f}'])
-                    rentabilidade = ((ultimo.saldo_final / ultimo.total_investido - 1) * 100)
-                    writer.writerow(['Rentabilidade (%)', f'{rentabilidade:.2f}'])
-                else:
-                    writer.writerow(['Simulação ainda não foi calculada'])
+            ids = []
+            ignorados = 0
+            with _abrir_fluxo(origem, 'r') as arquivo:
+                registros = ler_registros_jsonl(arquivo)
+                for id_simulacao, grupo in itertools.groupby(registros, key=operator.itemgetter('id')):
+                    primeiro = next(grupo)
+                    grupo = itertools.chain([primeiro], grupo)
+
+                    if 'nome' in primeiro:
+                        for dados in grupo:
+                            simulacao = Simulacao.from_dict(dados)
+                            self.configurador.adicionar_simulacao(simulacao)
+                            self._atualizar_contador_ids(simulacao.id)
+                            ids.append(simulacao.id)
+                    elif id_simulacao in self.configurador.simulacoes:
+                        resultados = [ResultadoMensal(*_valores_linha_json(linha)) for linha in grupo]
+                        self.configurador.registrar_resultados(id_simulacao, resultados)
+                        self.configurador.marcar_suja(id_simulacao)
+                        ids.append(id_simulacao)
+                    else:
+                        ignorados += 1
 
-            print(f"[UC04] Simulação {id_simulacao} exportada para CSV: {caminho_arquivo}")
-            return True, f"Simulação exportada com sucesso para {caminho_arquivo}"
+            descricao = f"{len(ids)} simulações" + (f", {ignorados} IDs desconhecidos ignorados" if ignorados else "")
+            print(f"[UC03] JSON Lines carregado ({descricao}) - Nick J")
+            return True, ids
 
         except Exception as e:
-            erro_msg = f"Erro ao exportar CSV: {str(e)}"
-            print(f"[UC04] {erro_msg}")
+            erro_msg = f"Erro ao carregar JSON Lines: {str(e)}"
+            print(f"[UC03] {erro_msg}")
             return False, erro_msg
 
-# ============================================================================
-# UC05 - VISUALIZAR GRÁFICOS
-# ============================================================================
+    def importar_taxas_csv(self, caminho_arquivo: str) -> tuple[bool, Any]:
+        """
+        UC03 - Lê uma curva de taxas mensais (%) de um CSV
 
-class GeradorGraficos:
-    """
-    UC05 - Permite visualizar gráficos das simulações
-    """
+        Cada linha traz a taxa na última coluna (ex.: 'mes,taxa' ou só
+        'taxa'); linhas em branco e uma linha de cabeçalho (ver
+        _eh_cabecalho_taxas) são ignoradas. Também aceita o relatório gerado
+        por exportar_csv, de onde são lidas as taxas do plano.
 
-    def __init__(self, configurador: ConfiguradorSimulacao):
-        self.configurador = configurador
+        Args:
+            caminho_arquivo: Caminho do arquivo (comprimido ou não)
 
-    def criar_figura_evolucao(self, id_simulacao: str) -> Optional[Figure]:
+        Returns:
+            Tupla (sucesso, lista_de_taxas_ou_erro)
+        """
+        import csv
+        try:
+            taxas: List[float] = []
+            erros: list = []
+            procurar_cabecalho = True
+            with _abrir_arquivo(caminho_arquivo, 'r', newline='') as arquivo:
+                leitor = csv.reader(arquivo)
+                for primeira_linha, linhas in _lotes_csv(leitor, LINHAS_POR_LOTE_IMPORTACAO):
+                    if primeira_linha == 1 and linhas[0][:1] == [TITULO_RELATORIO_CSV]:
+                        linhas += list(leitor)
+                        planos, erros = _validar_lote_planos(_plano_de_relatorio(linhas), 1)
+                        if planos:
+                            plano = planos[0]
+                            taxas = plano['taxas_variaveis'] or [plano['taxa_fixa']] * plano['prazo_meses']
+                        break
+
+                    lote = _converter_coluna([linha[-1] if linha else '' for linha in linhas], _numero_br)
+                    ignoradas = set()
+                    if procurar_cabecalho:
+                        for posicao, linha in enumerate(linhas):
+                            if any(map(str.strip, linha)):
+                                procurar_cabecalho = False
+                                if _eh_cabecalho_taxas(linha):
+                                    ignoradas.add(posicao)
+                                break
+                    # Só as linhas que não viraram número podem estar em branco
+                    if None in lote:
+                        ignoradas.update(posicao for posicao, taxa in enumerate(lote)
+                                         if taxa is None and not any(map(str.strip, linhas[posicao])))
+
+                    if not ignoradas:
+                        _validar_taxas(lote, primeira_linha, erros)
+                    else:
+                        mantidas = [posicao for posicao in range(len(lote)) if posicao not in ignoradas]
+                        lote = [lote[posicao] for posicao in mantidas]
+                        erros_lote: list = []
+                        _validar_taxas(lote, 0, erros_lote)
+                        erros.extend((primeira_linha + mantidas[posicao], mensagem)
+                                     for posicao, mensagem in erros_lote)
+                    taxas.extend(lote)
+
+            if erros:
+                linha, mensagem = erros[0]
+                erro_msg = f"{len(erros)} taxas inválidas; linha {linha}: {mensagem}"
+                print(f"[UC03] {erro_msg}")
+                return False, erro_msg
+            if not taxas:
+                return False, "Nenhuma taxa encontrada no arquivo"
+
+            print(f"[UC03] {len(taxas)} taxas importadas de: {caminho_arquivo} - Nick J")
+            return True, taxas
+
+        except Exception as e:
+            erro_msg = f"Erro ao importar taxas: {str(e)}"
+            print(f"[UC03] {erro_msg}")
+            return False, erro_msg
+
+    def importar_planos_csv(self, caminho_arquivo: str,
+                            linhas_por_lote: int = LINHAS_POR_LOTE_IMPORTACAO) -> tuple[bool, Any]:
         """
-        Cria figura com gráfico de evolução do saldo
+        UC03 - Importa planos de investimento de um CSV, criando uma simulação por linha
+
+        O cabeçalho nomeia as colunas: nome, aporte_inicial e prazo_meses são
+        obrigatórias; aporte_mensal, tipo_taxa, taxa_fixa e taxas_variaveis
+        (separadas por ';') são opcionais. O relatório de exportar_csv também
+        é aceito e vira um plano. Linhas inválidas são relatadas e puladas;
+        as válidas entram no configurador em bloco, lote a lote.
 
         Args:
-            id_simulacao: ID da simulação
+            caminho_arquivo: Caminho do arquivo (comprimido ou não)
+            linhas_por_lote: Linhas convertidas e validadas de cada vez
 
         Returns:
-            Figure do matplotlib ou None se erro
+            Tupla (sucesso, relatório_ou_erro) com o relatório contendo
+            'ids', 'linhas_invalidas', 'erros' (primeiros (linha, mensagem)) e 'segundos'
         """
+        import csv
+        inicio = time.perf_counter()
+        try:
+            ids: List[str] = []
+            erros: list = []
+            invalidas = 0
+            with _abrir_arquivo(caminho_arquivo, 'r', newline='') as arquivo:
+                leitor = csv.reader(arquivo)
+                cabecalho = next(leitor, None)
+                if not cabecalho:
+                    return False, "Arquivo vazio"
+
+                if cabecalho[:1] == [TITULO_RELATORIO_CSV]:
+                    lotes = [(1, _plano_de_relatorio(list(leitor)))]
+                else:
+                    nomes = [nome.strip().lower() for nome in cabecalho]
+                    faltando = [c for c in ('nome', 'aporte_inicial', 'prazo_meses') if c not in nomes]
+                    if faltando:
+                        return False, f"Colunas obrigatórias ausentes: {', '.join(faltando)}"
+                    posicoes = {c: nomes.index(c) for c in COLUNAS_PLANO if c in nomes}
+                    lotes = ((primeira_linha, _colunas_do_lote(linhas, posicoes))
+                             for primeira_linha, linhas in _lotes_csv(leitor, linhas_por_lote))
+
+                with _coleta_de_lixo_pausada():
+                    for primeira_linha, colunas in lotes:
+                        planos, erros_lote = _validar_lote_planos(colunas, primeira_linha)
+                        ids.extend(self.configurador.inserir_planos(planos))
+                        invalidas += len(erros_lote)
+                        erros.extend(erros_lote[:MAXIMO_ERROS_RELATADOS - len(erros)])
+
+            relatorio = {
+                'ids': ids,
+                'linhas_invalidas': invalidas,
+                'erros': erros,
+                'segundos': time.perf_counter() - inicio
+            }
+            print(f"[UC03] {len(ids)} planos importados de: {caminho_arquivo} "
+                  f"({invalidas} linhas inválidas) - Nick J")
+            return True, relatorio
+
+        except Exception as e:
+            erro_msg = f"Erro ao importar planos: {str(e)}"
+            print(f"[UC03] {erro_msg}")
+            return False, erro_msg
+
+    def salvar_simulacao_binaria(self, id_simulacao: str, caminho_arquivo: str) -> tuple[bool, str]:
+        """
+        UC03 - Salva simulação no formato binário compacto
+
+        Args:
+            id_simulacao: ID da simulação
+            caminho_arquivo: Caminho onde salvar
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        if id_simulacao not in self.configurador.simulacoes:
+            return False, f"Simulação {id_simulacao} não encontrada"
+
+        try:
+            simulacao = self.configurador.obter_simulacao(id_simulacao)
+            dados = simulacao.to_dict()
+            dados.pop('resultados')
+
+            with open(caminho_arquivo, 'wb') as arquivo:
+                _escrever_binario(dados, simulacao.resultados, arquivo)
+
+            print(f"[UC03] Simulação {id_simulacao} salva em binário: {caminho_arquivo} - Nick J")
+            return True, f"Simulação salva com sucesso em {caminho_arquivo}"
+
+        except Exception as e:
+            erro_msg = f"Erro ao salvar arquivo: {str(e)}"
+            print(f"[UC03] {erro_msg}")
+            return False, erro_msg
+
+    def carregar_simulacao_binaria(self, caminho_arquivo: str, sob_demanda: bool = False) -> tuple[bool, str]:
+        """
+        UC03 - Carrega simulação do formato binário compacto
+
+        Args:
+            caminho_arquivo: Caminho do arquivo
+            sob_demanda: Lê só o cabeçalho; os resultados são mapeados em
+                memória e montados quando a simulação é aberta
+
+        Returns:
+            Tupla (sucesso, id_simulacao_ou_erro)
+        """
+        try:
+            if sob_demanda:
+                dados = ler_cabecalho_binario(caminho_arquivo)
+                total_resultados = dados.pop('total_resultados')
+                dados.pop('resumo')
+                simulacao = Simulacao.from_dict(dados)
+            else:
+                dados, colunas = ler_colunas_binarias(caminho_arquivo)
+                simulacao = Simulacao.from_dict(dados)
+                simulacao.resultados = _resultados_de_colunas(colunas)
+
+            self.configurador.adicionar_simulacao(simulacao)
+            if sob_demanda and total_resultados:
+                self.configurador.definir_carregador_resultados(
+                    simulacao.id, _carregador_resultados_binarios(caminho_arquivo))
+            self._atualizar_contador_ids(simulacao.id)
+
+            print(f"[UC03] Simulação carregada: {simulacao.id} - {simulacao.nome} - Nick J")
+            return True, simulacao.id
+
+        except Exception as e:
+            erro_msg = f"Erro ao carregar arquivo: {str(e)}"
+            print(f"[UC03] {erro_msg}")
+            return False, erro_msg
+
+    def listar_simulacoes_binarias(self, diretorio: str) -> tuple[bool, Any]:
+        """
+        UC03 - Lista os snapshots binários de um diretório lendo só os cabeçalhos
+
+        Args:
+            diretorio: Diretório com arquivos .sinb
+
+        Returns:
+            Tupla (sucesso, lista_de_cabecalhos_ou_erro)
+        """
+        try:
+            cabecalhos = []
+            for nome in sorted(os.listdir(diretorio)):
+                if not nome.endswith('.sinb') or _eh_arquivo_auxiliar(nome):
+                    continue
+                caminho = os.path.join(diretorio, nome)
+                dados = ler_cabecalho_binario(caminho)
+                cabecalhos.append({
+                    'caminho': caminho,
+                    'id': dados['id'],
+                    'nome': dados['nome'],
+                    'prazo_meses': dados['prazo_meses'],
+                    'tipo_taxa': dados['tipo_taxa'],
+                    'taxa_fixa': dados['taxa_fixa'],
+                    'data_criacao': dados['data_criacao'],
+                    'data_modificacao': dados['data_modificacao'],
+                    'resumo': dados['resumo']
+                })
+            return True, cabecalhos
+
+        except Exception as e:
+            erro_msg = f"Erro ao listar simulações: {str(e)}"
+            print(f"[UC03] {erro_msg}")
+            return False, erro_msg
+
+    def converter_json_para_binario(self, origem: str, destino: str) -> tuple[bool, str]:
+        """
+        UC03 - Converte um arquivo JSON de simulação para o formato binário
+
+        Args:
+            origem: Caminho do arquivo JSON
+            destino: Caminho do arquivo binário
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        try:
+            with _abrir_arquivo(origem, 'r') as arquivo:
+                dados = json.load(arquivo)
+            resultados = _resultados_de_json(dados.pop('resultados', None))
+
+            with open(destino, 'wb') as arquivo:
+                _escrever_binario(dados, resultados, arquivo)
+
+            return True, f"Arquivo convertido para {destino}"
+
+        except Exception as e:
+            return False, f"Erro ao converter arquivo: {str(e)}"
+
+    def converter_binario_para_json(self, origem: str, destino: str) -> tuple[bool, str]:
+        """
+        UC03 - Converte um arquivo binário de simulação para JSON
+
+        Args:
+            origem: Caminho do arquivo binário
+            destino: Caminho do arquivo JSON
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        try:
+            dados, colunas = ler_colunas_binarias(origem)
+            dados['resultados'] = _resultados_para_json(_resultados_de_colunas(colunas))
+
+            with _abrir_arquivo(destino, 'w') as arquivo:
+                json.dump(dados, arquivo, ensure_ascii=False, indent=2)
+
+            return True, f"Arquivo convertido para {destino}"
+
+        except Exception as e:
+            return False, f"Erro ao converter arquivo: {str(e)}"
+
+    def abrir_diario(self, diretorio: str) -> tuple[bool, str]:
+        """
+        UC03 - Abre um workspace com diário de modificações
+
+        Recupera o snapshot e reaplica o diário; a partir daí cada mudança
+        é anexada ao diário em vez de regravar os arquivos.
+
+        Args:
+            diretorio: Diretório do workspace
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        try:
+            if self.diario is not None:
+                self.diario.fechar()
+            self.diario = DiarioWorkspace(diretorio)
+            reaplicados = self.diario.abrir(self.configurador)
+
+            print(f"[UC03] Diário aberto em: {diretorio} ({reaplicados} registros reaplicados) - Nick J")
+            return True, f"Workspace recuperado com {reaplicados} modificações do diário"
+
+        except Exception as e:
+            self.diario = None
+            erro_msg = f"Erro ao abrir diário: {str(e)}"
+            print(f"[UC03] {erro_msg}")
+            return False, erro_msg
+
+    def compactar_diario(self, em_segundo_plano: bool = True) -> tuple[bool, str]:
+        """
+        UC03 - Incorpora o diário ao snapshot do workspace
+
+        Args:
+            em_segundo_plano: Grava o snapshot em uma thread separada
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        if self.diario is None:
+            return False, "Nenhum diário aberto"
+
+        try:
+            self.diario.compactar(em_segundo_plano)
+            return True, "Compactação do diário iniciada" if em_segundo_plano else "Diário compactado"
+
+        except Exception as e:
+            erro_msg = f"Erro ao compactar diário: {str(e)}"
+            print(f"[UC03] {erro_msg}")
+            return False, erro_msg
+
+    def carregar_diretorio(self, diretorio: str, workers: Optional[int] = None) -> tuple[bool, Dict[str, Any]]:
+        """
+        UC03 - Carrega em paralelo todos os arquivos JSON (comprimidos ou não) de um diretório
+
+        A leitura e a interpretação do JSON são distribuídas entre
+        processos, que devolvem só dicionários; as simulações são montadas e
+        incluídas no configurador em uma única passada, em ordem de nome de
+        arquivo. IDs repetidos (entre os arquivos ou com simulações já
+        abertas) recebem novos IDs nessa mesma ordem.
+
+        Args:
+            diretorio: Diretório com os arquivos .json
+            workers: Número de processos (None = número de CPUs, 1 = sem paralelismo)
+
+        Returns:
+            Tupla (sucesso, relatório com ids, IDs trocados, falhas e vazão).
+            Sucesso é False se havia arquivos e nenhum pôde ser carregado.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        inicio = time.perf_counter()
+        try:
+            arquivos = sorted(os.path.join(diretorio, nome) for nome in os.listdir(diretorio)
+                              if _eh_arquivo_json(nome))
+        except OSError as e:
+            erro_msg = f"Erro ao listar diretório: {str(e)}"
+            print(f"[UC03] {erro_msg}")
+            return False, {'erro': erro_msg}
+
+        if workers == 1 or len(arquivos) < 2:
+            lidos = list(map(_ler_simulacao_json, arquivos))
+        else:
+            processos = workers or os.cpu_count() or 1
+            lote = max(1, len(arquivos) // (processos * 4))
+            with ProcessPoolExecutor(max_workers=processos) as executor:
+                lidos = list(executor.map(_ler_simulacao_json, arquivos, chunksize=lote))
+
+        falhas = {}
+        simulacoes = []
+        for caminho, dados, versao, erro in lidos:
+            if erro is None:
+                try:
+                    simulacoes.append((caminho, Simulacao.from_dict(dados)))
+                    self._versoes[os.path.abspath(caminho)] = versao
+                except Exception as e:
+                    erro = str(e)
+            if erro is not None:
+                falhas[caminho] = erro
+
+        # Reserva os IDs originais antes de gerar novos para os repetidos
+        for _, simulacao in simulacoes:
+            self._atualizar_contador_ids(simulacao.id)
+
+        ids_usados = set(self.configurador.simulacoes)
+        ids_trocados = {}
+        carregadas = []
+        for caminho, simulacao in simulacoes:
+            if simulacao.id in ids_usados:
+                novo_id = self.configurador._gerar_id()
+                ids_trocados[caminho] = (simulacao.id, novo_id)
+                simulacao.id = novo_id
+            ids_usados.add(simulacao.id)
+            self.configurador.adicionar_simulacao(simulacao)
+            carregadas.append(simulacao.id)
+
+        segundos = time.perf_counter() - inicio
+        relatorio = {
+            'carregadas': carregadas,
+            'ids_trocados': ids_trocados,
+            'falhas': falhas,
+            'segundos': segundos,
+            'arquivos_por_segundo': len(arquivos) / segundos if segundos > 0 else 0.0
+        }
+
+        print(f"[UC03] {len(carregadas)} simulações carregadas de {diretorio} "
+              f"({len(falhas)} falhas, {relatorio['arquivos_por_segundo']:.0f} arquivos/s) - Nick J")
+        return bool(carregadas) or not arquivos, relatorio
+
+    def salvar_workspace(self, diretorio: str, forcar: bool = False) -> tuple[bool, str]:
+        """
+        UC03 - Salva no diretório apenas as simulações alteradas
+
+        Cada simulação fica em <id>.json e é gravada como em salvar_simulacao:
+        temporário sincronizado logo após fechado e trocado atomicamente sob a
+        trava do arquivo, recusando arquivos que outro processo alterou desde a
+        última leitura/gravação desta instância (a menos que forcar=True). As
+        remoções seguem a mesma regra e o diretório é sincronizado uma única
+        vez no fim. Salvar após uma edição custa um arquivo, não o workspace
+        inteiro; simulações recusadas continuam pendentes.
+
+        Args:
+            diretorio: Diretório do workspace
+            forcar: Sobrescreve/remove mesmo arquivos alterados por outro processo
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        sujas, excluidas = self.configurador.obter_pendencias()
+        salvas = []
+        recusadas = []
+        try:
+            os.makedirs(diretorio, exist_ok=True)
+
+            for id_sim in sujas:
+                dados = self.configurador.obter_simulacao(id_sim).to_dict()
+                recusa = _gravar_atomico(
+                    os.path.join(diretorio, f"{id_sim}.json"),
+                    lambda arquivo: json.dump(dados, arquivo, ensure_ascii=False),
+                    versoes=self._versoes, forcar=forcar)
+                (recusadas if recusa else salvas).append(id_sim)
+
+            for id_sim in excluidas:
+                caminho = os.path.join(diretorio, f"{id_sim}.json")
+                chave = os.path.abspath(caminho)
+                with _travar_arquivo(caminho):
+                    esperada = self._versoes.get(chave)
+                    atual = _versao_atual(caminho)
+                    if not forcar and esperada is not None and atual is not None and atual != esperada:
+                        recusadas.append(id_sim)
+                        continue
+                    if atual is not None:
+                        os.remove(caminho)
+                    self._versoes.pop(chave, None)
+                salvas.append(id_sim)
+            _sincronizar_diretorio(diretorio)
+
+        except Exception as e:
+            self.configurador.marcar_limpas(salvas)
+            erro_msg = f"Erro ao salvar workspace: {str(e)}"
+            print(f"[UC03] {erro_msg}")
+            return False, erro_msg
+
+        self.configurador.marcar_limpas(salvas)
+        if recusadas:
+            erro_msg = (f"{len(recusadas)} arquivos foram alterados por outro processo desde a última "
+                        f"leitura e não foram salvos: {', '.join(recusadas)}")
+            print(f"[UC03] {erro_msg}")
+            return False, erro_msg
+
+        print(f"[UC03] Workspace salvo em {diretorio}: {len(sujas)} gravadas, "
+              f"{len(excluidas)} removidas - Nick J")
+        return True, f"{len(sujas)} simulações salvas em {diretorio}"
+
+    def carregar_workspace(self, diretorio: str, workers: Optional[int] = None) -> tuple[bool, Dict[str, Any]]:
+        """
+        UC03 - Carrega um workspace salvo com salvar_workspace
+
+        As simulações carregadas com o próprio ID ficam marcadas como salvas.
+
+        Args:
+            diretorio: Diretório do workspace
+            workers: Número de processos de leitura
+
+        Returns:
+            Tupla (sucesso, relatório de carregar_diretorio)
+        """
+        sucesso, relatorio = self.carregar_diretorio(diretorio, workers)
+        if sucesso:
+            trocados = {novo for _, novo in relatorio['ids_trocados'].values()}
+            self.configurador.marcar_limpas([i for i in relatorio['carregadas'] if i not in trocados])
+        return sucesso, relatorio
+
+    def _atualizar_contador_ids(self, id_simulacao: str) -> None:
+        """Garante que novos IDs não colidam com um ID carregado"""
+        numero = id_simulacao[3:]  # Remove "SIM"
+        if id_simulacao.startswith('SIM') and numero.isdigit():
+            if int(numero) >= self.configurador._proximo_id:
+                self.configurador._proximo_id = int(numero) + 1
+
+    def salvar_workspace_sqlite(self, caminho_banco: str) -> tuple[bool, str]:
+        """
+        UC03 - Salva todas as simulações em um banco SQLite
+
+        Args:
+            caminho_banco: Caminho do arquivo do banco
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        try:
+            repositorio = RepositorioSQLite(caminho_banco)
+            total = repositorio.salvar(self.configurador)
+
+            print(f"[UC03] Workspace salvo em: {caminho_banco} ({total} simulações) - Nick J")
+            return True, f"{total} simulações salvas em {caminho_banco}"
+
+        except Exception as e:
+            erro_msg = f"Erro ao salvar workspace: {str(e)}"
+            print(f"[UC03] {erro_msg}")
+            return False, erro_msg
+
+    def carregar_workspace_sqlite(self, caminho_banco: str) -> tuple[bool, Any]:
+        """
+        UC03 - Carrega todas as simulações de um banco SQLite
+
+        Parâmetros e histórico são lidos imediatamente; os resultados só
+        são lidos quando a simulação é aberta.
+
+        Args:
+            caminho_banco: Caminho do arquivo do banco
+
+        Returns:
+            Tupla (sucesso, lista_de_ids_ou_erro)
+        """
+        try:
+            repositorio = RepositorioSQLite(caminho_banco)
+            ids = []
+            for simulacao, total_resultados in repositorio.carregar():
+                self.configurador.adicionar_simulacao(simulacao)
+                self._atualizar_contador_ids(simulacao.id)
+                if total_resultados:
+                    self.configurador.definir_carregador_resultados(
+                        simulacao.id, repositorio.carregador_resultados(simulacao.id))
+                ids.append(simulacao.id)
+
+            print(f"[UC03] Workspace carregado de: {caminho_banco} ({len(ids)} simulações) - Nick J")
+            return True, ids
+
+        except Exception as e:
+            erro_msg = f"Erro ao carregar workspace: {str(e)}"
+            print(f"[UC03] {erro_msg}")
+            return False, erro_msg
+
+    def salvar_snapshot(self, caminho_arquivo: str) -> tuple[bool, str]:
+        """
+        UC03 - Salva o workspace inteiro em um snapshot binário
+
+        Args:
+            caminho_arquivo: Caminho do arquivo de snapshot
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        temporario = caminho_arquivo + '.tmp'
+        try:
+            metadados, buffers = capturar_snapshot(self.configurador)
+            with open(temporario, 'wb') as arquivo:
+                _escrever_arquivo_snapshot(metadados, buffers, arquivo)
+            os.replace(temporario, caminho_arquivo)
+
+            total = len(self.configurador.simulacoes)
+            print(f"[UC03] Snapshot salvo em: {caminho_arquivo} ({total} simulações) - Nick J")
+            return True, f"{total} simulações salvas em {caminho_arquivo}"
+
+        except Exception as e:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            erro_msg = f"Erro ao salvar snapshot: {str(e)}"
+            print(f"[UC03] {erro_msg}")
+            return False, erro_msg
+
+    def carregar_snapshot(self, caminho_arquivo: str) -> tuple[bool, Any]:
+        """
+        UC03 - Restaura um snapshot salvo com salvar_snapshot
+
+        Os resultados de cada simulação só são montados quando ela é aberta.
+
+        Args:
+            caminho_arquivo: Caminho do arquivo de snapshot
+
+        Returns:
+            Tupla (sucesso, lista_de_ids_ou_erro)
+        """
+        try:
+            metadados, buffers = _ler_arquivo_snapshot(caminho_arquivo)
+            ids = restaurar_snapshot(self.configurador, metadados, buffers)
+
+            print(f"[UC03] Snapshot carregado de: {caminho_arquivo} ({len(ids)} simulações) - Nick J")
+            return True, ids
+
+        except Exception as e:
+            erro_msg = f"Erro ao carregar snapshot: {str(e)}"
+            print(f"[UC03] {erro_msg}")
+            return False, erro_msg
+
+# Formato binário: cabeçalho fixo, parâmetros em JSON e resultados em colunas
+# float64 little-endian alinhadas em 8 bytes
+MAGICO_BINARIO = b'SINB'
+VERSAO_BINARIO = 1
+CABECALHO_BINARIO = struct.Struct('<4sHHII')  # mágico, versão, reservado, bytes do JSON, meses
+def _resumo_resultados(resultados: List[ResultadoMensal]) -> Optional[Dict[str, Any]]:
+    """Resumo gravado no cabeçalho para listagens sem ler os resultados"""
+    if not resultados:
+        return None
+    ultimo = resultados[-1]
+    return {
+        'saldo_final': ultimo.saldo_final,
+        'total_investido': ultimo.total_investido,
+        'juros_acumulados': ultimo.juros_acumulados,
+        'rentabilidade_percentual': round((ultimo.saldo_final / ultimo.total_investido - 1) * 100, 2),
+        'total_meses': len(resultados)
+    }
+
+def _escrever_binario(dados: Dict[str, Any], resultados: List[ResultadoMensal], arquivo) -> None:
+    """Grava uma simulação (dicionário sem resultados) e suas colunas de resultados"""
+    dados = dict(dados, resumo=_resumo_resultados(resultados))
+    parametros = json.dumps(dados, ensure_ascii=False).encode('utf-8')
+    parametros += b' ' * (-(CABECALHO_BINARIO.size + len(parametros)) % 8)
+
+    arquivo.write(CABECALHO_BINARIO.pack(MAGICO_BINARIO, VERSAO_BINARIO, 0,
+                                         len(parametros), len(resultados)))
+    arquivo.write(parametros)
+    for coluna in COLUNAS_RESULTADO:
+        valores = array('d', [getattr(r, coluna) for r in resultados])
+        if sys.byteorder == 'big':
+            valores.byteswap()
+        arquivo.write(valores.tobytes())
+
+def _ler_binario(dados) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Interpreta um snapshot binário sem copiar as colunas
+
+    Returns:
+        Tupla (dicionário da simulação, colunas de resultados). As colunas
+        são arrays NumPy ou memoryviews que apontam para `dados`.
+    """
+    tamanho_json, meses = _validar_cabecalho_binario(dados[:CABECALHO_BINARIO.size])
+
+    inicio = CABECALHO_BINARIO.size + tamanho_json
+    if len(dados) < inicio + meses * 8 * len(COLUNAS_RESULTADO):
+        raise ValueError("Arquivo binário incompleto")
+    parametros = json.loads(bytes(dados[CABECALHO_BINARIO.size:inicio]).decode('utf-8'))
+    parametros.pop('resumo', None)
+
+    colunas = {}
+    visao = memoryview(dados)
+    for i, coluna in enumerate(COLUNAS_RESULTADO):
+        deslocamento = inicio + i * meses * 8
+        if NUMPY_DISPONIVEL:
+            import numpy as np
+            colunas[coluna] = np.frombuffer(dados, dtype='<f8', count=meses, offset=deslocamento)
+        elif sys.byteorder == 'little':
+            colunas[coluna] = visao[deslocamento:deslocamento + meses * 8].cast('d')
+        else:
+            valores = array('d', visao[deslocamento:deslocamento + meses * 8])
+            valores.byteswap()
+            colunas[coluna] = memoryview(valores)
+    return parametros, colunas
+
+def _validar_cabecalho_binario(cabecalho: bytes) -> tuple[int, int]:
+    """Confere o cabeçalho fixo e retorna (bytes do JSON, quantidade de meses)"""
+    if len(cabecalho) < CABECALHO_BINARIO.size:
+        raise ValueError("Arquivo binário incompleto")
+    magico, versao, _, tamanho_json, meses = CABECALHO_BINARIO.unpack_from(cabecalho)
+    if magico != MAGICO_BINARIO:
+        raise ValueError("Arquivo não é um snapshot binário de simulação")
+    if versao > VERSAO_BINARIO:
+        raise ValueError(f"Versão {versao} do formato binário não suportada")
+    return tamanho_json, meses
+
+def ler_cabecalho_binario(caminho_arquivo: str) -> Dict[str, Any]:
+    """
+    Lê apenas o cabeçalho de um snapshot binário (parâmetros e resumo)
+
+    Args:
+        caminho_arquivo: Caminho do arquivo .sinb
+
+    Returns:
+        Dicionário da simulação sem resultados, com 'resumo' e 'total_resultados'
+    """
+    with open(caminho_arquivo, 'rb') as arquivo:
+        tamanho_json, meses = _validar_cabecalho_binario(arquivo.read(CABECALHO_BINARIO.size))
+        dados = json.loads(arquivo.read(tamanho_json).decode('utf-8'))
+    dados.setdefault('resumo', None)
+    dados['total_resultados'] = meses
+    return dados
+
+@contextmanager
+def mapear_colunas_binarias(caminho_arquivo: str):
+    """
+    Mapeia um snapshot binário em memória e fornece suas colunas
+
+    As colunas apontam direto para as páginas do arquivo e só são lidas do
+    disco quando acessadas. Elas não devem ser usadas fora do bloco with.
+
+    Args:
+        caminho_arquivo: Caminho do arquivo .sinb
+
+    Yields:
+        Tupla (dicionário da simulação, colunas de resultados)
+    """
+    with open(caminho_arquivo, 'rb') as arquivo:
+        mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        dados, colunas = _ler_binario(mapa)
+        yield dados, colunas
+    finally:
+        colunas = None
+        try:
+            mapa.close()
+        except BufferError:
+            pass  # Colunas ainda referenciadas; o mapa é fechado pelo coletor de lixo
+
+def _carregador_resultados_binarios(caminho_arquivo: str) -> Callable[[], List[ResultadoMensal]]:
+    """Cria a função que materializa os resultados de um snapshot sob demanda"""
+    def carregar_resultados() -> List[ResultadoMensal]:
+        with mapear_colunas_binarias(caminho_arquivo) as (_, colunas):
+            resultados = _resultados_de_colunas(colunas)
+            del colunas  # libera o mapa para ser fechado
+        return resultados
+    return carregar_resultados
+
+def _resultados_de_colunas(colunas: Dict[str, Any]) -> List[ResultadoMensal]:
+    """Monta a lista de ResultadoMensal a partir das colunas"""
+    return [ResultadoMensal(int(mes), *valores) for mes, *valores in zip(
+        *(colunas[c].tolist() for c in COLUNAS_RESULTADO))]
+
+def ler_colunas_binarias(caminho_arquivo: str) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Lê um snapshot binário como colunas, sem criar objetos por mês
+
+    Args:
+        caminho_arquivo: Caminho do arquivo .sinb
+
+    Returns:
+        Tupla (dicionário da simulação, colunas de resultados)
+    """
+    with open(caminho_arquivo, 'rb') as arquivo:
+        return _ler_binario(arquivo.read())
+
+def _sincronizar_diretorio(diretorio: str) -> None:
+    """Garante que renomeações no diretório sobrevivam a uma queda"""
+    try:
+        descritor = os.open(diretorio, os.O_RDONLY)
+    except OSError:
+        return  # Sistemas sem suporte a abrir diretórios (Windows)
+    try:
+        os.fsync(descritor)
+    except OSError:
+        pass
+    finally:
+        os.close(descritor)
+
+def _ler_simulacao_json(caminho_arquivo: str) -> tuple[str, Optional[Dict[str, Any]], Optional[str], Optional[str]]:
+    """
+    Lê um arquivo de simulação como dicionário (executado nos processos de carga em lote)
+
+    Só dados simples voltam para quem chamou: os resultados seguem no layout
+    em colunas (arquivos antigos, um objeto por mês, são convertidos aqui) e
+    a Simulacao é montada com Simulacao.from_dict no processo principal.
+
+    Returns:
+        Tupla (caminho, dicionário ou None, versão lida ou None, erro ou None)
+    """
+    try:
+        dados, versao = _ler_json_consistente(caminho_arquivo)
+        if not isinstance(dados, dict):
+            raise ValueError("arquivo não contém uma simulação")
+        resultados = dados.get('resultados')
+        if resultados and not isinstance(resultados, dict):
+            dados['resultados'] = dict(zip(COLUNAS_RESULTADO, map(list, zip(*map(_valores_linha_json, resultados)))))
+        return caminho_arquivo, dados, versao, None
+    except Exception as e:
+        return caminho_arquivo, None, None, str(e)
+
+# Snapshot do workspace: metadados em pickle protocolo 5 e resultados como
+# buffers float64 fora de banda, gravados e lidos sem cópias intermediárias.
+# Usa a ordem de bytes nativa (destinado a suspender/retomar a sessão e a
+# enviar estado para processos de trabalho); só carregue arquivos confiáveis.
+MAGICO_SNAPSHOT = b'SINP'
+VERSAO_SNAPSHOT = 1
+CABECALHO_SNAPSHOT = struct.Struct('<4sHHIQ')  # mágico, versão, ordem dos bytes, buffers, bytes do pickle
+TAMANHO_BUFFER_SNAPSHOT = struct.Struct('<Q')
+_ORDEM_BYTES = {'little': 0, 'big': 1}
+
+def _restaurar_colunas_resultados(buffer, meses: int) -> '_ColunasResultados':
+    return _ColunasResultados(memoryview(buffer).cast('B').cast('d'), meses)
+
+class _ColunasResultados:
+    """Resultados de uma simulação em um único bloco float64, uma coluna após a outra"""
+    __slots__ = ('valores', 'meses')
+
+    def __init__(self, valores, meses: int):
+        self.valores = valores
+        self.meses = meses
+
+    @classmethod
+    def de_resultados(cls, resultados: List[ResultadoMensal]) -> '_ColunasResultados':
+        colunas = zip(*map(_valores_resultado, resultados))
+        return cls(array('d', itertools.chain.from_iterable(colunas)), len(resultados))
+
+    def __reduce_ex__(self, protocolo):
+        if protocolo >= 5:
+            return _restaurar_colunas_resultados, (pickle.PickleBuffer(self.valores), self.meses)
+        return _restaurar_colunas_resultados, (bytes(self.valores), self.meses)
+
+    def resultados(self) -> List[ResultadoMensal]:
+        n = self.meses
+        valores = self.valores
+        return list(map(ResultadoMensal, map(int, valores[:n]),
+                        *(valores[k * n:(k + 1) * n] for k in range(1, len(COLUNAS_RESULTADO)))))
+
+def capturar_snapshot(configurador: ConfiguradorSimulacao) -> tuple[bytes, List[pickle.PickleBuffer]]:
+    """
+    Serializa o workspace inteiro: simulações, histórico, resultados e contador de IDs
+
+    Returns:
+        Tupla (pickle dos metadados, buffers dos resultados fora de banda); os
+        dois juntos são aceitos por restaurar_snapshot, inclusive em outro processo
+    """
+    simulacoes = []
+    for id_simulacao, simulacao in configurador.simulacoes.items():
+        # Lê direto do dicionário: obter_simulacao materializaria resultados
+        # pendentes e mexeria na ordem do LRU, forçando descartes em cascata
+        carregador = configurador._carregadores_resultados.get(id_simulacao)
+        if isinstance(getattr(carregador, '__self__', None), _ColunasResultados):
+            colunas = carregador.__self__  # Snapshot restaurado e ainda não aberto
+        else:
+            resultados = carregador() if carregador is not None else simulacao.resultados
+            colunas = _ColunasResultados.de_resultados(resultados) if resultados else None
+        metadados = copy.copy(simulacao)
+        metadados.resultados = []
+        simulacoes.append((metadados, colunas))
+
+    estado = {'proximo_id': configurador._proximo_id, 'simulacoes': simulacoes}
+    buffers: List[pickle.PickleBuffer] = []
+    return pickle.dumps(estado, protocol=5, buffer_callback=buffers.append), buffers
+
+def restaurar_snapshot(configurador: ConfiguradorSimulacao, metadados, buffers) -> List[str]:
+    """
+    Incorpora ao configurador um snapshot de capturar_snapshot
+
+    Os resultados continuam nos buffers e só viram objetos quando cada
+    simulação é aberta.
+
+    Returns:
+        IDs das simulações restauradas
+    """
+    estado = pickle.loads(metadados, buffers=buffers)
+    ids = []
+    for simulacao, colunas in estado['simulacoes']:
+        configurador.adicionar_simulacao(simulacao)
+        if colunas is not None:
+            configurador.definir_carregador_resultados(simulacao.id, colunas.resultados)
+        ids.append(simulacao.id)
+    configurador._proximo_id = max(configurador._proximo_id, estado['proximo_id'])
+    return ids
+
+def _escrever_arquivo_snapshot(metadados: bytes, buffers: List[pickle.PickleBuffer], arquivo) -> None:
+    """Grava cabeçalho, tamanhos dos buffers, pickle e os buffers alinhados em 8 bytes"""
+    visoes = [buffer.raw() for buffer in buffers]
+    arquivo.write(CABECALHO_SNAPSHOT.pack(MAGICO_SNAPSHOT, VERSAO_SNAPSHOT,
+                                          _ORDEM_BYTES[sys.byteorder], len(visoes), len(metadados)))
+    arquivo.write(b''.join(TAMANHO_BUFFER_SNAPSHOT.pack(visao.nbytes) for visao in visoes))
+    arquivo.write(metadados)
+    arquivo.write(b'\0' * (-arquivo.tell() % 8))
+    for visao in visoes:
+        arquivo.write(visao)
+
+def _ler_arquivo_snapshot(caminho_arquivo: str) -> tuple[memoryview, List[memoryview]]:
+    """Lê o arquivo de uma vez e devolve fatias (sem cópia) do pickle e dos buffers"""
+    with open(caminho_arquivo, 'rb', buffering=0) as arquivo:
+        dados = bytearray(os.fstat(arquivo.fileno()).st_size)
+        visao = memoryview(dados)
+        lidos = 0
+        while lidos < len(dados):
+            quantidade = arquivo.readinto(visao[lidos:])
+            if not quantidade:
+                raise ValueError("Arquivo de snapshot truncado")
+            lidos += quantidade
+
+    if len(dados) < CABECALHO_SNAPSHOT.size:
+        raise ValueError("Arquivo de snapshot truncado")
+    magico, versao, ordem, total_buffers, tamanho_metadados = CABECALHO_SNAPSHOT.unpack_from(dados)
+    if magico != MAGICO_SNAPSHOT:
+        raise ValueError("Arquivo não é um snapshot de workspace")
+    if versao > VERSAO_SNAPSHOT:
+        raise ValueError(f"Versão de snapshot não suportada: {versao}")
+    if ordem != _ORDEM_BYTES[sys.byteorder]:
+        raise ValueError("Snapshot gravado em máquina com outra ordem de bytes")
+
+    posicao = CABECALHO_SNAPSHOT.size
+    tamanhos = [TAMANHO_BUFFER_SNAPSHOT.unpack_from(dados, posicao + i * TAMANHO_BUFFER_SNAPSHOT.size)[0]
+                for i in range(total_buffers)]
+    posicao += total_buffers * TAMANHO_BUFFER_SNAPSHOT.size
+    metadados = visao[posicao:posicao + tamanho_metadados]
+    posicao += tamanho_metadados
+    posicao += -posicao % 8
+
+    buffers = []
+    for tamanho in tamanhos:
+        buffers.append(visao[posicao:posicao + tamanho])
+        posicao += tamanho
+    if posicao > len(dados):
+        raise ValueError("Arquivo de snapshot truncado")
+    return metadados, buffers
+
+class RepositorioSQLite:
+    """
+    UC03 - Armazena um workspace inteiro em um banco SQLite
+
+    Parâmetros, histórico e resultados ficam em tabelas separadas. As
+    gravações usam uma única transação com executemany, que reaproveita
+    o mesmo comando preparado para todas as linhas.
+    """
+
+    ESQUEMA = (
+        """CREATE TABLE IF NOT EXISTS simulacoes (
+            id TEXT PRIMARY KEY,
+            nome TEXT NOT NULL,
+            aporte_inicial REAL,
+            aporte_mensal REAL,
+            prazo_meses INTEGER,
+            tipo_taxa TEXT,
+            taxa_fixa REAL,
+            taxas_variaveis TEXT,
+            data_criacao TEXT,
+            data_modificacao TEXT,
+            id_origem TEXT,
+            total_resultados INTEGER NOT NULL DEFAULT 0
+        )""",
+        """CREATE TABLE IF NOT EXISTS historico (
+            id_simulacao TEXT NOT NULL,
+            ordem INTEGER NOT NULL,
+            timestamp TEXT,
+            campo_alterado TEXT,
+            valor_antigo TEXT,
+            valor_novo TEXT,
+            PRIMARY KEY (id_simulacao, ordem)
+        ) WITHOUT ROWID""",
+        """CREATE TABLE IF NOT EXISTS resultados (
+            id_simulacao TEXT NOT NULL,
+            mes INTEGER NOT NULL,
+            aporte_mes REAL,
+            total_investido REAL,
+            juros_mes REAL,
+            juros_acumulados REAL,
+            saldo_final REAL,
+            PRIMARY KEY (id_simulacao, mes)
+        ) WITHOUT ROWID"""
+    )
+
+    SQL_SIMULACAO = "INSERT OR REPLACE INTO simulacoes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    SQL_HISTORICO = "INSERT INTO historico VALUES (?, ?, ?, ?, ?, ?)"
+    SQL_RESULTADO = "INSERT INTO resultados VALUES (?, ?, ?, ?, ?, ?, ?)"
+
+    def __init__(self, caminho_banco: str):
+        self.caminho_banco = caminho_banco
+
+        with self._conectar() as conexao:
+            for comando in self.ESQUEMA:
+                conexao.execute(comando)
+
+    def _conectar(self) -> sqlite3.Connection:
+        import sqlite3
+        conexao = sqlite3.connect(self.caminho_banco)
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA synchronous=NORMAL")
+        return conexao
+
+    def salvar(self, configurador: ConfiguradorSimulacao) -> int:
+        """Grava o workspace em uma transação e remove simulações excluídas"""
+        conexao = self._conectar()
+        try:
+            with conexao:
+                existentes = {linha[0] for linha in conexao.execute("SELECT id FROM simulacoes")}
+                removidas = [(id_sim,) for id_sim in existentes - configurador.simulacoes.keys()]
+                for tabela, coluna in (('simulacoes', 'id'), ('historico', 'id_simulacao'),
+                                       ('resultados', 'id_simulacao')):
+                    conexao.executemany(f"DELETE FROM {tabela} WHERE {coluna} = ?", removidas)
+
+                origem_banco = os.path.abspath(self.caminho_banco)
+                for id_sim, simulacao in configurador.simulacoes.items():
+                    # Resultados ainda não abertos, lidos deste banco com o mesmo ID,
+                    # continuam válidos nele (vale para qualquer instância do repositório)
+                    carregador = configurador._carregadores_resultados.get(id_sim)
+                    intactos = getattr(carregador, 'origem', None) == (origem_banco, id_sim)
+                    if intactos:
+                        total_resultados = conexao.execute(
+                            "SELECT total_resultados FROM simulacoes WHERE id = ?", (id_sim,)).fetchone()[0]
+                    else:
+                        simulacao = configurador.obter_simulacao(id_sim)
+                        total_resultados = len(simulacao.resultados)
+
+                    conexao.execute(self.SQL_SIMULACAO, (
+                        simulacao.id,
+                        simulacao.nome,
+                        simulacao.aporte_inicial,
+                        simulacao.aporte_mensal,
+                        simulacao.prazo_meses,
+                        simulacao.tipo_taxa.value,
+                        simulacao.taxa_fixa,
+                        json.dumps(simulacao.taxas_variaveis) if simulacao.taxas_variaveis is not None else None,
+                        simulacao.data_criacao.isoformat() if simulacao.data_criacao else None,
+                        simulacao.data_modificacao.isoformat() if simulacao.data_modificacao else None,
+                        simulacao.id_origem,
+                        total_resultados
+                    ))
+
+                    conexao.execute("DELETE FROM historico WHERE id_simulacao = ?", (id_sim,))
+                    conexao.executemany(self.SQL_HISTORICO, (
+                        (id_sim, ordem, h['timestamp'], h['campo_alterado'], h['valor_antigo'], h['valor_novo'])
+                        for ordem, h in enumerate(m.to_dict() for m in simulacao.historico)
+                    ))
+
+                    if not intactos:
+                        conexao.execute("DELETE FROM resultados WHERE id_simulacao = ?", (id_sim,))
+                        conexao.executemany(self.SQL_RESULTADO, (
+                            (id_sim, r.mes, r.aporte_mes, r.total_investido,
+                             r.juros_mes, r.juros_acumulados, r.saldo_final)
+                            for r in simulacao.resultados
+                        ))
+        finally:
+            conexao.close()
+
+        return len(configurador.simulacoes)
+
+    def carregar(self):
+        """Gera (simulação sem resultados, quantidade de resultados no banco)"""
+        conexao = self._conectar()
+        try:
+            historicos: Dict[str, List[HistoricoModificacao]] = {}
+            for id_sim, timestamp, campo, antigo, novo in conexao.execute(
+                    "SELECT id_simulacao, timestamp, campo_alterado, valor_antigo, valor_novo "
+                    "FROM historico ORDER BY id_simulacao, ordem"):
+                historicos.setdefault(id_sim, []).append(HistoricoModificacao(
+                    timestamp=datetime.fromisoformat(timestamp),
+                    campo_alterado=campo,
+                    valor_antigo=antigo,
+                    valor_novo=novo
+                ))
+
+            for linha in conexao.execute("SELECT * FROM simulacoes ORDER BY id"):
+                (id_sim, nome, aporte_inicial, aporte_mensal, prazo_meses, tipo_taxa, taxa_fixa,
+                 taxas_variaveis, data_criacao, data_modificacao, id_origem, total_resultados) = linha
+                simulacao = Simulacao(
+                    id=id_sim,
+                    nome=nome,
+                    aporte_inicial=aporte_inicial,
+                    aporte_mensal=aporte_mensal,
+                    prazo_meses=prazo_meses,
+                    tipo_taxa=TipoTaxa(tipo_taxa),
+                    taxa_fixa=taxa_fixa,
+                    taxas_variaveis=json.loads(taxas_variaveis) if taxas_variaveis is not None else None,
+                    data_criacao=datetime.fromisoformat(data_criacao) if data_criacao else None,
+                    data_modificacao=datetime.fromisoformat(data_modificacao) if data_modificacao else None,
+                    historico=historicos.get(id_sim),
+                    id_origem=id_origem
+                )
+                yield simulacao, total_resultados
+        finally:
+            conexao.close()
+
+    def carregador_resultados(self, id_simulacao: str) -> Callable[[], List[ResultadoMensal]]:
+        """Cria a função que lê os resultados de uma simulação sob demanda"""
+        def carregar_resultados() -> List[ResultadoMensal]:
+            import sqlite3
+            conexao = sqlite3.connect(self.caminho_banco)
+            try:
+                return [ResultadoMensal(*linha) for linha in conexao.execute(
+                    "SELECT mes, aporte_mes, total_investido, juros_mes, juros_acumulados, saldo_final "
+                    "FROM resultados WHERE id_simulacao = ? ORDER BY mes", (id_simulacao,))]
+            finally:
+                conexao.close()
+
+        # Identifica a origem dos resultados para salvar() não regravá-los
+        carregar_resultados.origem = (os.path.abspath(self.caminho_banco), id_simulacao)
+        return carregar_resultados
+
+def _valor_para_json(valor: Any) -> Any:
+    """Converte valores de parâmetros para tipos aceitos pelo JSON"""
+    return valor.value if isinstance(valor, TipoTaxa) else valor
+
+def _valor_de_json(campo: str, valor: Any) -> Any:
+    """Restaura o tipo original de um valor gravado com _valor_para_json"""
+    if campo == 'tipo_taxa' and valor is not None:
+        return TipoTaxa(valor)
+    return valor
+
+def _dados_sem_resultados(simulacao: Simulacao) -> Dict[str, Any]:
+    """to_dict sem os resultados, que são recalculáveis a partir dos parâmetros"""
+    copia = copy.copy(simulacao)
+    copia.resultados = []
+    return copia.to_dict()
+
+class DiarioWorkspace:
+    """
+    UC03 - Diário de modificações somente-anexação de um workspace
+
+    Cada criação, alteração e exclusão vira uma linha no diário, com
+    CRC32 e número de sequência, em vez de regravar arquivos inteiros.
+    A compactação grava um snapshot com o estado atual e descarta o
+    diário já incorporado. Após uma queda, o estado é o snapshot mais a
+    reaplicação do final do diário.
+    """
+
+    ARQUIVO_SNAPSHOT = 'snapshot.json'
+    ARQUIVO_DIARIO = 'diario.log'
+    ARQUIVO_COMPACTANDO = 'diario.log.compactando'
+
+    def __init__(self, diretorio: str, fsync_cada_registro: bool = False):
+        self.diretorio = diretorio
+        self.fsync_cada_registro = fsync_cada_registro
+        self._trava = threading.Lock()
+        self._arquivo = None
+        self._sequencia = 0
+        self._configurador: Optional[ConfiguradorSimulacao] = None
+        self._compactacao: Optional[threading.Thread] = None
+        self._erro_compactacao: Optional[BaseException] = None
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _caminho(self, nome: str) -> str:
+        return os.path.join(self.diretorio, nome)
+
+    def abrir(self, configurador: ConfiguradorSimulacao) -> int:
+        """
+        Recupera o workspace (snapshot + diário) e passa a registrar mudanças
+
+        Simulações que já estavam no configurador e não vêm do diário
+        ganham um registro 'criar', para que as alterações seguintes
+        tenham a que se aplicar na próxima abertura.
+
+        Returns:
+            Quantidade de registros do diário reaplicados
+        """
+        preexistentes = list(configurador.simulacoes.values())
+        estado, proximo_id, sequencia = self._ler_snapshot()
+
+        reaplicados = 0
+        for nome in (self.ARQUIVO_COMPACTANDO, self.ARQUIVO_DIARIO):
+            for registro in self._ler_registros(self._caminho(nome)):
+                # Registros já incorporados ao snapshot são ignorados
+                if registro['seq'] <= sequencia:
+                    continue
+                self._aplicar_registro(estado, registro)
+                sequencia = registro['seq']
+                reaplicados += 1
+
+        for dados in estado.values():
+            configurador.adicionar_simulacao(Simulacao.from_dict(dados))
+            numero = dados['id'][3:]
+            if dados['id'].startswith('SIM') and numero.isdigit():
+                proximo_id = max(proximo_id, int(numero) + 1)
+        configurador._proximo_id = max(configurador._proximo_id, proximo_id)
+
+        self._sequencia = sequencia
+        self._arquivo = open(self._caminho(self.ARQUIVO_DIARIO), 'ab')
+        self._configurador = configurador
+        configurador.adicionar_observador(self._registrar)
+        for simulacao in preexistentes:
+            if configurador.simulacoes.get(simulacao.id) is simulacao:
+                self._registrar('criar', simulacao, None)
+        return reaplicados
+
+    def _ler_snapshot(self) -> tuple[Dict[str, Dict[str, Any]], int, int]:
+        caminho = self._caminho(self.ARQUIVO_SNAPSHOT)
+        if not os.path.exists(caminho):
+            return {}, 1, 0
+
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            snapshot = json.load(arquivo)
+        estado = {dados['id']: dados for dados in snapshot['simulacoes']}
+        return estado, snapshot['proximo_id'], snapshot['sequencia']
+
+    def _ler_registros(self, caminho: str):
+        """Gera os registros válidos, truncando um final corrompido ou incompleto"""
+        if not os.path.exists(caminho):
+            return
+
+        with open(caminho, 'r+b') as arquivo:
+            valido_ate = 0
+            for linha in arquivo:
+                try:
+                    crc, conteudo = linha.rstrip(b'\n').split(b' ', 1)
+                    if not linha.endswith(b'\n') or int(crc, 16) != zlib.crc32(conteudo):
+                        break
+                    registro = json.loads(conteudo)
+                except ValueError:
+                    break
+                valido_ate += len(linha)
+                yield registro
+
+            arquivo.truncate(valido_ate)
+
+    @staticmethod
+    def _aplicar_registro(estado: Dict[str, Dict[str, Any]], registro: Dict[str, Any]) -> None:
+        """Aplica um registro ao estado em forma de dicionários (como em to_dict)"""
+        operacao, id_sim = registro['op'], registro['id']
+        if operacao == 'criar':
+            estado[id_sim] = registro['dados']
+        elif operacao == 'excluir':
+            estado.pop(id_sim, None)
+        elif operacao in ('alterar', 'restaurar') and id_sim in estado:
+            dados = estado[id_sim]
+            campo = registro['campo']
+            antigo = _valor_de_json(campo, registro['antigo'])
+            novo = _valor_de_json(campo, registro['novo'])
+
+            dados[campo] = registro['novo']
+            if campo in CAMPOS_PARAMETROS:
+                dados['resultados'] = []
+            dados['data_modificacao'] = registro['timestamp']
+            if operacao == 'restaurar':
+                return
+            dados.setdefault('historico', []).append(HistoricoModificacao(
+                timestamp=datetime.fromisoformat(registro['timestamp']),
+                campo_alterado=campo,
+                valor_antigo=antigo,
+                valor_novo=novo
+            ).to_dict())
+
+    def _registrar(self, evento: str, simulacao: Simulacao,
+                   modificacao: Optional[HistoricoModificacao]) -> None:
+        """Observador do configurador: anexa a mudança ao diário"""
+        registro: Dict[str, Any] = {'op': evento, 'id': simulacao.id}
+        if evento == 'criar':
+            registro['dados'] = _dados_sem_resultados(simulacao)
+        elif evento in ('alterar', 'restaurar'):
+            registro.update({
+                'timestamp': modificacao.timestamp.isoformat(),
+                'campo': modificacao.campo_alterado,
+                'antigo': _valor_para_json(modificacao.valor_antigo),
+                'novo': _valor_para_json(modificacao.valor_novo)
+            })
+
+        with self._trava:
+            self._sequencia += 1
+            registro['seq'] = self._sequencia
+            conteudo = json.dumps(registro, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            self._arquivo.write(b'%08x %s\n' % (zlib.crc32(conteudo), conteudo))
+            self._arquivo.flush()
+            if self.fsync_cada_registro:
+                os.fsync(self._arquivo.fileno())
+
+    def compactar(self, em_segundo_plano: bool = True) -> None:
+        """
+        Incorpora o diário a um novo snapshot
+
+        O estado é capturado e o diário é trocado sob a trava; a gravação
+        do snapshot, que é a parte lenta, roda em uma thread separada. Como
+        no diário, o snapshot guarda só parâmetros e histórico: resultados
+        pendentes ou descartados não são carregados nem recalculados.
+
+        Se uma compactação anterior falhou, o diário.log.compactando ainda
+        existe e é o único registro do que não chegou ao snapshot; o diário
+        atual é anexado a ele em vez de substituí-lo.
+        """
+        if self._configurador is None:
+            raise RuntimeError("Diário não foi aberto")
+        self.aguardar_compactacao()
+
+        configurador = self._configurador
+        with self._trava:
+            snapshot = {
+                'sequencia': self._sequencia,
+                'proximo_id': configurador._proximo_id,
+                'simulacoes': [_dados_sem_resultados(simulacao)
+                               for simulacao in list(configurador.simulacoes.values())]
+            }
+            self._arquivo.close()
+            diario = self._caminho(self.ARQUIVO_DIARIO)
+            compactando = self._caminho(self.ARQUIVO_COMPACTANDO)
+            if os.path.exists(compactando):
+                with open(diario, 'rb') as origem, open(compactando, 'ab') as destino:
+                    while bloco := origem.read(TAMANHO_BLOCO_COMPRESSAO):
+                        destino.write(bloco)
+                    destino.flush()
+                    os.fsync(destino.fileno())
+                self._arquivo = open(diario, 'wb')
+            else:
+                os.replace(diario, compactando)
+                self._arquivo = open(diario, 'ab')
+
+        if em_segundo_plano:
+            self._compactacao = threading.Thread(target=self._gravar_snapshot, args=(snapshot,),
+                                                 name='compactacao-diario', daemon=True)
+            self._compactacao.start()
+        else:
+            self._gravar_snapshot(snapshot)
+
+    def _gravar_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        temporario = self._caminho(self.ARQUIVO_SNAPSHOT + '.tmp')
+        try:
+            with open(temporario, 'w', encoding='utf-8') as arquivo:
+                json.dump(snapshot, arquivo, ensure_ascii=False)
+                arquivo.flush()
+                os.fsync(arquivo.fileno())
+            os.replace(temporario, self._caminho(self.ARQUIVO_SNAPSHOT))
+        except BaseException as e:
+            # O .compactando fica: a próxima compactação o incorpora
+            if os.path.isfile(temporario):
+                os.remove(temporario)
+            self._erro_compactacao = e
+            return
+        os.remove(self._caminho(self.ARQUIVO_COMPACTANDO))
+
+    def aguardar_compactacao(self) -> None:
+        """
+        Espera a compactação em segundo plano terminar
+
+        Raises:
+            A exceção da gravação do snapshot, se ela falhou
+        """
+        if self._compactacao is not None:
+            self._compactacao.join()
+            self._compactacao = None
+        erro, self._erro_compactacao = self._erro_compactacao, None
+        if erro is not None:
+            raise erro
+
+    def fechar(self) -> None:
+        """Conclui a compactação pendente e fecha o diário (mesmo se ela falhou)"""
+        try:
+            self.aguardar_compactacao()
+        finally:
+            if self._configurador is not None:
+                self._configurador.remover_observador(self._registrar)
+                self._configurador = None
+            with self._trava:
+                if self._arquivo is not None:
+                    self._arquivo.flush()
+                    os.fsync(self._arquivo.fileno())
+                    self._arquivo.close()
+                    self._arquivo = None
+
+# ============================================================================
+# UC04 - EXPORTAR SIMULAÇÃO PARA CSV
+# ============================================================================
+
+def _escrever_csv_simulacao(simulacao: Simulacao, arquivo) -> None:
+    """Escreve o relatório CSV de uma simulação em um arquivo de texto já aberto"""
+    import csv
+    writer = csv.writer(arquivo)
+
+    # Cabeçalho com informações da simulação
+    writer.writerow(['INFORMAÇÕES DA SIMULAÇÃO'])
+    writer.writerow(['ID', simulacao.id])
+    writer.writerow(['Nome', simulacao.nome])
+    writer.writerow(['Aporte Inicial (R$)', f'{simulacao.aporte_inicial:.2f}'])
+    writer.writerow(['Aporte Mensal (R$)', f'{simulacao.aporte_mensal:.2f}'])
+    writer.writerow(['Prazo (meses)', simulacao.prazo_meses])
+    writer.writerow(['Tipo de Taxa', simulacao.tipo_taxa.value])
+
+    if simulacao.tipo_taxa == TipoTaxa.FIXA:
+        writer.writerow(['Taxa Fixa (%)', f'{simulacao.taxa_fixa:.2f}'])
+    else:
+        writer.writerow(['Taxas Variáveis (%)', ', '.join(f'{t:.2f}' for t in simulacao.taxas_variaveis)])
+
+    writer.writerow(['Data de Criação', simulacao.data_criacao.strftime('%d/%m/%Y %H:%M:%S')])
+    writer.writerow(['Data de Modificação', simulacao.data_modificacao.strftime('%d/%m/%Y %H:%M:%S')])
+    writer.writerow([])
+
+    # Resultados mensais
+    if simulacao.resultados:
+        writer.writerow(['RESULTADOS MENSAIS'])
+        writer.writerow(['Mês', 'Aporte do Mês (R$)', 'Total Investido (R$)',
+                         'Juros do Mês (R$)', 'Juros Acumulados (R$)', 'Saldo Final (R$)'])
+
+        for resultado in simulacao.resultados:
+            writer.writerow([
+                resultado.mes,
+                f'{resultado.aporte_mes:.2f}',
+                f'{resultado.total_investido:.2f}',
+                f'{resultado.juros_mes:.2f}',
+                f'{resultado.juros_acumulados:.2f}',
+                f'{resultado.saldo_final:.2f}'
+            ])
+
+        # Resumo final
+        ultimo = simulacao.resultados[-1]
+        writer.writerow([])
+        writer.writerow(['RESUMO FINAL'])
+        writer.writerow(['Saldo Final (R$)', f'{ultimo.saldo_final:.2f}'])
+        writer.writerow(['Total Investido (R$)', f'{ultimo.total_investido:.2f}'])
+        writer.writerow(['Juros Acumulados (R$)', f'{ultimo.juros_acumulados:.2f}'])
+        rentabilidade = ((ultimo.saldo_final / ultimo.total_investido - 1) * 100)
+        writer.writerow(['Rentabilidade (%)', f'{rentabilidade:.2f}'])
+    else:
+        writer.writerow(['Simulação ainda não foi calculada'])
+
+# Exportação em lote: formato longo, uma linha por simulação e mês
+CABECALHO_CSV_LOTE = ['id'] + list(COLUNAS_RESULTADO)
+LINHAS_POR_LOTE_CSV = 4096
+
+def _formato_linha_csv_lote(id_simulacao: str) -> str:
+    """
+    Modelo %-format de uma linha da simulação, com o ID já escapado
+
+    O ID é citado como faria o csv.writer (só se tiver separador, aspas ou
+    quebra de linha) e os '%' dobrados, já que ele vira parte do modelo.
+    """
+    if any(caractere in id_simulacao for caractere in ',"\r\n'):
+        id_simulacao = '"' + id_simulacao.replace('"', '""') + '"'
+    return id_simulacao.replace('%', '%%') + ',%d' + ',%.2f' * (len(COLUNAS_RESULTADO) - 1) + '\r\n'
+
+def _texto_csv_lote(id_simulacao: str, resultados: List[ResultadoMensal]) -> str:
+    """
+    Texto CSV de todas as linhas de uma simulação
+
+    Uma única operação % por linha (em C) em vez de uma chamada de format
+    por célula mais o csv.writer; a saída é idêntica byte a byte.
+    """
+    return ''.join(map(_formato_linha_csv_lote(id_simulacao).__mod__, map(_valores_resultado, resultados)))
+
+# Exportação colunar: resultados em colunas tipadas (formato longo) e os
+# parâmetros das simulações como metadados do arquivo
+EXTENSOES_COLUNARES = {'.npz': 'npz', '.arrow': 'arrow', '.feather': 'arrow',
+                       '.ipc': 'arrow', '.parquet': 'parquet'}
+LINHAS_POR_LOTE_COLUNAR = 256 * 1024
+
+def _parametros_exportacao(simulacao: Simulacao) -> Dict[str, Any]:
+    """Parâmetros de uma simulação gravados nos metadados da exportação colunar"""
+    return {
+        'nome': simulacao.nome,
+        'aporte_inicial': simulacao.aporte_inicial,
+        'aporte_mensal': simulacao.aporte_mensal,
+        'prazo_meses': simulacao.prazo_meses,
+        'tipo_taxa': simulacao.tipo_taxa.value,
+        'taxa_fixa': simulacao.taxa_fixa,
+        'taxas_variaveis': simulacao.taxas_variaveis,
+        'id_origem': simulacao.id_origem
+    }
+
+def _novo_lote_colunar() -> Dict[str, array]:
+    lote = {'simulacao': array('i'), 'mes': array('i')}
+    lote.update((coluna, array('d')) for coluna in COLUNAS_RESULTADO[1:])
+    return lote
+
+def _lotes_colunares(configurador: ConfiguradorSimulacao, ids_simulacoes: List[str],
+                     linhas_por_lote: int):
+    """Agrupa os resultados em colunas array, fechando um lote a cada linhas_por_lote"""
+    lote = _novo_lote_colunar()
+    for indice, id_simulacao in enumerate(ids_simulacoes):
+        resultados = configurador.consultar_resultados(id_simulacao)
+        if not resultados:
+            continue
+        mes, *valores = zip(*map(_valores_resultado, resultados))
+        lote['simulacao'].extend(itertools.repeat(indice, len(mes)))
+        lote['mes'].extend(mes)
+        for coluna, serie in zip(COLUNAS_RESULTADO[1:], valores):
+            lote[coluna].extend(serie)
+        if len(lote['mes']) >= linhas_por_lote:
+            yield lote
+            lote = _novo_lote_colunar()
+    if lote['mes']:
+        yield lote
+
+def _gravar_npz(caminho_arquivo: str, ids_simulacoes: List[str], metadados: str, lotes) -> int:
+    """
+    Grava um .npz com as colunas, os IDs (índice da coluna 'simulacao') e os parâmetros
+
+    Cada lote é despejado em um arquivo temporário por coluna; no fim, cada
+    coluna entra no zip como um único .npy (cabeçalho com o total de linhas
+    e os bytes copiados em blocos). A memória fica limitada a um lote.
+    """
+    import shutil
+    import tempfile
+    import zipfile
+    import numpy as np
+    tipos = {nome: np.dtype(np.int32 if valores.typecode == 'i' else np.float64)
+             for nome, valores in _novo_lote_colunar().items()}
+    brutos = {nome: tempfile.TemporaryFile() for nome in tipos}
+    try:
+        total = 0
+        for lote in lotes:
+            for nome, valores in lote.items():
+                valores.tofile(brutos[nome])
+            total += len(lote['mes'])
+
+        with zipfile.ZipFile(caminho_arquivo, 'w', zipfile.ZIP_STORED, allowZip64=True) as arquivo_zip:
+            for nome, valores in (('ids', np.array(ids_simulacoes, dtype=str)),
+                                  ('parametros', np.array(metadados))):
+                with arquivo_zip.open(nome + '.npy', 'w', force_zip64=True) as membro:
+                    np.lib.format.write_array(membro, valores)
+            for nome, bruto in brutos.items():
+                with arquivo_zip.open(nome + '.npy', 'w', force_zip64=True) as membro:
+                    np.lib.format.write_array_header_1_0(membro, {
+                        'descr': np.lib.format.dtype_to_descr(tipos[nome]),
+                        'fortran_order': False,
+                        'shape': (total,)})
+                    bruto.seek(0)
+                    shutil.copyfileobj(bruto, membro, TAMANHO_BLOCO_COMPRESSAO)
+        return total
+    finally:
+        for bruto in brutos.values():
+            bruto.close()
+
+def _gravar_arrow(caminho_arquivo: str, formato: str, ids_simulacoes: List[str],
+                  metadados: str, lotes) -> int:
+    """Grava lote a lote em Arrow IPC ou Parquet, com os IDs em coluna de dicionário"""
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+    dicionario = pa.array(ids_simulacoes, type=pa.string())
+    esquema = pa.schema(
+        [('id', pa.dictionary(pa.int32(), pa.string())), ('mes', pa.int32())]
+        + [(coluna, pa.float64()) for coluna in COLUNAS_RESULTADO[1:]],
+        metadata={b'parametros': metadados.encode('utf-8')})
+
+    if formato == 'parquet':
+        escritor = pq.ParquetWriter(caminho_arquivo, esquema)
+    else:
+        escritor = pa.ipc.new_file(caminho_arquivo, esquema)
+
+    total = 0
+    with escritor:
+        for lote in lotes:
+            quantidade = len(lote['mes'])
+            inteiros = lambda valores: pa.Array.from_buffers(
+                pa.int32(), quantidade, [None, pa.py_buffer(valores)])
+            colunas = [pa.DictionaryArray.from_arrays(inteiros(lote['simulacao']), dicionario),
+                       inteiros(lote['mes'])]
+            colunas += [pa.Array.from_buffers(pa.float64(), quantidade, [None, pa.py_buffer(lote[c])])
+                        for c in COLUNAS_RESULTADO[1:]]
+            escritor.write_batch(pa.RecordBatch.from_arrays(colunas, schema=esquema))
+            total += quantidade
+    return total
+
+# JSON Lines: um registro por simulação (mesmo conteúdo de to_dict) ou um por mês
+CAMPOS_JSONL_MES = ('id',) + COLUNAS_RESULTADO
+
+def gerar_jsonl(configurador: ConfiguradorSimulacao, ids_simulacoes: List[str], por_mes: bool = False):
+    """Gera, simulação a simulação, o texto JSON Lines correspondente"""
+    for id_simulacao in ids_simulacoes:
+        simulacao = configurador.simulacoes.get(id_simulacao)
+        if simulacao is None:
+            continue
+        resultados = configurador.consultar_resultados(id_simulacao)
+
+        if por_mes:
+            yield ''.join(json.dumps(dict(zip(CAMPOS_JSONL_MES, (id_simulacao, *valores)))) + '\n'
+                          for valores in map(_valores_resultado, resultados))
+        else:
+            copia = copy.copy(simulacao)
+            copia.resultados = resultados
+            yield json.dumps(copia.to_dict(), ensure_ascii=False) + '\n'
+
+# Exportação para diretório: um CSV (e opcionalmente um gráfico) por simulação,
+# gerados em processos. Cada arquivo é escrito à parte e renomeado ao final,
+# então um arquivo presente no destino está completo e pode ser pulado
+SIMULACOES_POR_TAREFA = 16
+
+def _figura_evolucao_estatica(simulacao: Simulacao) -> Figure:
+    """Gráfico estático de evolução (saldo e juros) renderizado sem interface gráfica"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figura = Figure(figsize=(10, 8))
+    FigureCanvasAgg(figura)
+    ax1, ax2 = figura.subplots(2, 1)
+    figura.suptitle(f'Evolução do Investimento - {simulacao.nome}', fontsize=14, fontweight='bold')
+
+    meses, _, investido, _, juros, saldo = zip(*map(_valores_resultado, simulacao.resultados))
+    ax1.plot(meses, saldo, 'b-', linewidth=2, label='Saldo Final')
+    ax1.plot(meses, investido, 'g--', linewidth=2, label='Total Investido')
+    ax1.fill_between(meses, investido, saldo, alpha=0.3, color='green')
+    ax1.set_title('Evolução do Saldo Final')
+    ax2.plot(meses, juros, 'r-', linewidth=2, label='Juros Acumulados')
+    ax2.fill_between(meses, 0, juros, alpha=0.3, color='red')
+    ax2.set_title('Juros Acumulados')
+    for eixo in (ax1, ax2):
+        eixo.set_xlabel('Mês')
+        eixo.set_ylabel('Valor (R$)')
+        eixo.legend()
+        eixo.grid(True, alpha=0.3)
+
+    figura.subplots_adjust(left=0.1, right=0.97, top=0.9, bottom=0.07, hspace=0.35)
+    return figura
+
+def _salvar_grafico_extrato(simulacao: Simulacao, caminho_arquivo: str) -> None:
+    """Grava o gráfico de evolução; o formato vem da extensão do arquivo"""
+    formato = os.path.splitext(caminho_arquivo)[1].lstrip('.')
+    _figura_evolucao_estatica(simulacao).savefig(caminho_arquivo, format=formato)
+
+def _processar_em_grupos(grupos, funcao: Callable[[list], list], registrar: Callable[[list], None],
+                         workers: Optional[int] = None) -> None:
+    """
+    Executa funcao(grupo) para cada grupo em um conjunto fixo de processos
+
+    Os grupos são consumidos sob demanda e no máximo dois por processo ficam
+    em espera, então a memória não cresce com o total. registrar recebe o
+    retorno de cada grupo, no processo principal, na ordem de conclusão.
+
+    Args:
+        grupos: Iterável de grupos de tarefas (listas picklable)
+        funcao: Função de módulo executada nos processos
+        registrar: Chamada com o resultado de cada grupo
+        workers: Número de processos (None = número de CPUs, 1 = sem paralelismo)
+    """
+    from concurrent.futures import ProcessPoolExecutor, wait, as_completed, FIRST_COMPLETED
+    if workers == 1:
+        for grupo in grupos:
+            registrar(funcao(grupo))
+        return
+
+    processos = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        em_andamento = set()
+        for grupo in grupos:
+            if len(em_andamento) >= 2 * processos:
+                concluidas, em_andamento = wait(em_andamento, return_when=FIRST_COMPLETED)
+                for futuro in concluidas:
+                    registrar(futuro.result())
+            em_andamento.add(executor.submit(funcao, grupo))
+        for futuro in as_completed(em_andamento):
+            registrar(futuro.result())
+
+def _exportar_arquivos(tarefas: List[tuple]) -> List[tuple[str, Optional[str]]]:
+    """
+    Gera os arquivos de um grupo de simulações (executado nos processos)
+
+    Args:
+        tarefas: Lista de (simulação, caminho do CSV, caminho do gráfico ou None)
+
+    Returns:
+        Lista de (id_simulacao, erro ou None)
+    """
+    resultados = []
+    for simulacao, caminho_csv, caminho_grafico in tarefas:
+        temporario = None
+        try:
+            if not os.path.exists(caminho_csv):
+                temporario = _caminho_temporario(caminho_csv)
+                with _abrir_arquivo(temporario, 'w', newline='') as arquivo:
+                    _escrever_csv_simulacao(simulacao, arquivo)
+                os.replace(temporario, caminho_csv)
+            if caminho_grafico and not os.path.exists(caminho_grafico):
+                temporario = _caminho_temporario(caminho_grafico)
+                _salvar_grafico_extrato(simulacao, temporario)
+                os.replace(temporario, caminho_grafico)
+            resultados.append((simulacao.id, None))
+        except Exception as e:
+            if temporario and os.path.exists(temporario):
+                os.remove(temporario)
+            resultados.append((simulacao.id, str(e)))
+    return resultados
+
+class ExportadorSimulacao:
+    """
+    UC04 - Permite exportar simulações para formato CSV
+    """
+
+    def __init__(self, configurador: ConfiguradorSimulacao):
+        self.configurador = configurador
+
+    def exportar_csv(self, id_simulacao: str, caminho_arquivo: str) -> tuple[bool, str]:
+        """
+        UC04 - Exporta simulação para arquivo CSV
+
+        Args:
+            id_simulacao: ID da simulação
+            caminho_arquivo: Caminho onde salvar
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        if id_simulacao not in self.configurador.simulacoes:
+            return False, f"Simulação {id_simulacao} não encontrada"
+
+        try:
+            simulacao = self.configurador.obter_simulacao(id_simulacao)
+
+            with _abrir_arquivo(caminho_arquivo, 'w', newline='') as arquivo:
+                _escrever_csv_simulacao(simulacao, arquivo)
+
+            print(f"[UC04] Simulação {id_simulacao} exportada para CSV: {caminho_arquivo}")
+            return True, f"Simulação exportada com sucesso para {caminho_arquivo}"
+
+        except Exception as e:
+            erro_msg = f"Erro ao exportar CSV: {str(e)}"
+            print(f"[UC04] {erro_msg}")
+            return False, erro_msg
+
+    def exportar_csv_lote(self, caminho_arquivo: str, ids_simulacoes: Optional[List[str]] = None,
+                          linhas_por_lote: int = LINHAS_POR_LOTE_CSV) -> tuple[bool, str]:
+        """
+        UC04 - Exporta várias simulações para um único CSV em formato longo
+
+        Colunas: id, mes, aporte_mes, total_investido, juros_mes,
+        juros_acumulados, saldo_final. Cada simulação vira texto de uma vez
+        (_texto_csv_lote) e o texto é gravado em lotes, então a memória usada
+        não depende do número de simulações. Simulações sem resultados são
+        ignoradas. O ganho sobre a formatação célula a célula é medido em
+        benchmarks.py.
+
+        Args:
+            caminho_arquivo: Caminho onde salvar (extensões .gz/.xz/.zz comprimem)
+            ids_simulacoes: Simulações a exportar (padrão: todas)
+            linhas_por_lote: Linhas acumuladas antes de cada escrita no arquivo
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        import csv
+        if ids_simulacoes is None:
+            ids_simulacoes = list(self.configurador.simulacoes)
+
+        try:
+            total = 0
+            with _abrir_arquivo(caminho_arquivo, 'w', newline='') as arquivo:
+                csv.writer(arquivo).writerow(CABECALHO_CSV_LOTE)
+                lote: List[str] = []
+                linhas_no_lote = 0
+                for id_simulacao in ids_simulacoes:
+                    resultados = self.configurador.consultar_resultados(id_simulacao)
+                    if not resultados:
+                        continue
+                    lote.append(_texto_csv_lote(id_simulacao, resultados))
+                    linhas_no_lote += len(resultados)
+                    if linhas_no_lote >= linhas_por_lote:
+                        arquivo.write(''.join(lote))
+                        total += linhas_no_lote
+                        lote, linhas_no_lote = [], 0
+                arquivo.write(''.join(lote))
+                total += linhas_no_lote
+
+            print(f"[UC04] {total} linhas exportadas para CSV: {caminho_arquivo}")
+            return True, f"{total} linhas exportadas com sucesso para {caminho_arquivo}"
+
+        except Exception as e:
+            erro_msg = f"Erro ao exportar CSV: {str(e)}"
+            print(f"[UC04] {erro_msg}")
+            return False, erro_msg
+
+    def exportar_jsonl(self, destino, ids_simulacoes: Optional[List[str]] = None,
+                       por_mes: bool = False) -> tuple[bool, str]:
+        """
+        UC04 - Exporta simulações em JSON Lines, uma simulação por vez
+
+        Args:
+            destino: Caminho do arquivo (.gz/.xz/.zz comprimem) ou fluxo de
+                texto, como sys.stdout; fluxos recebem flush a cada simulação
+            ids_simulacoes: Simulações a exportar (padrão: todas)
+            por_mes: Uma linha por mês (id + colunas de resultado) em vez de
+                uma linha por simulação
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        if ids_simulacoes is None:
+            ids_simulacoes = list(self.configurador.simulacoes)
+
+        try:
+            total = 0
+            with _abrir_fluxo(destino, 'w') as arquivo:
+                for bloco in gerar_jsonl(self.configurador, ids_simulacoes, por_mes):
+                    arquivo.write(bloco)
+                    if not isinstance(destino, str):
+                        arquivo.flush()
+                    total += 1
+
+            # Com a saída padrão como destino, o log não pode se misturar aos dados
+            saida_log = sys.stderr if destino is sys.stdout else sys.stdout
+            print(f"[UC04] {total} simulações exportadas em JSON Lines", file=saida_log)
+            return True, f"{total} simulações exportadas em JSON Lines"
+
+        except Exception as e:
+            erro_msg = f"Erro ao exportar JSON Lines: {str(e)}"
+            print(f"[UC04] {erro_msg}")
+            return False, erro_msg
+
+    def exportar_diretorio(self, diretorio: str, ids_simulacoes: Optional[List[str]] = None,
+                           formato_grafico: Optional[str] = None, workers: Optional[int] = None,
+                           progresso: Optional[Callable[[int, int], None]] = None) -> tuple[bool, Dict[str, Any]]:
+        """
+        UC04 - Exporta um CSV por simulação (e um gráfico, se pedido) para um diretório
+
+        O trabalho é dividido em grupos de simulações distribuídos entre um
+        conjunto fixo de processos, com poucos grupos em espera por vez. Os
+        arquivos são nomeados pelo ID; os que já existem no diretório são
+        mantidos, o que permite retomar uma exportação interrompida.
+
+        Args:
+            diretorio: Diretório de destino (criado se não existir)
+            ids_simulacoes: Simulações a exportar (padrão: todas as calculadas)
+            formato_grafico: 'png', 'svg' ou 'pdf' para gerar também o gráfico; None = só CSV
+            workers: Número de processos (None = número de CPUs, 1 = sem paralelismo)
+            progresso: Chamada com (simulações concluídas, total) a cada grupo concluído
+
+        Returns:
+            Tupla (sucesso, relatório com 'exportadas', 'puladas', 'falhas' e 'segundos')
+        """
+        inicio = time.perf_counter()
+        if formato_grafico:
+            formato_grafico = formato_grafico.lower().lstrip('.')
+            if formato_grafico not in FORMATOS_GRAFICO:
+                return False, {'erro': f"Formato de gráfico não suportado: {formato_grafico}"}
+            if not MATPLOTLIB_DISPONIVEL:
+                return False, {'erro': "matplotlib não está instalado"}
+        if ids_simulacoes is None:
+            # Resultados pendentes contam como calculados; só são lidos ao montar cada grupo
+            pendentes = self.configurador._carregadores_resultados
+            ids_simulacoes = [id_simulacao for id_simulacao, simulacao in self.configurador.simulacoes.items()
+                              if simulacao.resultados or id_simulacao in pendentes]
+
+        try:
+            os.makedirs(diretorio, exist_ok=True)
+            existentes = set(os.listdir(diretorio))
+        except OSError as e:
+            erro_msg = f"Erro ao preparar diretório: {str(e)}"
+            print(f"[UC04] {erro_msg}")
+            return False, {'erro': erro_msg}
+
+        puladas = []
+        pendentes = []
+        for id_simulacao in ids_simulacoes:
+            nomes = [f"{id_simulacao}.csv"] + ([f"{id_simulacao}.{formato_grafico}"] if formato_grafico else [])
+            if all(nome in existentes for nome in nomes):
+                puladas.append(id_simulacao)
+            elif id_simulacao in self.configurador.simulacoes:
+                pendentes.append(id_simulacao)
+
+        def tarefas():
+            """Monta os grupos sob demanda, com cópias enxutas das simulações"""
+            for posicao in range(0, len(pendentes), SIMULACOES_POR_TAREFA):
+                grupo = []
+                for id_simulacao in pendentes[posicao:posicao + SIMULACOES_POR_TAREFA]:
+                    simulacao = _copiar_para_exportacao(self.configurador.simulacoes[id_simulacao])
+                    simulacao.resultados = self.configurador.consultar_resultados(id_simulacao)
+                    simulacao.historico = []
+                    grafico = (os.path.join(diretorio, f"{id_simulacao}.{formato_grafico}")
+                               if formato_grafico and simulacao.resultados else None)
+                    grupo.append((simulacao, os.path.join(diretorio, f"{id_simulacao}.csv"), grafico))
+                yield grupo
+
+        exportadas = []
+        falhas = {}
+        total = len(pendentes)
+
+        def registrar(resultados: List[tuple[str, Optional[str]]]) -> None:
+            for id_simulacao, erro in resultados:
+                if erro is None:
+                    exportadas.append(id_simulacao)
+                else:
+                    falhas[id_simulacao] = erro
+            if progresso:
+                progresso(len(exportadas) + len(falhas), total)
+
+        _processar_em_grupos(tarefas(), _exportar_arquivos, registrar,
+                             workers=1 if total <= SIMULACOES_POR_TAREFA else workers)
+
+        relatorio = {
+            'exportadas': exportadas,
+            'puladas': puladas,
+            'falhas': falhas,
+            'segundos': time.perf_counter() - inicio
+        }
+        print(f"[UC04] {len(exportadas)} simulações exportadas para {diretorio} "
+              f"({len(puladas)} já existentes, {len(falhas)} falhas)")
+        return True, relatorio
+
+    def exportar_colunar(self, caminho_arquivo: str,
+                         ids_simulacoes: Optional[List[str]] = None) -> tuple[bool, str]:
+        """
+        UC04 - Exporta resultados de várias simulações em formato colunar binário
+
+        O formato vem da extensão: .npz (NumPy) ou .arrow/.feather/.ipc e
+        .parquet (pyarrow). As colunas são as mesmas de exportar_csv_lote, sem
+        conversão para texto; os parâmetros de cada simulação ficam em JSON nos
+        metadados ('parametros'). No .npz a coluna 'simulacao' indexa o vetor
+        'ids'; no Arrow/Parquet a coluna 'id' é um dicionário. Em todos os
+        formatos a gravação é feita em lotes de LINHAS_POR_LOTE_COLUNAR linhas.
+
+        Args:
+            caminho_arquivo: Caminho onde salvar
+            ids_simulacoes: Simulações a exportar (padrão: todas)
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        formato = EXTENSOES_COLUNARES.get(os.path.splitext(caminho_arquivo)[1].lower())
+        if formato is None:
+            return False, "Use uma das extensões: " + ", ".join(EXTENSOES_COLUNARES)
+        if formato == 'npz' and not NUMPY_DISPONIVEL:
+            return False, "NumPy não está instalado"
+        if formato != 'npz' and not PYARROW_DISPONIVEL:
+            return False, "pyarrow não está instalado"
+
+        if ids_simulacoes is None:
+            ids_simulacoes = list(self.configurador.simulacoes)
+
+        try:
+            metadados = json.dumps({id_simulacao: _parametros_exportacao(self.configurador.simulacoes[id_simulacao])
+                                    for id_simulacao in ids_simulacoes}, ensure_ascii=False)
+
+            lotes = _lotes_colunares(self.configurador, ids_simulacoes, LINHAS_POR_LOTE_COLUNAR)
+            if formato == 'npz':
+                total = _gravar_npz(caminho_arquivo, ids_simulacoes, metadados, lotes)
+            else:
+                total = _gravar_arrow(caminho_arquivo, formato, ids_simulacoes, metadados, lotes)
+
+            print(f"[UC04] {total} linhas exportadas em formato {formato}: {caminho_arquivo}")
+            return True, f"{total} linhas exportadas com sucesso para {caminho_arquivo}"
+
+        except Exception as e:
+            erro_msg = f"Erro ao exportar arquivo colunar: {str(e)}"
+            print(f"[UC04] {erro_msg}")
+            return False, erro_msg
+
+# ============================================================================
+# UC03/UC04 - PERSISTÊNCIA E EXPORTAÇÃO ASSÍNCRONAS
+# ============================================================================
+
+def _copiar_para_exportacao(simulacao: Simulacao) -> Simulacao:
+    """Cópia rasa com listas próprias, imune a edições feitas durante a escrita"""
+    copia = copy.copy(simulacao)
+    if simulacao.taxas_variaveis is not None:
+        copia.taxas_variaveis = list(simulacao.taxas_variaveis)
+    copia.resultados = list(simulacao.resultados or [])
+    return copia
+
+class PersistenciaAssincrona:
+    """
+    UC03/UC04 - Versões assíncronas de salvar, carregar e exportar simulações
+
+    O snapshot da simulação e a incorporação do que foi carregado acontecem na
+    thread do event loop, onde o configurador vive; leitura, escrita e
+    (de)serialização JSON vão para um pool de threads de tamanho fixo. Um
+    semáforo limita as operações em andamento: quem dispara muitas de uma vez
+    aguarda a vez antes de tirar o snapshot, então a memória não cresce com a
+    fila. Cancelar uma gravação antes de o arquivo temporário substituir o
+    destino mantém o destino intacto; cancelar um carregamento descarta a
+    simulação lida sem tocar no configurador.
+    """
+
+    def __init__(self, arquivos: GerenciadorSimulacoes, exportador: ExportadorSimulacao,
+                 max_workers: int = 4, max_pendentes: Optional[int] = None):
+        self.arquivos = arquivos
+        self.exportador = exportador
+        self.configurador = arquivos.configurador
+        self.max_workers = max_workers
+        self.max_pendentes = max_pendentes or 2 * max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # asyncio.Semaphore fica preso ao loop em que foi usado pela primeira vez
+        self._semaforos: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]' = \
+            weakref.WeakKeyDictionary()
+
+    def _obter_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='persistencia')
+        return self._executor
+
+    def _obter_semaforo(self) -> asyncio.Semaphore:
+        import asyncio
+        loop = asyncio.get_running_loop()
+        semaforo = self._semaforos.get(loop)
+        if semaforo is None:
+            semaforo = self._semaforos[loop] = asyncio.Semaphore(self.max_pendentes)
+        return semaforo
+
+    async def _executar(self, funcao: Callable, *args, cancelado: Optional[threading.Event] = None):
+        """Roda a função no pool; se a corrotina for cancelada, sinaliza o trabalho em curso"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._obter_executor(), funcao, *args)
+        except asyncio.CancelledError:
+            if cancelado is not None:
+                cancelado.set()
+            raise
+
+    async def salvar_simulacao(self, id_simulacao: str, caminho_arquivo: str,
+                               forcar: bool = False) -> tuple[bool, str]:
+        """
+        UC03 - Salva simulação em arquivo JSON sem bloquear o event loop
+
+        Segue o mesmo protocolo de GerenciadorSimulacoes.salvar_simulacao
+        (trava, conferência e registro da versão do arquivo).
+
+        Args:
+            id_simulacao: ID da simulação
+            caminho_arquivo: Caminho onde salvar (extensões .gz/.xz/.zz comprimem)
+            forcar: Grava mesmo que o arquivo tenha mudado desde a última leitura
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        import asyncio
+        async with self._obter_semaforo():
+            if id_simulacao not in self.configurador.simulacoes:
+                return False, f"Simulação {id_simulacao} não encontrada"
+
+            dados = self.configurador.obter_simulacao(id_simulacao).to_dict()
+            cancelado = threading.Event()
+            escrever = lambda arquivo: json.dump(dados, arquivo, ensure_ascii=False, indent=2)
+
+            try:
+                recusa = await self._executar(_gravar_atomico, caminho_arquivo, escrever, cancelado, None,
+                                              self.arquivos._versoes, forcar, cancelado=cancelado)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                erro_msg = f"Erro ao salvar arquivo: {str(e)}"
+                print(f"[UC03] {erro_msg}")
+                return False, erro_msg
+            if recusa:
+                if not cancelado.is_set():
+                    print(f"[UC03] {recusa}")
+                return False, recusa
+
+        print(f"[UC03] Simulação {id_simulacao} salva em: {caminho_arquivo} - Nick J")
+        return True, f"Simulação salva com sucesso em {caminho_arquivo}"
+
+    async def carregar_simulacao(self, caminho_arquivo: str) -> tuple[bool, str]:
+        """
+        UC03 - Carrega simulação de arquivo JSON sem bloquear o event loop
+
+        Args:
+            caminho_arquivo: Caminho do arquivo
+
+        Returns:
+            Tupla (sucesso, id_simulacao_ou_erro)
+        """
+        async with self._obter_semaforo():
+            _, dados, versao, erro = await self._executar(_ler_simulacao_json, caminho_arquivo)
+
+        # De volta à thread do loop: só aqui a simulação é montada e o configurador alterado
+        if erro is None:
+            try:
+                simulacao = Simulacao.from_dict(dados)
+            except Exception as e:
+                erro = str(e)
+        if erro is not None:
+            erro_msg = f"Erro ao carregar arquivo: {erro}"
+            print(f"[UC03] {erro_msg}")
+            return False, erro_msg
+
+        self.arquivos._versoes[os.path.abspath(caminho_arquivo)] = versao
+        self.configurador.adicionar_simulacao(simulacao)
+        self.arquivos._atualizar_contador_ids(simulacao.id)
+
+        print(f"[UC03] Simulação carregada: {simulacao.id} - {simulacao.nome} - Nick J")
+        return True, simulacao.id
+
+    async def exportar_csv(self, id_simulacao: str, caminho_arquivo: str) -> tuple[bool, str]:
+        """
+        UC04 - Exporta simulação para CSV sem bloquear o event loop
+
+        Args:
+            id_simulacao: ID da simulação
+            caminho_arquivo: Caminho onde salvar
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        import asyncio
+        async with self._obter_semaforo():
+            if id_simulacao not in self.configurador.simulacoes:
+                return False, f"Simulação {id_simulacao} não encontrada"
+
+            simulacao = _copiar_para_exportacao(self.configurador.obter_simulacao(id_simulacao))
+            cancelado = threading.Event()
+            escrever = lambda arquivo: _escrever_csv_simulacao(simulacao, arquivo)
+
+            try:
+                if await self._executar(_gravar_atomico, caminho_arquivo, escrever, cancelado, '',
+                                        cancelado=cancelado):
+                    return False, "Exportação cancelada"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                erro_msg = f"Erro ao exportar CSV: {str(e)}"
+                print(f"[UC04] {erro_msg}")
+                return False, erro_msg
+
+        print(f"[UC04] Simulação {id_simulacao} exportada para CSV: {caminho_arquivo}")
+        return True, f"Simulação exportada com sucesso para {caminho_arquivo}"
+
+    async def salvar_varias(self, destinos: Dict[str, str]) -> Dict[str, tuple[bool, str]]:
+        """
+        UC03 - Salva várias simulações concorrentemente
+
+        Args:
+            destinos: Mapa id_simulacao -> caminho do arquivo
+
+        Returns:
+            Mapa id_simulacao -> (sucesso, mensagem)
+        """
+        import asyncio
+        resultados = await asyncio.gather(*(self.salvar_simulacao(id_simulacao, caminho)
+                                             for id_simulacao, caminho in destinos.items()))
+        return dict(zip(destinos, resultados))
+
+    async def carregar_varias(self, caminhos: List[str]) -> Dict[str, tuple[bool, str]]:
+        """
+        UC03 - Carrega vários arquivos concorrentemente
+
+        Args:
+            caminhos: Arquivos JSON (comprimidos ou não)
+
+        Returns:
+            Mapa caminho -> (sucesso, id_simulacao_ou_erro)
+        """
+        import asyncio
+        resultados = await asyncio.gather(*(self.carregar_simulacao(caminho) for caminho in caminhos))
+        return dict(zip(caminhos, resultados))
+
+    def fechar(self) -> None:
+        """Encerra o pool de threads, aguardando as gravações em andamento"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+# ============================================================================
+# UC05 - VISUALIZAR GRÁFICOS
+# ============================================================================
+
+PIXELS_POR_AMOSTRA = 3  # Espaço mínimo entre pontos desenhados; os marcadores têm ~5 px
+
+def _lttb(x, y, limite: int) -> List[int]:
+    """
+    Escolhe os pontos a desenhar com Largest-Triangle-Three-Buckets
+
+    Mantém o primeiro e o último ponto e divide os demais em limite - 2
+    baldes. De cada balde fica o ponto que forma o maior triângulo com o
+    ponto escolhido no balde anterior e a média do balde seguinte, o que
+    preserva picos, vales e a forma geral da curva.
+
+    Args:
+        x: Coordenadas x, em ordem crescente
+        y: Coordenadas y
+        limite: Número máximo de pontos
+
+    Returns:
+        Índices dos pontos escolhidos, em ordem crescente
+    """
+    n = len(x)
+    if limite >= n or limite < 3:
+        return list(range(n))
+
+    tamanho = (n - 2) / (limite - 2)
+    indices = [0]
+    anterior = 0
+    for balde in range(limite - 2):
+        inicio = int(balde * tamanho) + 1
+        fim = int((balde + 1) * tamanho) + 1
+        fim_seguinte = min(int((balde + 2) * tamanho) + 1, n)
+        media_x = sum(x[fim:fim_seguinte]) / (fim_seguinte - fim)
+        media_y = sum(y[fim:fim_seguinte]) / (fim_seguinte - fim)
+
+        ax, ay = x[anterior], y[anterior]
+        escolhido, maior_area = inicio, -1.0
+        for i in range(inicio, fim):
+            area = abs((ax - media_x) * (y[i] - ay) - (ax - x[i]) * (media_y - ay))
+            if area > maior_area:
+                escolhido, maior_area = i, area
+        indices.append(escolhido)
+        anterior = escolhido
+    indices.append(n - 1)
+    return indices
+
+def _selecionar(valores, indices: List[int]) -> List[Any]:
+    return [valores[i] for i in indices]
+
+INTERVALO_HOVER_MS = 16  # Eventos de movimento mais próximos que isso são agrupados
+RAIO_HOVER_PX = 6  # Distância máxima entre o cursor e o ponto para exibir o tooltip
+
+class _DicaFlutuante:
+    """
+    Tooltip de hover redesenhado por blitting
+
+    localizar(event) devolve (anotação, xy, texto) do elemento sob o cursor,
+    ou None. Em canvas com suporte a blit as anotações ficam animadas: o
+    desenho completo da figura as omite, o fundo é guardado a cada
+    draw_event e o hover só restaura o fundo e redesenha a anotação.
+    Eventos de movimento são limitados a um a cada INTERVALO_HOVER_MS; o
+    último evento adiado é processado por um timer, para o tooltip não
+    ficar atrasado em relação ao cursor.
+    """
+
+    def __init__(self, figura: Figure, anotacoes, localizar: Callable[[Any], Optional[tuple]]):
+        self.figura = figura
+        self.anotacoes = anotacoes
+        self.localizar = localizar
+        self._fundo = None
+        self._ultimo = 0.0
+        self._pendente = None
+        self._timer = None
+        self._timer_canvas = None
+        # Funções (e não métodos) para o registro de callbacks guardar referência forte
+        figura.canvas.mpl_connect('draw_event', lambda event: self._ao_desenhar(event))
+        figura.canvas.mpl_connect('motion_notify_event', lambda event: self._ao_mover(event))
+
+    def invalidar(self) -> None:
+        """Descarta o fundo guardado; o próximo desenho completo o recaptura"""
+        self._fundo = None
+
+    def _ao_desenhar(self, event) -> None:
+        canvas = self.figura.canvas
+        if canvas.is_saving():
+            return
+        blit = getattr(canvas, 'supports_blit', False)
+        for annot in self.anotacoes:
+            annot.set_animated(blit)
+        if not blit:
+            self._fundo = None
+            return
+        self._fundo = canvas.copy_from_bbox(self.figura.bbox)
+        self._desenhar_anotacoes()
+
+    def _desenhar_anotacoes(self) -> None:
+        for annot in self.anotacoes:
+            if annot.get_visible():
+                annot.axes.draw_artist(annot)
+
+    def _ao_mover(self, event) -> None:
+        agora = time.perf_counter()
+        if (agora - self._ultimo) * 1000 >= INTERVALO_HOVER_MS:
+            self._ultimo = agora
+            self._pendente = None
+            self._atualizar(event)
+            return
+
+        self._pendente = event
+        canvas = self.figura.canvas
+        if self._timer is None or self._timer_canvas is not canvas:
+            self._timer = canvas.new_timer(interval=INTERVALO_HOVER_MS)
+            self._timer.single_shot = True
+            self._timer.add_callback(self._processar_pendente)
+            self._timer_canvas = canvas
+        self._timer.start()
+
+    def _processar_pendente(self) -> None:
+        event, self._pendente = self._pendente, None
+        if event is not None:
+            self._ultimo = time.perf_counter()
+            self._atualizar(event)
+
+    def _atualizar(self, event) -> None:
+        alvo = self.localizar(event) if event.inaxes else None
+        mudou = False
+        if alvo:
+            annot, xy, texto = alvo
+            if not annot.get_visible() or annot.xy != xy or annot.get_text() != texto:
+                annot.xy = xy
+                annot.set_text(texto)
+                annot.set_visible(True)
+                mudou = True
+        for annot in self.anotacoes:
+            if annot.get_visible() and (not alvo or annot is not alvo[0]):
+                annot.set_visible(False)
+                mudou = True
+        if mudou:
+            self._redesenhar()
+
+    def _redesenhar(self) -> None:
+        canvas = self.figura.canvas
+        if self._fundo is None:
+            canvas.draw_idle()
+            return
+        canvas.restore_region(self._fundo)
+        self._desenhar_anotacoes()
+        canvas.blit(self.figura.bbox)
+
+def _desenhar_pizza(ax, simulacao: Simulacao) -> list:
+    """Desenha a composição do saldo final (investido x juros) e devolve as fatias"""
+    ultimo = simulacao.resultados[-1]
+
+    valores = [ultimo.total_investido, ultimo.juros_acumulados]
+    labels = ['Total Investido', 'Juros Acumulados']
+    colors = ['#4CAF50', '#FF9800']
+    explode = (0.05, 0.05)
+
+    wedges, texts, autotexts = ax.pie(valores, labels=labels, colors=colors, autopct='%1.1f%%',
+           startangle=90, explode=explode, shadow=True)
+    ax.axis('equal')
+
+    # Adiciona legenda com valores
+    legenda_texto = [
+        f'Total Investido: R$ {ultimo.total_investido:,.2f}',
+        f'Juros Acumulados: R$ {ultimo.juros_acumulados:,.2f}',
+        f'Saldo Final: R$ {ultimo.saldo_final:,.2f}'
+    ]
+    ax.text(0, -1.3, '\n'.join(legenda_texto), ha='center', fontsize=10)
+    return wedges
+
+def _desenhar_barras_comparacao(ax1, ax2, sims_calculadas: List[Dict[str, Any]]) -> tuple:
+    """Desenha saldo final e rentabilidade lado a lado e devolve as barras de cada painel"""
+    import matplotlib
+    nomes = [s['nome'] for s in sims_calculadas]
+    saldos = [s['saldo_final'] for s in sims_calculadas]
+    rentabilidades = [s['rentabilidade'] for s in sims_calculadas]
+
+    # Gráfico 1: Saldo Final
+    cores = matplotlib.colormaps['viridis']([i/len(sims_calculadas) for i in range(len(sims_calculadas))])
+    bars1 = ax1.bar(nomes, saldos, color=cores)
+    ax1.set_title('Saldo Final')
+    ax1.set_ylabel('Valor (R$)')
+    ax1.tick_params(axis='x', rotation=45)
+    ax1.grid(True, alpha=0.3, axis='y')
+
+    # Gráfico 2: Rentabilidade
+    bars2 = ax2.bar(nomes, rentabilidades, color=cores)
+    ax2.set_title('Rentabilidade (%)')
+    ax2.set_ylabel('Percentual (%)')
+    ax2.tick_params(axis='x', rotation=45)
+    ax2.grid(True, alpha=0.3, axis='y')
+    return bars1, bars2
+
+def _poligono_area(meses, inferior, superior) -> List[tuple]:
+    """Contorno fechado da área entre duas séries, no formato de set_verts"""
+    return list(zip(meses, superior)) + list(zip(reversed(meses), reversed(inferior)))
+
+class GeradorGraficos:
+    """
+    UC05 - Permite visualizar gráficos das simulações
+
+    Mantém uma figura por simulação e tipo de gráfico. Quando os resultados
+    ou o nome mudam, a figura existente é atualizada no lugar em vez de
+    recriada. As figuras não passam pelo pyplot: liberar_figuras (ou a
+    exclusão da simulação) as descarta, e além de max_figuras as menos
+    usadas saem do cache.
+    """
+
+    def __init__(self, configurador: ConfiguradorSimulacao, max_figuras: int = 16):
+        self.configurador = configurador
+        self.max_figuras = max_figuras
+        self._figuras: 'OrderedDict[tuple[str, str], Dict[str, Any]]' = OrderedDict()
+        configurador.adicionar_observador(self._ao_alterar_simulacao)
+
+    def _ao_alterar_simulacao(self, evento: str, simulacao: Simulacao,
+                              modificacao: Optional[HistoricoModificacao]) -> None:
+        if evento == 'excluir':
+            self.liberar_figuras(simulacao.id)
+
+    def _obter_figura(self, id_simulacao: str, vista: str,
+                      construir: Callable[[Simulacao], Dict[str, Any]],
+                      atualizar: Callable[[Dict[str, Any], Simulacao], None]) -> Optional[Figure]:
+        """Devolve a figura em cache, atualizada se a simulação mudou, ou constrói uma nova"""
         if not MATPLOTLIB_DISPONIVEL:
             return None
 
@@ -703,18 +4033,60 @@ class GeradorGraficos:
         if not simulacao or not simulacao.resultados:
             return None
 
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
-        fig.suptitle(f'Evolução do Investimento - {simulacao.nome}', fontsize=14, fontweight='bold')
+        chave = (id_simulacao, vista)
+        estado = self._figuras.get(chave)
+        if estado is None:
+            estado = construir(simulacao)
+            self._figuras[chave] = estado
+            # Figuras que saem do cache não são limpas: podem estar em uma janela aberta
+            while len(self._figuras) > self.max_figuras:
+                self._figuras.popitem(last=False)
+        elif estado['resultados'] is not simulacao.resultados or estado['nome'] != simulacao.nome:
+            atualizar(estado, simulacao)
+        self._figuras.move_to_end(chave)
+
+        estado['simulacao'] = simulacao
+        estado['resultados'] = simulacao.resultados
+        estado['nome'] = simulacao.nome
+        return estado['figura']
+
+    def liberar_figuras(self, id_simulacao: Optional[str] = None) -> int:
+        """
+        Descarta as figuras de uma simulação (ou todas)
+
+        Returns:
+            Número de figuras liberadas
+        """
+        chaves = [chave for chave in self._figuras if id_simulacao is None or chave[0] == id_simulacao]
+        for chave in chaves:
+            self._figuras.pop(chave)['figura'].clear()
+        return len(chaves)
+
+    def criar_figura_evolucao(self, id_simulacao: str) -> Optional[Figure]:
+        """
+        Obtém figura com gráfico de evolução do saldo
+
+        Args:
+            id_simulacao: ID da simulação
+
+        Returns:
+            Figure do matplotlib ou None se erro
+        """
+        return self._obter_figura(id_simulacao, 'evolucao', self._construir_evolucao,
+                                  self._atualizar_evolucao)
 
-        meses = [r.mes for r in simulacao.resultados]
-        saldo = [r.saldo_final for r in simulacao.resultados]
-        investido = [r.total_investido for r in simulacao.resultados]
-        juros = [r.juros_acumulados for r in simulacao.resultados]
+    def _construir_evolucao(self, simulacao: Simulacao) -> Dict[str, Any]:
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(10, 8))
+        ax1, ax2 = fig.subplots(2, 1)
+        estado: Dict[str, Any] = {'figura': fig, 'eixos': (ax1, ax2), 'simulacao': simulacao}
+        meses, _, investido, _, juros, saldo = zip(*map(_valores_resultado, simulacao.resultados))
+        estado['titulo'] = fig.suptitle('', fontsize=14, fontweight='bold')
 
         # Gráfico 1: Evolução do Saldo
-        line1, = ax1.plot(meses, saldo, 'b-', linewidth=2, label='Saldo Final', marker='o', markersize=4)
-        line2, = ax1.plot(meses, investido, 'g--', linewidth=2, label='Total Investido', marker='s', markersize=4)
-        ax1.fill_between(meses, investido, saldo, alpha=0.3, color='green')
+        line1, = ax1.plot([], [], 'b-', linewidth=2, label='Saldo Final', marker='o', markersize=4)
+        line2, = ax1.plot([], [], 'g--', linewidth=2, label='Total Investido', marker='s', markersize=4)
+        estado['area_saldo'] = ax1.fill_between(meses, investido, saldo, alpha=0.3, color='green')
         ax1.set_xlabel('Mês')
         ax1.set_ylabel('Valor (R$)')
         ax1.set_title('Evolução do Saldo Final')
@@ -722,13 +4094,14 @@ class GeradorGraficos:
         ax1.grid(True, alpha=0.3)
 
         # Gráfico 2: Juros Acumulados
-        line3, = ax2.plot(meses, juros, 'r-', linewidth=2, label='Juros Acumulados', marker='o', markersize=4)
-        ax2.fill_between(meses, 0, juros, alpha=0.3, color='red')
+        line3, = ax2.plot([], [], 'r-', linewidth=2, label='Juros Acumulados', marker='o', markersize=4)
+        estado['area_juros'] = ax2.fill_between(meses, 0, juros, alpha=0.3, color='red')
         ax2.set_xlabel('Mês')
         ax2.set_ylabel('Valor (R$)')
         ax2.set_title('Juros Acumulados')
         ax2.legend()
         ax2.grid(True, alpha=0.3)
+        estado['linhas'] = (line1, line2, line3)
 
         # Adicionar interatividade com hover
         annot1 = ax1.annotate("", xy=(0,0), xytext=(10,10), textcoords="offset points",
@@ -740,66 +4113,114 @@ class GeradorGraficos:
                              bbox=dict(boxstyle="round", fc="yellow", alpha=0.9),
                              arrowprops=dict(arrowstyle="->"))
         annot2.set_visible(False)
-
-        def update_annot(line, annot, ind, ax_num):
-            """Atualiza a anotação com os dados do ponto"""
-            x, y = line.get_data()
-            idx = ind["ind"][0]
-            annot.xy = (x[idx], y[idx])
-            
-            mes = int(x[idx])
-            resultado = simulacao.resultados[idx]
-            
-            if ax_num == 1:
-                if line == line1:
-                    texto = f"Mês: {mes}\nSaldo Final: R$ {resultado.saldo_final:,.2f}\nTotal Investido: R$ {resultado.total_investido:,.2f}\nJuros: R$ {resultado.juros_acumulados:,.2f}"
-                else:
-                    texto = f"Mês: {mes}\nTotal Investido: R$ {resultado.total_investido:,.2f}"
+        estado['anotacoes'] = (annot1, annot2)
+
+        def texto_dica(line, idx):
+            """Texto do tooltip para o mês idx da série completa"""
+            resultado = estado['simulacao'].resultados[idx]
+            mes = resultado.mes
+            if line is line1:
+                return f"Mês: {mes}\nSaldo Final: R$ {resultado.saldo_final:,.2f}\nTotal Investido: R$ {resultado.total_investido:,.2f}\nJuros: R$ {resultado.juros_acumulados:,.2f}"
+            if line is line2:
+                return f"Mês: {mes}\nTotal Investido: R$ {resultado.total_investido:,.2f}"
+            return f"Mês: {mes}\nJuros Acumulados: R$ {resultado.juros_acumulados:,.2f}\nJuros do Mês: R$ {resultado.juros_mes:,.2f}"
+
+        def localizar(event):
+            """Ponto mais próximo do cursor, buscado por bisect nos meses ordenados"""
+            meses, investido, juros, saldo = estado['series']
+            if event.inaxes is ax1:
+                candidatos = ((line1, saldo, annot1), (line2, investido, annot1))
+            elif event.inaxes is ax2:
+                candidatos = ((line3, juros, annot2),)
             else:
-                texto = f"Mês: {mes}\nJuros Acumulados: R$ {resultado.juros_acumulados:,.2f}\nJuros do Mês: R$ {resultado.juros_mes:,.2f}"
-            
-            annot.set_text(texto)
-            annot.get_bbox_patch().set_alpha(0.9)
-
-        def hover(event):
-            """Detecta hover sobre os pontos"""
-            if event.inaxes == ax1:
-                vis1 = annot1.get_visible()
-                cont1, ind1 = line1.contains(event)
-                cont2, ind2 = line2.contains(event)
-                
-                if cont1:
-                    update_annot(line1, annot1, ind1, 1)
-                    annot1.set_visible(True)
-                    fig.canvas.draw_idle()
-                elif cont2:
-                    update_annot(line2, annot1, ind2, 1)
-                    annot1.set_visible(True)
-                    fig.canvas.draw_idle()
-                elif vis1:
-                    annot1.set_visible(False)
-                    fig.canvas.draw_idle()
-                    
-            elif event.inaxes == ax2:
-                vis2 = annot2.get_visible()
-                cont3, ind3 = line3.contains(event)
-                
-                if cont3:
-                    update_annot(line3, annot2, ind3, 2)
-                    annot2.set_visible(True)
-                    fig.canvas.draw_idle()
-                elif vis2:
-                    annot2.set_visible(False)
-                    fig.canvas.draw_idle()
-
-        fig.canvas.mpl_connect("motion_notify_event", hover)
+                return None
+
+            # Só os meses a até RAIO_HOVER_PX do cursor na horizontal são testados
+            ax = event.inaxes
+            inversa = ax.transData.inverted()
+            x_min = inversa.transform((event.x - RAIO_HOVER_PX, event.y))[0]
+            x_max = inversa.transform((event.x + RAIO_HOVER_PX, event.y))[0]
+            inicio = bisect.bisect_left(meses, x_min)
+            fim = bisect.bisect_right(meses, x_max)
+
+            melhor, menor_distancia = None, RAIO_HOVER_PX
+            for line, valores, annot in candidatos:
+                for idx in range(inicio, fim):
+                    px, py = ax.transData.transform((meses[idx], valores[idx]))
+                    distancia = math.hypot(px - event.x, py - event.y)
+                    if distancia <= menor_distancia:
+                        melhor, menor_distancia = (line, valores, annot, idx), distancia
+            if melhor is None:
+                return None
+            line, valores, annot, idx = melhor
+            return annot, (meses[idx], valores[idx]), texto_dica(line, idx)
+
+        def resize(event):
+            """Refaz a redução das séries quando a largura dos eixos muda"""
+            if self._limite_pontos(ax1) != estado['limite']:
+                self._amostrar_evolucao(estado)
+
+        estado['dica'] = _DicaFlutuante(fig, (annot1, annot2), localizar)
+        fig.canvas.mpl_connect("resize_event", resize)
+
+        self._atualizar_evolucao(estado, simulacao)
+        fig.tight_layout()
+        return estado
+
+    def _atualizar_evolucao(self, estado: Dict[str, Any], simulacao: Simulacao) -> None:
+        """Troca os dados das linhas e das áreas e reajusta os eixos"""
+        meses, _, investido, _, juros, saldo = zip(*map(_valores_resultado, simulacao.resultados))
+        estado['series'] = (meses, investido, juros, saldo)
+        for annot in estado['anotacoes']:
+            annot.set_visible(False)
+        estado['titulo'].set_text(f'Evolução do Investimento - {simulacao.nome}')
+        self._amostrar_evolucao(estado)
+
+    @staticmethod
+    def _limite_pontos(ax) -> int:
+        """Quantos pontos cabem na largura atual dos eixos"""
+        return max(int(ax.get_window_extent().width / PIXELS_POR_AMOSTRA), 3)
+
+    def _amostrar_evolucao(self, estado: Dict[str, Any]) -> None:
+        """
+        Desenha as séries reduzidas por LTTB à largura dos eixos
 
-        plt.tight_layout()
-        return fig
+        Cada linha é reduzida separadamente; a área entre saldo e investido
+        usa a união dos pontos das duas, para acompanhar as duas bordas.
+        As séries completas continuam em estado['series'] para os tooltips.
+        """
+        meses, investido, juros, saldo = estado['series']
+        ax1, ax2 = estado['eixos']
+        limite = self._limite_pontos(ax1)
+        estado['limite'] = limite
+
+        indices_saldo = _lttb(meses, saldo, limite)
+        indices_investido = _lttb(meses, investido, limite)
+        indices_juros = _lttb(meses, juros, limite)
+        indices_area = sorted(set(indices_saldo).union(indices_investido))
+
+        line1, line2, line3 = estado['linhas']
+        line1.set_data(_selecionar(meses, indices_saldo), _selecionar(saldo, indices_saldo))
+        line2.set_data(_selecionar(meses, indices_investido), _selecionar(investido, indices_investido))
+        line3.set_data(_selecionar(meses, indices_juros), _selecionar(juros, indices_juros))
+        meses_area = _selecionar(meses, indices_area)
+        estado['area_saldo'].set_verts([_poligono_area(meses_area, _selecionar(investido, indices_area),
+                                                       _selecionar(saldo, indices_area))])
+        meses_juros = _selecionar(meses, indices_juros)
+        estado['area_juros'].set_verts([_poligono_area(meses_juros, [0.0] * len(meses_juros),
+                                                       _selecionar(juros, indices_juros))])
+
+        for ax in (ax1, ax2):
+            ax.relim()
+        ax2.update_datalim([(meses[0], 0.0)])  # a área de juros parte do zero
+        for ax in (ax1, ax2):
+            ax.autoscale_view()
+        estado['dica'].invalidar()
+        estado['figura'].canvas.draw_idle()
 
     def criar_figura_composicao(self, id_simulacao: str) -> Optional[Figure]:
         """
-        Cria figura com gráfico de composição (pizza)
+        Obtém figura com gráfico de composição (pizza)
 
         Args:
             id_simulacao: ID da simulação
@@ -807,71 +4228,51 @@ class GeradorGraficos:
         Returns:
             Figure do matplotlib ou None se erro
         """
-        if not MATPLOTLIB_DISPONIVEL:
-            return None
-
-        simulacao = self.configurador.obter_simulacao(id_simulacao)
-        if not simulacao or not simulacao.resultados:
-            return None
-
-        ultimo = simulacao.resultados[-1]
-
-        fig, ax = plt.subplots(figsize=(8, 8))
-        fig.suptitle(f'Composição do Saldo Final - {simulacao.nome}', fontsize=14, fontweight='bold')
-
-        valores = [ultimo.total_investido, ultimo.juros_acumulados]
+        return self._obter_figura(id_simulacao, 'composicao', self._construir_composicao,
+                                  self._desenhar_composicao)
+
+    def _construir_composicao(self, simulacao: Simulacao) -> Dict[str, Any]:
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(8, 8))
+        ax = fig.add_subplot()
+        estado: Dict[str, Any] = {'figura': fig, 'eixo': ax, 'simulacao': simulacao}
+        estado['titulo'] = fig.suptitle('', fontsize=14, fontweight='bold')
         labels = ['Total Investido', 'Juros Acumulados']
-        colors = ['#4CAF50', '#FF9800']
-        explode = (0.05, 0.05)
-
-        wedges, texts, autotexts = ax.pie(valores, labels=labels, colors=colors, autopct='%1.1f%%',
-               startangle=90, explode=explode, shadow=True)
-        ax.axis('equal')
-
-        # Adiciona legenda com valores
-        legenda_texto = [
-            f'Total Investido: R$ {ultimo.total_investido:,.2f}',
-            f'Juros Acumulados: R$ {ultimo.juros_acumulados:,.2f}',
-            f'Saldo Final: R$ {ultimo.saldo_final:,.2f}'
-        ]
-        legenda_label = ax.text(0, -1.3, '\n'.join(legenda_texto), ha='center', fontsize=10)
-
-        # Adicionar interatividade com hover
-        annot = ax.annotate("", xy=(0,0), xytext=(20,20), textcoords="offset points",
-                           bbox=dict(boxstyle="round", fc="yellow", alpha=0.9),
-                           arrowprops=dict(arrowstyle="->", connectionstyle="arc3,rad=0"))
-        annot.set_visible(False)
 
         def hover_pie(event):
             """Detecta hover sobre as fatias do gráfico de pizza"""
             if event.inaxes == ax:
-                for i, wedge in enumerate(wedges):
+                simulacao = estado['simulacao']
+                ultimo = simulacao.resultados[-1]
+                valores = [ultimo.total_investido, ultimo.juros_acumulados]
+                annot = estado['anotacao']
+                for i, wedge in enumerate(estado['fatias']):
                     cont, _ = wedge.contains(event)
                     if cont:
                         # Calcula percentual
                         percentual = (valores[i] / ultimo.saldo_final) * 100
-                        
+
                         # Monta texto com informações detalhadas
                         if i == 0:  # Total Investido
                             texto = f"{labels[i]}\nR$ {valores[i]:,.2f}\n{percentual:.1f}% do total\n\nAporte Inicial: R$ {simulacao.aporte_inicial:,.2f}\nAportes Mensais: R$ {(valores[i] - simulacao.aporte_inicial):,.2f}"
                         else:  # Juros Acumulados
                             rentabilidade = ((ultimo.saldo_final / ultimo.total_investido - 1) * 100)
                             texto = f"{labels[i]}\nR$ {valores[i]:,.2f}\n{percentual:.1f}% do total\n\nRentabilidade: {rentabilidade:.2f}%\nMeses: {len(simulacao.resultados)}"
-                        
+
                         annot.xy = (event.xdata, event.ydata)
                         annot.set_text(texto)
                         annot.set_visible(True)
-                        
+
                         # Destaca a fatia
                         wedge.set_edgecolor('white')
                         wedge.set_linewidth(3)
-                        
+
                         fig.canvas.draw_idle()
                         return
                     else:
                         wedge.set_linewidth(1)
                         wedge.set_edgecolor('white')
-                
+
                 # Se não está sobre nenhuma fatia
                 if annot.get_visible():
                     annot.set_visible(False)
@@ -879,7 +4280,301 @@ class GeradorGraficos:
 
         fig.canvas.mpl_connect("motion_notify_event", hover_pie)
 
-        return fig
+        self._desenhar_composicao(estado, simulacao)
+        return estado
+
+    def _desenhar_composicao(self, estado: Dict[str, Any], simulacao: Simulacao) -> None:
+        """Redesenha a pizza nos mesmos eixos (as fatias mudam de ângulo e rótulo)"""
+        ax = estado['eixo']
+        ax.clear()
+        wedges = _desenhar_pizza(ax, simulacao)
+
+        # Anotação usada pelo hover
+        annot = ax.annotate("", xy=(0,0), xytext=(20,20), textcoords="offset points",
+                           bbox=dict(boxstyle="round", fc="yellow", alpha=0.9),
+                           arrowprops=dict(arrowstyle="->", connectionstyle="arc3,rad=0"))
+        annot.set_visible(False)
+
+        estado['fatias'] = wedges
+        estado['anotacao'] = annot
+        estado['titulo'].set_text(f'Composição do Saldo Final - {simulacao.nome}')
+        estado['figura'].canvas.draw_idle()
+
+# ============================================================================
+# UC05 - RENDERIZAÇÃO DE GRÁFICOS SEM INTERFACE (LOTE)
+# ============================================================================
+
+# Tudo aqui usa Figure + FigureCanvasAgg diretamente: não depende de pyplot,
+# de backend de interface nem de estado global, e roda em servidores sem tela
+FORMATOS_GRAFICO = ('png', 'svg', 'pdf')
+VISTAS_GRAFICO = ('evolucao', 'composicao')
+
+def _figura_composicao_estatica(simulacao: Simulacao) -> Figure:
+    """Gráfico estático de composição do saldo final"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figura = Figure(figsize=(8, 8))
+    FigureCanvasAgg(figura)
+    _desenhar_pizza(figura.add_subplot(), simulacao)
+    figura.suptitle(f'Composição do Saldo Final - {simulacao.nome}', fontsize=14, fontweight='bold')
+    return figura
+
+def _figura_comparacao_estatica(sims_calculadas: List[Dict[str, Any]]) -> Figure:
+    """Gráfico estático de comparação (dados no formato de ComparadorSimulacoes.comparar)"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figura = Figure(figsize=(14, 6))
+    FigureCanvasAgg(figura)
+    ax1, ax2 = figura.subplots(1, 2)
+    figura.suptitle('Comparação de Simulações', fontsize=14, fontweight='bold')
+    _desenhar_barras_comparacao(ax1, ax2, sims_calculadas)
+    figura.tight_layout()
+    return figura
+
+_FIGURAS_ESTATICAS = {
+    'evolucao': _figura_evolucao_estatica,
+    'composicao': _figura_composicao_estatica,
+}
+
+def _renderizar_graficos(tarefas: List[tuple]) -> List[tuple[str, Optional[str]]]:
+    """
+    Renderiza os gráficos de um grupo de simulações (executado nos processos)
+
+    Args:
+        tarefas: Lista de (simulação, vista, caminho do arquivo)
+
+    Returns:
+        Lista de (nome do arquivo, erro ou None)
+    """
+    resultados = []
+    for simulacao, vista, caminho_arquivo in tarefas:
+        temporario = None
+        try:
+            temporario = _caminho_temporario(caminho_arquivo)
+            formato = os.path.splitext(caminho_arquivo)[1].lstrip('.')
+            _FIGURAS_ESTATICAS[vista](simulacao).savefig(temporario, format=formato)
+            os.replace(temporario, caminho_arquivo)
+            resultados.append((os.path.basename(caminho_arquivo), None))
+        except Exception as e:
+            if temporario and os.path.exists(temporario):
+                os.remove(temporario)
+            resultados.append((os.path.basename(caminho_arquivo), str(e)))
+    return resultados
+
+class RenderizadorGraficos:
+    """
+    UC05 - Gera os gráficos das simulações em arquivo, sem interface gráfica
+
+    Os gráficos de evolução e composição têm o mesmo desenho dos exibidos
+    na interface, sem a interatividade. Em lote, cada simulação é
+    renderizada em um processo; no relatório PDF as páginas são gravadas
+    uma a uma, sem manter as figuras anteriores em memória.
+    """
+
+    def __init__(self, configurador: ConfiguradorSimulacao, comparador: 'ComparadorSimulacoes'):
+        self.configurador = configurador
+        self.comparador = comparador
+
+    def _copia_calculada(self, id_simulacao: str) -> Optional[Simulacao]:
+        """Cópia enxuta da simulação com os resultados, para enviar aos processos"""
+        if id_simulacao not in self.configurador.simulacoes:
+            return None
+        resultados = self.configurador.consultar_resultados(id_simulacao)
+        if not resultados:
+            return None
+        simulacao = _copiar_para_exportacao(self.configurador.simulacoes[id_simulacao])
+        simulacao.resultados = resultados
+        simulacao.historico = []
+        return simulacao
+
+    def _ids_calculados(self, ids_simulacoes: Optional[List[str]]) -> List[str]:
+        if ids_simulacoes is None:
+            ids_simulacoes = list(self.configurador.simulacoes)
+        # Resultados pendentes contam como calculados; só são lidos ao renderizar
+        simulacoes = self.configurador.simulacoes
+        pendentes = self.configurador._carregadores_resultados
+        return [id_simulacao for id_simulacao in ids_simulacoes
+                if id_simulacao in pendentes
+                or (id_simulacao in simulacoes and simulacoes[id_simulacao].resultados)]
+
+    def _sims_comparacao(self, ids_simulacoes: List[str]) -> List[Dict[str, Any]]:
+        if len(ids_simulacoes) < 2:
+            return []
+        comparacao = self.comparador.comparar(ids_simulacoes)
+        if not comparacao:
+            return []
+        return [s for s in comparacao['simulacoes'] if s['calculada']]
+
+    def renderizar_diretorio(self, diretorio: str, ids_simulacoes: Optional[List[str]] = None,
+                             vistas: tuple = VISTAS_GRAFICO, formato: str = 'png',
+                             comparacao: bool = False, workers: Optional[int] = None,
+                             progresso: Optional[Callable[[int, int], None]] = None,
+                             retomar: bool = False) -> tuple[bool, Dict[str, Any]]:
+        """
+        UC05 - Renderiza os gráficos de várias simulações para um diretório
+
+        Cada gráfico vira '<id>_<vista>.<formato>'; com comparacao=True é
+        gerado também 'comparacao.<formato>' com todas as simulações. Por
+        padrão todos os arquivos são regravados. Com retomar=True, para
+        continuar uma renderização interrompida, o gráfico de uma simulação é
+        mantido se o arquivo for mais novo que a última modificação dela; o
+        comparativo, que depende do conjunto de simulações, é sempre regravado.
+
+        Args:
+            diretorio: Diretório de destino (criado se não existir)
+            ids_simulacoes: Simulações a renderizar (padrão: todas as calculadas)
+            vistas: Gráficos por simulação ('evolucao' e/ou 'composicao')
+            formato: 'png', 'svg' ou 'pdf'
+            comparacao: Se True, gera também o gráfico comparativo
+            workers: Número de processos (None = número de CPUs, 1 = sem paralelismo)
+            progresso: Chamada com (gráficos concluídos, total) a cada grupo concluído
+            retomar: Mantém os gráficos já atualizados em vez de regravá-los
+
+        Returns:
+            Tupla (sucesso, relatório com 'gerados', 'pulados', 'falhas' e 'segundos')
+        """
+        inicio = time.perf_counter()
+        formato = formato.lower().lstrip('.')
+        if formato not in FORMATOS_GRAFICO:
+            return False, {'erro': f"Formato não suportado: {formato}"}
+        desconhecidas = [vista for vista in vistas if vista not in _FIGURAS_ESTATICAS]
+        if desconhecidas:
+            return False, {'erro': f"Gráfico desconhecido: {', '.join(desconhecidas)}"}
+
+        try:
+            os.makedirs(diretorio, exist_ok=True)
+            # Data de modificação de cada arquivo já renderizado
+            existentes = ({entrada.name: entrada.stat().st_mtime for entrada in os.scandir(diretorio)}
+                          if retomar else {})
+        except OSError as e:
+            erro_msg = f"Erro ao preparar diretório: {str(e)}"
+            print(f"[UC05] {erro_msg}")
+            return False, {'erro': erro_msg}
+
+        ids_calculados = self._ids_calculados(ids_simulacoes)
+        pulados = []
+        pendentes = []
+        for id_simulacao in ids_calculados:
+            modificada = self.configurador.simulacoes[id_simulacao].data_modificacao.timestamp()
+            for vista in vistas:
+                nome = f"{id_simulacao}_{vista}.{formato}"
+                if existentes.get(nome, -math.inf) >= modificada:
+                    pulados.append(nome)
+                else:
+                    pendentes.append((id_simulacao, vista, nome))
+
+        gerados = []
+        falhas = {}
+        total = len(pendentes)
+
+        if comparacao:
+            nome = f"comparacao.{formato}"
+            sims_calculadas = self._sims_comparacao(ids_calculados)
+            if len(sims_calculadas) >= 2:
+                caminho = os.path.join(diretorio, nome)
+                temporario = _caminho_temporario(caminho)
+                try:
+                    _figura_comparacao_estatica(sims_calculadas).savefig(temporario, format=formato)
+                    os.replace(temporario, caminho)
+                    gerados.append(nome)
+                except Exception as e:
+                    if os.path.exists(temporario):
+                        os.remove(temporario)
+                    falhas[nome] = str(e)
+
+        def tarefas():
+            """Monta os grupos sob demanda; as vistas de uma simulação ficam no mesmo grupo"""
+            grupo = []
+            simulacoes_no_grupo = 0
+            simulacao = None
+            for id_simulacao, vista, nome in pendentes:
+                if simulacao is None or simulacao.id != id_simulacao:
+                    if simulacoes_no_grupo == SIMULACOES_POR_TAREFA:
+                        yield grupo
+                        grupo, simulacoes_no_grupo = [], 0
+                    simulacao = self._copia_calculada(id_simulacao)
+                    simulacoes_no_grupo += 1
+                grupo.append((simulacao, vista, os.path.join(diretorio, nome)))
+            if grupo:
+                yield grupo
+
+        def registrar(resultados: List[tuple[str, Optional[str]]]) -> None:
+            for nome, erro in resultados:
+                if erro is None:
+                    gerados.append(nome)
+                else:
+                    falhas[nome] = erro
+            if progresso:
+                progresso(len(gerados) + len(falhas), total)
+
+        _processar_em_grupos(tarefas(), _renderizar_graficos, registrar,
+                             workers=1 if total <= SIMULACOES_POR_TAREFA else workers)
+
+        relatorio = {
+            'gerados': gerados,
+            'pulados': pulados,
+            'falhas': falhas,
+            'segundos': time.perf_counter() - inicio
+        }
+        print(f"[UC05] {len(gerados)} gráficos gerados em {diretorio} "
+              f"({len(pulados)} já atualizados, {len(falhas)} falhas)")
+        return True, relatorio
+
+    def gerar_relatorio_pdf(self, caminho_arquivo: str, ids_simulacoes: Optional[List[str]] = None,
+                            vistas: tuple = VISTAS_GRAFICO, comparacao: bool = True) -> tuple[bool, str]:
+        """
+        UC05 - Gera um relatório PDF com uma página por gráfico
+
+        A primeira página é a comparação (se houver ao menos duas simulações
+        calculadas e comparacao=True), seguida dos gráficos de cada
+        simulação. Cada página é gravada assim que desenhada e a figura é
+        descartada em seguida. O PDF é montado em um arquivo temporário e
+        só substitui o destino quando completo.
+
+        Args:
+            caminho_arquivo: Caminho do PDF
+            ids_simulacoes: Simulações do relatório (padrão: todas as calculadas)
+            vistas: Gráficos por simulação ('evolucao' e/ou 'composicao')
+            comparacao: Se True, inclui a página de comparação
+
+        Returns:
+            Tupla (sucesso, mensagem)
+        """
+        from matplotlib.backends.backend_pdf import PdfPages
+
+        desconhecidas = [vista for vista in vistas if vista not in _FIGURAS_ESTATICAS]
+        if desconhecidas:
+            return False, f"Gráfico desconhecido: {', '.join(desconhecidas)}"
+        ids_calculados = self._ids_calculados(ids_simulacoes)
+        if not ids_calculados:
+            return False, "Nenhuma simulação calculada para o relatório"
+
+        temporario = _caminho_temporario(caminho_arquivo)
+        paginas = 0
+        try:
+            with PdfPages(temporario, metadata={'Title': 'Simulações de Investimentos'}) as pdf:
+                sims_calculadas = self._sims_comparacao(ids_calculados) if comparacao else []
+                if len(sims_calculadas) >= 2:
+                    pdf.savefig(_figura_comparacao_estatica(sims_calculadas))
+                    paginas += 1
+                for id_simulacao in ids_calculados:
+                    simulacao = self._copia_calculada(id_simulacao)
+                    for vista in vistas:
+                        pdf.savefig(_FIGURAS_ESTATICAS[vista](simulacao))
+                        paginas += 1
+            os.replace(temporario, caminho_arquivo)
+        except Exception as e:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            erro_msg = f"Erro ao gerar relatório PDF: {str(e)}"
+            print(f"[UC05] {erro_msg}")
+            return False, erro_msg
+
+        msg = f"Relatório com {paginas} páginas salvo em {caminho_arquivo}"
+        print(f"[UC05] {msg}")
+        return True, msg
 
 # ============================================================================
 # UC06 - COMPARAR SIMULAÇÕES
@@ -969,27 +4664,13 @@ class ComparadorSimulacoes:
         if len(sims_calculadas) < 2:
             return None
 
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-        fig.suptitle('Comparação de Simulações', fontsize=14, fontweight='bold')
-
-        nomes = [s['nome'] for s in sims_calculadas]
-        saldos = [s['saldo_final'] for s in sims_calculadas]
-        rentabilidades = [s['rentabilidade'] for s in sims_calculadas]
+        from matplotlib.figure import Figure
 
-        # Gráfico 1: Saldo Final
-        cores = plt.cm.viridis([i/len(sims_calculadas) for i in range(len(sims_calculadas))])
-        bars1 = ax1.bar(nomes, saldos, color=cores)
-        ax1.set_title('Saldo Final')
-        ax1.set_ylabel('Valor (R$)')
-        ax1.tick_params(axis='x', rotation=45)
-        ax1.grid(True, alpha=0.3, axis='y')
+        fig = Figure(figsize=(14, 6))
+        ax1, ax2 = fig.subplots(1, 2)
+        fig.suptitle('Comparação de Simulações', fontsize=14, fontweight='bold')
 
-        # Gráfico 2: Rentabilidade
-        bars2 = ax2.bar(nomes, rentabilidades, color=cores)
-        ax2.set_title('Rentabilidade (%)')
-        ax2.set_ylabel('Percentual (%)')
-        ax2.tick_params(axis='x', rotation=45)
-        ax2.grid(True, alpha=0.3, axis='y')
+        bars1, bars2 = _desenhar_barras_comparacao(ax1, ax2, sims_calculadas)
 
         # Adicionar interatividade com hover
         annot1 = ax1.annotate("", xy=(0,0), xytext=(10,10), textcoords="offset points",
@@ -1002,49 +4683,34 @@ class ComparadorSimulacoes:
                              arrowprops=dict(arrowstyle="->"))
         annot2.set_visible(False)
 
-        def hover_bar(event):
-            """Detecta hover sobre as barras"""
-            if event.inaxes == ax1:
-                for i, bar in enumerate(bars1):
-                    if bar.contains(event)[0]:
-                        sim = sims_calculadas[i]
-                        texto = f"{sim['nome']}\n\nSaldo Final: R$ {sim['saldo_final']:,.2f}\nTotal Investido: R$ {sim['total_investido']:,.2f}\nJuros: R$ {sim['juros_acumulados']:,.2f}\nPrazo: {sim['prazo_meses']} meses"
-                        annot1.xy = (bar.get_x() + bar.get_width()/2, bar.get_height())
-                        annot1.set_text(texto)
-                        annot1.set_visible(True)
-                        bar.set_edgecolor('white')
-                        bar.set_linewidth(2)
-                        fig.canvas.draw_idle()
-                        return
-                    else:
-                        bar.set_linewidth(0)
-                
-                if annot1.get_visible():
-                    annot1.set_visible(False)
-                    fig.canvas.draw_idle()
-                    
-            elif event.inaxes == ax2:
-                for i, bar in enumerate(bars2):
-                    if bar.contains(event)[0]:
-                        sim = sims_calculadas[i]
-                        texto = f"{sim['nome']}\n\nRentabilidade: {sim['rentabilidade']:.2f}%\nSaldo Final: R$ {sim['saldo_final']:,.2f}\nInvestido: R$ {sim['total_investido']:,.2f}\nPrazo: {sim['prazo_meses']} meses"
-                        annot2.xy = (bar.get_x() + bar.get_width()/2, bar.get_height())
-                        annot2.set_text(texto)
-                        annot2.set_visible(True)
-                        bar.set_edgecolor('white')
-                        bar.set_linewidth(2)
-                        fig.canvas.draw_idle()
-                        return
-                    else:
-                        bar.set_linewidth(0)
-                
-                if annot2.get_visible():
-                    annot2.set_visible(False)
-                    fig.canvas.draw_idle()
-
-        fig.canvas.mpl_connect("motion_notify_event", hover_bar)
-
-        plt.tight_layout()
+        def texto_saldo(sim):
+            return f"{sim['nome']}\n\nSaldo Final: R$ {sim['saldo_final']:,.2f}\nTotal Investido: R$ {sim['total_investido']:,.2f}\nJuros: R$ {sim['juros_acumulados']:,.2f}\nPrazo: {sim['prazo_meses']} meses"
+
+        def texto_rentabilidade(sim):
+            return f"{sim['nome']}\n\nRentabilidade: {sim['rentabilidade']:.2f}%\nSaldo Final: R$ {sim['saldo_final']:,.2f}\nInvestido: R$ {sim['total_investido']:,.2f}\nPrazo: {sim['prazo_meses']} meses"
+
+        # As barras ficam em posições crescentes: a borda esquerda de cada uma
+        # serve de índice para o bisect
+        bordas = [bar.get_x() for bar in bars1]
+        paineis = {ax1: (bars1, annot1, texto_saldo), ax2: (bars2, annot2, texto_rentabilidade)}
+
+        def localizar(event):
+            """Barra sob o cursor, encontrada por bisect nas bordas esquerdas"""
+            if event.inaxes not in paineis:
+                return None
+            bars, annot, texto = paineis[event.inaxes]
+            i = bisect.bisect_right(bordas, event.xdata) - 1
+            if i < 0:
+                return None
+            bar = bars[i]
+            altura = bar.get_height()
+            if event.xdata > bar.get_x() + bar.get_width() or not min(0, altura) <= event.ydata <= max(0, altura):
+                return None
+            return annot, (bar.get_x() + bar.get_width()/2, altura), texto(sims_calculadas[i])
+
+        _DicaFlutuante(fig, (annot1, annot2), localizar)
+
+        fig.tight_layout()
         return fig
 
 # ============================================================================
@@ -1056,13 +4722,16 @@ class SistemaSimulacaoInvestimentos:
     Classe principal que integra todos os casos de uso
     """
 
-    def __init__(self):
-        self.gerenciador = ConfiguradorSimulacao()
+    def __init__(self, orcamento_resultados: Optional[int] = None):
+        self.gerenciador = ConfiguradorSimulacao(orcamento_resultados)
         self.calculadora = CalculadoraSimulacao(self.gerenciador)
         self.arquivos = GerenciadorSimulacoes(self.gerenciador)
         self.exportador = ExportadorSimulacao(self.gerenciador)
-        self.graficos = GeradorGraficos(self.gerenciador) if MATPLOTLIB_DISPONIVEL else None
-        self.comparador = ComparadorSimulacoes(self.gerenciador)
+        self.assincrono = PersistenciaAssincrona(self.arquivos, self.exportador)
+        # UC05/UC06 são criados no primeiro uso (ver propriedades abaixo)
+        self._graficos: Optional[GeradorGraficos] = None
+        self._comparador: Optional[ComparadorSimulacoes] = None
+        self._renderizador: Optional[RenderizadorGraficos] = None
 
         print("Sistema de Simulação de Investimentos inicializado")
         print("Casos de Uso disponíveis:")
@@ -1074,6 +4743,27 @@ class SistemaSimulacaoInvestimentos:
             print("  UC05 - Visualizar Gráficos")
         print("  UC06 - Comparar Simulações")
 
+    @property
+    def graficos(self) -> Optional[GeradorGraficos]:
+        """UC05 - Gerador de gráficos interativos, criado no primeiro acesso"""
+        if self._graficos is None and MATPLOTLIB_DISPONIVEL:
+            self._graficos = GeradorGraficos(self.gerenciador)
+        return self._graficos
+
+    @property
+    def comparador(self) -> ComparadorSimulacoes:
+        """UC06 - Comparador de simulações, criado no primeiro acesso"""
+        if self._comparador is None:
+            self._comparador = ComparadorSimulacoes(self.gerenciador)
+        return self._comparador
+
+    @property
+    def renderizador(self) -> Optional[RenderizadorGraficos]:
+        """UC05 - Renderizador de gráficos em arquivo, criado no primeiro acesso"""
+        if self._renderizador is None and MATPLOTLIB_DISPONIVEL:
+            self._renderizador = RenderizadorGraficos(self.gerenciador, self.comparador)
+        return self._renderizador
+
     # Métodos do UC01 (Nick D)
     def criar_simulacao(self, nome: str) -> str:
         """UC01 - Criar nova simulação"""
@@ -1091,6 +4781,22 @@ class SistemaSimulacaoInvestimentos:
         """UC01 - Excluir simulação"""
         return self.gerenciador.excluir_simulacao(id_simulacao)
 
+    def clonar_simulacao(self, id_simulacao: str, **sobrescritas) -> tuple[bool, str]:
+        """UC01 - Criar cenário derivado de uma simulação"""
+        return self.gerenciador.clonar_simulacao(id_simulacao, **sobrescritas)
+
+    def desfazer_modificacao(self, id_simulacao: str) -> tuple[bool, str]:
+        """UC01 - Desfazer última modificação"""
+        return self.gerenciador.desfazer(id_simulacao)
+
+    def refazer_modificacao(self, id_simulacao: str) -> tuple[bool, str]:
+        """UC01 - Refazer modificação desfeita"""
+        return self.gerenciador.refazer(id_simulacao)
+
+    def restaurar_simulacao(self, id_simulacao: str, instante: datetime) -> tuple[bool, str]:
+        """UC01 - Restaurar simulação para um instante"""
+        return self.gerenciador.restaurar_para(id_simulacao, instante)
+
     # Métodos do UC02 (Nick C)
     def calcular_simulacao(self, id_simulacao: str) -> tuple[bool, List[str]]:
         """UC02 - Calcular simulação"""
@@ -1100,20 +4806,125 @@ class SistemaSimulacaoInvestimentos:
         """UC02 - Testar simulação completa"""
         return self.calculadora.testar_simulacao(id_simulacao)
 
+    def resumir_resultados(self, id_simulacao: str) -> Dict[str, Any]:
+        """UC02 - Resumo dos resultados atuais (em cache), sem recalcular"""
+        return self.calculadora.resumir_resultados(id_simulacao)
+
     # Métodos do UC03 (Nick J)
-    def salvar_simulacao(self, id_simulacao: str, caminho: str) -> tuple[bool, str]:
+    def salvar_simulacao(self, id_simulacao: str, caminho: str, forcar: bool = False) -> tuple[bool, str]:
         """UC03 - Salvar simulação"""
-        return self.arquivos.salvar_simulacao(id_simulacao, caminho)
+        return self.arquivos.salvar_simulacao(id_simulacao, caminho, forcar)
 
     def carregar_simulacao(self, caminho: str) -> tuple[bool, str]:
         """UC03 - Carregar simulação"""
         return self.arquivos.carregar_simulacao(caminho)
 
+    def salvar_simulacao_binaria(self, id_simulacao: str, caminho: str) -> tuple[bool, str]:
+        """UC03 - Salvar simulação em formato binário"""
+        return self.arquivos.salvar_simulacao_binaria(id_simulacao, caminho)
+
+    def carregar_simulacao_binaria(self, caminho: str, sob_demanda: bool = False) -> tuple[bool, str]:
+        """UC03 - Carregar simulação em formato binário"""
+        return self.arquivos.carregar_simulacao_binaria(caminho, sob_demanda)
+
+    def listar_simulacoes_binarias(self, diretorio: str) -> tuple[bool, Any]:
+        """UC03 - Listar snapshots binários lendo só os cabeçalhos"""
+        return self.arquivos.listar_simulacoes_binarias(diretorio)
+
+    def carregar_diretorio(self, diretorio: str, workers: Optional[int] = None) -> tuple[bool, Dict[str, Any]]:
+        """UC03 - Carregar em paralelo todas as simulações de um diretório"""
+        return self.arquivos.carregar_diretorio(diretorio, workers)
+
+    def salvar_workspace(self, diretorio: str, forcar: bool = False) -> tuple[bool, str]:
+        """UC03 - Salvar simulações alteradas no diretório do workspace"""
+        return self.arquivos.salvar_workspace(diretorio, forcar)
+
+    def carregar_workspace(self, diretorio: str, workers: Optional[int] = None) -> tuple[bool, Dict[str, Any]]:
+        """UC03 - Carregar workspace salvo em diretório"""
+        return self.arquivos.carregar_workspace(diretorio, workers)
+
+    def abrir_diario(self, diretorio: str) -> tuple[bool, str]:
+        """UC03 - Abrir workspace com diário de modificações"""
+        return self.arquivos.abrir_diario(diretorio)
+
+    def compactar_diario(self, em_segundo_plano: bool = True) -> tuple[bool, str]:
+        """UC03 - Compactar diário em snapshot"""
+        return self.arquivos.compactar_diario(em_segundo_plano)
+
+    def salvar_workspace_sqlite(self, caminho: str) -> tuple[bool, str]:
+        """UC03 - Salvar todas as simulações em banco SQLite"""
+        return self.arquivos.salvar_workspace_sqlite(caminho)
+
+    def carregar_workspace_sqlite(self, caminho: str) -> tuple[bool, Any]:
+        """UC03 - Carregar simulações de banco SQLite"""
+        return self.arquivos.carregar_workspace_sqlite(caminho)
+
+    def importar_taxas_csv(self, caminho: str) -> tuple[bool, Any]:
+        """UC03 - Ler curva de taxas mensais de CSV"""
+        return self.arquivos.importar_taxas_csv(caminho)
+
+    def importar_planos_csv(self, caminho: str) -> tuple[bool, Any]:
+        """UC03 - Importar planos de CSV como novas simulações"""
+        return self.arquivos.importar_planos_csv(caminho)
+
+    def carregar_jsonl(self, origem) -> tuple[bool, Any]:
+        """UC03 - Carregar simulações ou resultados de JSON Lines"""
+        return self.arquivos.carregar_jsonl(origem)
+
+    def salvar_snapshot(self, caminho: str) -> tuple[bool, str]:
+        """UC03 - Salvar o workspace inteiro em snapshot binário"""
+        return self.arquivos.salvar_snapshot(caminho)
+
+    def carregar_snapshot(self, caminho: str) -> tuple[bool, Any]:
+        """UC03 - Restaurar workspace de snapshot binário"""
+        return self.arquivos.carregar_snapshot(caminho)
+
     # Métodos do UC04
     def exportar_csv(self, id_simulacao: str, caminho: str) -> tuple[bool, str]:
         """UC04 - Exportar simulação para CSV"""
         return self.exportador.exportar_csv(id_simulacao, caminho)
 
+    def exportar_csv_lote(self, caminho: str, ids_simulacoes: Optional[List[str]] = None) -> tuple[bool, str]:
+        """UC04 - Exportar várias simulações para um único CSV"""
+        return self.exportador.exportar_csv_lote(caminho, ids_simulacoes)
+
+    def exportar_jsonl(self, destino, ids_simulacoes: Optional[List[str]] = None,
+                       por_mes: bool = False) -> tuple[bool, str]:
+        """UC04 - Exportar simulações em JSON Lines"""
+        return self.exportador.exportar_jsonl(destino, ids_simulacoes, por_mes)
+
+    def exportar_diretorio(self, diretorio: str, ids_simulacoes: Optional[List[str]] = None,
+                           formato_grafico: Optional[str] = None, workers: Optional[int] = None,
+                           progresso: Optional[Callable[[int, int], None]] = None) -> tuple[bool, Dict[str, Any]]:
+        """UC04 - Exportar um CSV (e gráfico) por simulação para um diretório, em paralelo"""
+        return self.exportador.exportar_diretorio(diretorio, ids_simulacoes, formato_grafico, workers, progresso)
+
+    def exportar_colunar(self, caminho: str, ids_simulacoes: Optional[List[str]] = None) -> tuple[bool, str]:
+        """UC04 - Exportar resultados em formato colunar (.npz, Arrow ou Parquet)"""
+        return self.exportador.exportar_colunar(caminho, ids_simulacoes)
+
+    # Versões assíncronas do UC03/UC04 (para uso dentro de um event loop)
+    async def salvar_simulacao_async(self, id_simulacao: str, caminho: str,
+                                     forcar: bool = False) -> tuple[bool, str]:
+        """UC03 - Salvar simulação sem bloquear o event loop"""
+        return await self.assincrono.salvar_simulacao(id_simulacao, caminho, forcar)
+
+    async def carregar_simulacao_async(self, caminho: str) -> tuple[bool, str]:
+        """UC03 - Carregar simulação sem bloquear o event loop"""
+        return await self.assincrono.carregar_simulacao(caminho)
+
+    async def exportar_csv_async(self, id_simulacao: str, caminho: str) -> tuple[bool, str]:
+        """UC04 - Exportar simulação para CSV sem bloquear o event loop"""
+        return await self.assincrono.exportar_csv(id_simulacao, caminho)
+
+    async def salvar_simulacoes_async(self, destinos: Dict[str, str]) -> Dict[str, tuple[bool, str]]:
+        """UC03 - Salvar várias simulações concorrentemente"""
+        return await self.assincrono.salvar_varias(destinos)
+
+    async def carregar_simulacoes_async(self, caminhos: List[str]) -> Dict[str, tuple[bool, str]]:
+        """UC03 - Carregar vários arquivos concorrentemente"""
+        return await self.assincrono.carregar_varias(caminhos)
+
     # Métodos auxiliares
     def listar_simulacoes(self) -> List[Dict[str, Any]]:
         """Lista todas as simulações"""
@@ -1123,6 +4934,20 @@ class SistemaSimulacaoInvestimentos:
         """Obtém histórico de modificações"""
         return self.gerenciador.obter_historico(id_simulacao)
 
+    def consultar_historico(self, campo: Optional[str] = None,
+                            inicio: Optional[datetime] = None,
+                            fim: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Consulta modificações de todas as simulações por campo e período"""
+        return self.gerenciador.consultar_historico(campo, inicio, fim)
+
+    def definir_orcamento_memoria(self, orcamento: Optional[int]) -> None:
+        """Define o orçamento de memória (bytes) para resultados calculados"""
+        self.gerenciador.definir_orcamento_resultados(orcamento)
+
+    def obter_uso_memoria(self) -> Dict[str, Any]:
+        """Obtém uso de memória, descartes e recálculos de resultados"""
+        return self.gerenciador.obter_uso_memoria()
+
     def criar_grafico_evolucao(self, id_simulacao: str) -> Optional[Figure]:
         """UC05 - Cria gráfico de evolução"""
         if self.graficos:
@@ -1135,6 +4960,30 @@ class SistemaSimulacaoInvestimentos:
             return self.graficos.criar_figura_composicao(id_simulacao)
         return None
 
+    def renderizar_graficos(self, diretorio: str, ids_simulacoes: Optional[List[str]] = None,
+                            vistas: tuple = VISTAS_GRAFICO, formato: str = 'png',
+                            comparacao: bool = False, workers: Optional[int] = None,
+                            progresso: Optional[Callable[[int, int], None]] = None,
+                            retomar: bool = False) -> tuple[bool, Dict[str, Any]]:
+        """UC05 - Renderizar gráficos de várias simulações em arquivos, sem interface"""
+        if self.renderizador:
+            return self.renderizador.renderizar_diretorio(diretorio, ids_simulacoes, vistas, formato,
+                                                          comparacao, workers, progresso, retomar)
+        return False, {'erro': "matplotlib não está instalado"}
+
+    def gerar_relatorio_pdf(self, caminho: str, ids_simulacoes: Optional[List[str]] = None,
+                            vistas: tuple = VISTAS_GRAFICO, comparacao: bool = True) -> tuple[bool, str]:
+        """UC05 - Gerar relatório PDF com os gráficos, uma página por vez"""
+        if self.renderizador:
+            return self.renderizador.gerar_relatorio_pdf(caminho, ids_simulacoes, vistas, comparacao)
+        return False, "matplotlib não está instalado"
+
+    def liberar_graficos(self, id_simulacao: Optional[str] = None) -> int:
+        """UC05 - Libera as figuras mantidas para uma simulação (ou todas)"""
+        if self._graficos:
+            return self._graficos.liberar_figuras(id_simulacao)
+        return 0
+
     def comparar_simulacoes(self, lista_ids: List[str]) -> Optional[Dict[str, Any]]:
         """UC06 - Compara múltiplas simulações"""
         return self.comparador.comparar(lista_ids)
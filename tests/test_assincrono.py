@@ -0,0 +1,118 @@
+"""
+Testes da persistência assíncrona (UC03/UC04 - PersistenciaAssincrona)
+
+Execute com:
+
+    python -m pytest -q
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import main
+from main import SistemaSimulacaoInvestimentos
+
+
+class TestPersistenciaAssincrona(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.sistema = SistemaSimulacaoInvestimentos()
+        self.id_simulacao = self.sistema.criar_simulacao("A")
+        self.caminho = os.path.join(self.diretorio, f"{self.id_simulacao}.json")
+
+    def tearDown(self):
+        self.sistema.assincrono.fechar()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_gravacoes_sincronas_e_assincronas_compartilham_versao(self):
+        self.assertTrue(self.sistema.salvar_simulacao(self.id_simulacao, self.caminho)[0])
+        sucesso, mensagem = asyncio.run(self.sistema.salvar_simulacao_async(self.id_simulacao, self.caminho))
+        self.assertTrue(sucesso, mensagem)
+        sucesso, mensagem = self.sistema.salvar_simulacao(self.id_simulacao, self.caminho)
+        self.assertTrue(sucesso, mensagem)
+
+    def test_gravacao_assincrona_recusa_alteracao_alheia(self):
+        self.assertTrue(self.sistema.salvar_simulacao(self.id_simulacao, self.caminho)[0])
+        outro = SistemaSimulacaoInvestimentos()
+        outro.carregar_simulacao(self.caminho)
+        outro.salvar_simulacao(self.id_simulacao, self.caminho)
+
+        sucesso, _ = asyncio.run(self.sistema.salvar_simulacao_async(self.id_simulacao, self.caminho))
+        self.assertFalse(sucesso)
+        sucesso, mensagem = asyncio.run(
+            self.sistema.salvar_simulacao_async(self.id_simulacao, self.caminho, forcar=True))
+        self.assertTrue(sucesso, mensagem)
+        self.assertEqual(os.listdir(self.diretorio), [f"{self.id_simulacao}.json"])
+
+
+class TestCancelamento(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.sistema = SistemaSimulacaoInvestimentos()
+        self.id_simulacao = self.sistema.criar_simulacao("A")
+        self.caminho = os.path.join(self.diretorio, f"{self.id_simulacao}.json")
+        self.assertTrue(self.sistema.salvar_simulacao(self.id_simulacao, self.caminho)[0])
+        self.em_andamento = threading.Event()
+        self.liberar = threading.Event()
+
+    def tearDown(self):
+        self.liberar.set()
+        self.sistema.assincrono.fechar()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def _segurar(self, funcao):
+        """Envolve a função para que ela avise que começou e espere ser liberada"""
+        def segurada(*args):
+            resultado = funcao(*args)
+            self.em_andamento.set()
+            self.assertTrue(self.liberar.wait(5))
+            return resultado
+        return segurada
+
+    def _cancelar_durante(self, corrotina) -> None:
+        async def cenario():
+            tarefa = asyncio.ensure_future(corrotina)
+            await asyncio.get_running_loop().run_in_executor(None, self.em_andamento.wait, 5)
+            tarefa.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await tarefa
+            # Só agora a corrotina tratou o cancelamento; a thread pode seguir
+            self.liberar.set()
+        asyncio.run(cenario())
+        self.sistema.assincrono.fechar()  # aguarda a thread que ainda gravava
+
+    def test_cancelar_gravacao_preserva_destino(self):
+        with open(self.caminho) as arquivo:
+            conteudo = arquivo.read()
+        self.sistema.editar_nome_simulacao(self.id_simulacao, "B")
+
+        # Segura a gravação depois do temporário pronto, antes da troca pelo destino
+        with mock.patch('main._sincronizar_caminho', self._segurar(main._sincronizar_caminho)):
+            self._cancelar_durante(self.sistema.salvar_simulacao_async(self.id_simulacao, self.caminho))
+
+        with open(self.caminho) as arquivo:
+            self.assertEqual(arquivo.read(), conteudo)
+        self.assertEqual(os.listdir(self.diretorio), [f"{self.id_simulacao}.json"])
+        # A versão registrada continua valendo para a próxima gravação
+        self.assertTrue(self.sistema.salvar_simulacao(self.id_simulacao, self.caminho)[0])
+
+    def test_cancelar_carregamento_nao_altera_configurador(self):
+        outro = SistemaSimulacaoInvestimentos()
+        with mock.patch('main._ler_json_consistente', self._segurar(main._ler_json_consistente)):
+            try:
+                self._cancelar_durante(outro.carregar_simulacao_async(self.caminho))
+            finally:
+                outro.assincrono.fechar()
+        self.assertEqual(outro.gerenciador.simulacoes, {})
+        self.assertEqual(outro.gerenciador._proximo_id, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
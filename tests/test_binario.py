@@ -0,0 +1,128 @@
+"""
+Testes do snapshot binário compacto de simulações (UC03 - .sinb)
+
+Execute com:
+
+    python -m pytest -q
+"""
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from main import (CABECALHO_BINARIO, COLUNAS_RESULTADO, MAGICO_BINARIO, VERSAO_BINARIO,
+                  SistemaSimulacaoInvestimentos, TipoTaxa, ler_cabecalho_binario,
+                  ler_colunas_binarias, mapear_colunas_binarias)
+
+
+class _PlanoSalvo(unittest.TestCase):
+    """Grava em um diretório temporário um plano de 5 meses calculado"""
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.caminho = os.path.join(self.diretorio, "plano.sinb")
+        self.sistema = SistemaSimulacaoInvestimentos()
+        self.id = self.sistema.criar_simulacao("Plano ç")
+        self.sistema.configurar_simulacao(self.id, tipo_taxa=TipoTaxa.VARIAVEL, prazo_meses=5,
+                                          taxas_variaveis=[0.5, 0.6, 0.7, 0.8, 0.9])
+        self.sistema.calcular_simulacao(self.id)
+        self.original = self.sistema.gerenciador.obter_simulacao(self.id)
+        self.assertTrue(self.sistema.salvar_simulacao_binaria(self.id, self.caminho)[0])
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+
+class TestFormatoBinario(_PlanoSalvo):
+
+    def test_ida_e_volta_preserva_simulacao(self):
+        outro = SistemaSimulacaoInvestimentos()
+        sucesso, id_carregado = outro.carregar_simulacao_binaria(self.caminho)
+        self.assertTrue(sucesso, id_carregado)
+        carregada = outro.gerenciador.obter_simulacao(id_carregado)
+        self.assertEqual(carregada.to_dict(), self.original.to_dict())
+
+    def test_colunas_gravadas_em_little_endian_alinhadas(self):
+        with open(self.caminho, 'rb') as arquivo:
+            dados = arquivo.read()
+        magico, versao, _, tamanho_json, meses = CABECALHO_BINARIO.unpack_from(dados)
+        self.assertEqual((magico, versao, meses), (MAGICO_BINARIO, VERSAO_BINARIO, 5))
+
+        inicio = CABECALHO_BINARIO.size + tamanho_json
+        self.assertEqual(inicio % 8, 0)
+        self.assertEqual(len(dados), inicio + meses * 8 * len(COLUNAS_RESULTADO))
+        for i, coluna in enumerate(COLUNAS_RESULTADO):
+            valores = struct.unpack_from(f'<{meses}d', dados, inicio + i * meses * 8)
+            self.assertEqual(list(valores), [getattr(r, coluna) for r in self.original.resultados])
+
+        _, colunas = ler_colunas_binarias(self.caminho)
+        self.assertEqual(list(colunas['saldo_final']), [r.saldo_final for r in self.original.resultados])
+
+    def test_rejeita_arquivo_estranho_versao_futura_e_truncado(self):
+        with open(self.caminho, 'rb') as arquivo:
+            dados = arquivo.read()
+        _, _, reservado, tamanho_json, meses = CABECALHO_BINARIO.unpack_from(dados)
+        variantes = {
+            'estranho': b'XXXX' + dados[4:],
+            'futuro': CABECALHO_BINARIO.pack(MAGICO_BINARIO, VERSAO_BINARIO + 1, reservado,
+                                             tamanho_json, meses) + dados[CABECALHO_BINARIO.size:],
+            'truncado': dados[:-8]
+        }
+        for nome, conteudo in variantes.items():
+            caminho = os.path.join(self.diretorio, f"{nome}.sinb")
+            with open(caminho, 'wb') as arquivo:
+                arquivo.write(conteudo)
+            sucesso, _ = SistemaSimulacaoInvestimentos().carregar_simulacao_binaria(caminho)
+            self.assertFalse(sucesso, nome)
+
+    def test_listagem_le_resumo_do_cabecalho(self):
+        sucesso, cabecalhos = self.sistema.listar_simulacoes_binarias(self.diretorio)
+        self.assertTrue(sucesso)
+        self.assertEqual(len(cabecalhos), 1)
+        resumo = cabecalhos[0]['resumo']
+        self.assertEqual(resumo['total_meses'], 5)
+        self.assertEqual(resumo['saldo_final'], self.original.resultados[-1].saldo_final)
+
+
+class TestCargaSobDemanda(_PlanoSalvo):
+
+    def test_resultados_so_sao_lidos_no_primeiro_acesso(self):
+        outro = SistemaSimulacaoInvestimentos()
+        configurador = outro.gerenciador
+        sucesso, id_carregado = outro.carregar_simulacao_binaria(self.caminho, sob_demanda=True)
+        self.assertTrue(sucesso, id_carregado)
+        self.assertEqual(configurador.simulacoes[id_carregado].resultados, [])
+        self.assertEqual(configurador.obter_uso_memoria()['simulacoes_pendentes'], 1)
+        self.assertTrue(configurador.listar_simulacoes()[0]['calculada'])
+
+        carregada = configurador.obter_simulacao(id_carregado)
+        self.assertEqual(carregada.resultados, self.original.resultados)
+        self.assertEqual(configurador.obter_uso_memoria()['simulacoes_pendentes'], 0)
+
+    def test_cabecalho_nao_depende_das_colunas(self):
+        with open(self.caminho, 'rb') as arquivo:
+            dados = arquivo.read()
+        tamanho_json = CABECALHO_BINARIO.unpack_from(dados)[3]
+        with open(self.caminho, 'wb') as arquivo:
+            arquivo.write(dados[:CABECALHO_BINARIO.size + tamanho_json])
+
+        cabecalho = ler_cabecalho_binario(self.caminho)
+        self.assertEqual(cabecalho['total_resultados'], 5)
+        self.assertEqual(cabecalho['nome'], "Plano ç")
+        sucesso, id_carregado = SistemaSimulacaoInvestimentos().carregar_simulacao_binaria(
+            self.caminho, sob_demanda=True)
+        self.assertTrue(sucesso, id_carregado)
+
+    def test_colunas_mapeadas_leem_o_arquivo(self):
+        with mapear_colunas_binarias(self.caminho) as (dados, colunas):
+            self.assertEqual(dados['id'], self.id)
+            self.assertEqual(list(colunas['mes']), [r.mes for r in self.original.resultados])
+            self.assertEqual(list(colunas['juros_mes']), [r.juros_mes for r in self.original.resultados])
+        # O mapa foi liberado: o arquivo pode ser substituído
+        os.replace(self.caminho, self.caminho + '.antigo')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Testes de cenários derivados (UC01 - clonar_simulacao)
+
+Execute com:
+
+    python -m pytest -q
+"""
+
+import unittest
+
+from main import ConfiguradorSimulacao, CalculadoraSimulacao, TipoTaxa
+
+
+class TestClonarSimulacao(unittest.TestCase):
+
+    def setUp(self):
+        self.configurador = ConfiguradorSimulacao()
+        calculadora = CalculadoraSimulacao(self.configurador)
+        self.id_origem = self.configurador.criar_simulacao("Origem")
+        self.configurador.configurar_parametros(self.id_origem, tipo_taxa=TipoTaxa.VARIAVEL, prazo_meses=3,
+                                                taxas_variaveis=[0.5, 0.6, 0.7])
+        calculadora.calcular_simulacao(self.id_origem)
+        self.origem = self.configurador.simulacoes[self.id_origem]
+
+    def _clonar(self, **sobrescritas):
+        sucesso, id_clone = self.configurador.clonar_simulacao(self.id_origem, **sobrescritas)
+        self.assertTrue(sucesso, id_clone)
+        return self.configurador.simulacoes[id_clone]
+
+    def test_clone_aproveita_resultados_da_origem(self):
+        clone = self._clonar()
+        self.assertEqual(clone.nome, "Origem (cópia)")
+        self.assertEqual(clone.id_origem, self.id_origem)
+        self.assertEqual(clone.resultados, self.origem.resultados)
+        self.assertEqual(clone.taxas_variaveis, self.origem.taxas_variaveis)
+
+    def test_alteracoes_no_lugar_nao_vazam_entre_origem_e_clone(self):
+        clone = self._clonar()
+        taxas_origem = list(self.origem.taxas_variaveis)
+        meses_origem = len(self.origem.resultados)
+
+        clone.taxas_variaveis[0] = 9.9
+        clone.resultados.pop()
+        self.assertEqual(self.origem.taxas_variaveis, taxas_origem)
+        self.assertEqual(len(self.origem.resultados), meses_origem)
+
+        self.origem.taxas_variaveis.append(1.0)
+        self.origem.resultados.clear()
+        self.assertEqual(clone.taxas_variaveis, [9.9] + taxas_origem[1:])
+        self.assertEqual(len(clone.resultados), meses_origem - 1)
+
+    def test_reconfigurar_clone_nao_altera_origem(self):
+        clone = self._clonar(taxas_variaveis=[1.0, 1.0, 1.0], nome="Derivado")
+        self.assertEqual(clone.nome, "Derivado")
+        self.assertEqual(clone.taxas_variaveis, [1.0, 1.0, 1.0])
+        self.assertEqual(self.origem.taxas_variaveis, [0.5, 0.6, 0.7])
+
+    def test_sobrescrita_invalida_nao_reserva_id(self):
+        proximo = self.configurador._proximo_id
+        sucesso, _ = self.configurador.clonar_simulacao(self.id_origem, prazo_meses=-1)
+        self.assertFalse(sucesso)
+        sucesso, _ = self.configurador.clonar_simulacao(self.id_origem, nome="  ")
+        self.assertFalse(sucesso)
+        self.assertEqual(self.configurador._proximo_id, proximo)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Testes da conversão de simulações para JSON e de volta (UC03)
+
+Execute com:
+
+    python -m pytest -q
+"""
+
+import copy
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from main import COLUNAS_RESULTADO, ResultadoMensal, Simulacao, SistemaSimulacaoInvestimentos, TipoTaxa
+
+# Arquivo gravado antes do layout em colunas: um objeto por mês, sem id_origem
+ARQUIVO_ANTIGO = {
+    'id': 'SIM0007',
+    'nome': 'Antiga',
+    'aporte_inicial': 1000.0,
+    'aporte_mensal': 100.0,
+    'prazo_meses': 2,
+    'tipo_taxa': 'variavel',
+    'taxa_fixa': None,
+    'taxas_variaveis': [1.0, 2.0],
+    'resultados': [
+        {'mes': 1, 'aporte_mes': 100.0, 'total_investido': 1100.0, 'juros_mes': 10.0,
+         'juros_acumulados': 10.0, 'saldo_final': 1110.0},
+        {'mes': 2, 'aporte_mes': 100.0, 'total_investido': 1200.0, 'juros_mes': 24.2,
+         'juros_acumulados': 34.2, 'saldo_final': 1234.2}
+    ],
+    'data_criacao': '2024-01-02T03:04:05',
+    'data_modificacao': '2024-01-03T03:04:05',
+    'historico': [
+        {'timestamp': '2024-01-03T03:04:05', 'campo_alterado': 'nome',
+         'valor_antigo': 'Velha', 'valor_novo': 'Antiga'}
+    ]
+}
+
+
+class TestCodecJson(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_le_arquivo_antigo_sem_alterar_o_dicionario(self):
+        dados = copy.deepcopy(ARQUIVO_ANTIGO)
+        simulacao = Simulacao.from_dict(dados)
+        self.assertEqual(dados, ARQUIVO_ANTIGO)
+
+        self.assertIs(simulacao.tipo_taxa, TipoTaxa.VARIAVEL)
+        self.assertEqual(simulacao.data_criacao, datetime(2024, 1, 2, 3, 4, 5))
+        self.assertIsNone(simulacao.id_origem)
+        self.assertEqual(simulacao.resultados,
+                         [ResultadoMensal(**linha) for linha in ARQUIVO_ANTIGO['resultados']])
+        self.assertEqual(simulacao.historico[0].valor_antigo, 'Velha')
+
+    def test_grava_em_colunas_e_le_de_volta(self):
+        antiga = Simulacao.from_dict(ARQUIVO_ANTIGO)
+        dados = antiga.to_dict()
+        self.assertEqual(list(dados['resultados']), list(COLUNAS_RESULTADO))
+        self.assertEqual(dados['resultados']['saldo_final'], [1110.0, 1234.2])
+        self.assertEqual(dados['tipo_taxa'], 'variavel')
+
+        relida = Simulacao.from_dict(json.loads(json.dumps(dados)))
+        self.assertEqual(relida, antiga)
+
+    def test_carrega_arquivo_antigo_e_salva_no_formato_novo(self):
+        caminho = os.path.join(self.diretorio, "antiga.json")
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(ARQUIVO_ANTIGO, arquivo)
+
+        sistema = SistemaSimulacaoInvestimentos()
+        sucesso, id_simulacao = sistema.carregar_simulacao(caminho)
+        self.assertTrue(sucesso, id_simulacao)
+        self.assertTrue(sistema.salvar_simulacao(id_simulacao, caminho)[0])
+        with open(caminho, encoding='utf-8') as arquivo:
+            self.assertIsInstance(json.load(arquivo)['resultados'], dict)
+
+        relido = SistemaSimulacaoInvestimentos()
+        relido.carregar_simulacao(caminho)
+        self.assertEqual(relido.gerenciador.obter_simulacao(id_simulacao).resultados,
+                         sistema.gerenciador.obter_simulacao(id_simulacao).resultados)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Testes de desfazer, refazer e restaurar por instante (UC01)
+
+Execute com:
+
+    python -m pytest -q
+"""
+
+import unittest
+from datetime import timedelta
+
+from main import SistemaSimulacaoInvestimentos
+
+
+class TestDesfazerRefazer(unittest.TestCase):
+
+    def setUp(self):
+        self.sistema = SistemaSimulacaoInvestimentos()
+        self.configurador = self.sistema.gerenciador
+        self.id = self.sistema.criar_simulacao("Plano")
+        for prazo in (24, 36):
+            sucesso, erros = self.sistema.configurar_simulacao(self.id, prazo_meses=prazo)
+            self.assertTrue(sucesso, erros)
+        self.simulacao = self.configurador.simulacoes[self.id]
+
+    def test_navega_pela_pilha_sem_crescer_historico(self):
+        historico = len(self.simulacao.historico)
+        self.assertTrue(self.sistema.desfazer_modificacao(self.id)[0])
+        self.assertEqual(self.simulacao.prazo_meses, 24)
+        self.assertTrue(self.sistema.desfazer_modificacao(self.id)[0])
+        self.assertEqual(self.simulacao.prazo_meses, 12)
+        self.assertFalse(self.sistema.desfazer_modificacao(self.id)[0])
+
+        self.assertTrue(self.sistema.refazer_modificacao(self.id)[0])
+        self.assertTrue(self.sistema.refazer_modificacao(self.id)[0])
+        self.assertEqual(self.simulacao.prazo_meses, 36)
+        self.assertFalse(self.sistema.refazer_modificacao(self.id)[0])
+        self.assertEqual(len(self.simulacao.historico), historico)
+
+    def test_nova_modificacao_descarta_o_que_havia_para_refazer(self):
+        self.sistema.desfazer_modificacao(self.id)
+        self.sistema.configurar_simulacao(self.id, prazo_meses=48)
+        self.assertFalse(self.sistema.refazer_modificacao(self.id)[0])
+        self.sistema.desfazer_modificacao(self.id)
+        self.assertEqual(self.simulacao.prazo_meses, 24)
+
+    def test_reaproveita_resultados_do_estado_revisitado(self):
+        self.sistema.calcular_simulacao(self.id)
+        resultados_36 = self.simulacao.resultados
+        self.sistema.desfazer_modificacao(self.id)
+        self.assertEqual(self.simulacao.resultados, [])
+        self.sistema.calcular_simulacao(self.id)
+        self.assertEqual(len(self.simulacao.resultados), 24)
+
+        self.sistema.refazer_modificacao(self.id)
+        self.assertIs(self.simulacao.resultados, resultados_36)
+        self.assertEqual(self.configurador.obter_uso_memoria()['recalculos'], 0)
+
+    def test_restaura_estado_vigente_no_instante(self):
+        estados = self.configurador._estados[self.id]
+        self.assertEqual([e.timestamp for e in estados], sorted(e.timestamp for e in estados))
+
+        self.assertTrue(self.sistema.restaurar_simulacao(self.id, estados[1].timestamp)[0])
+        self.assertEqual(self.simulacao.prazo_meses, 24)
+        self.assertTrue(self.sistema.restaurar_simulacao(self.id, estados[0].timestamp)[0])
+        self.assertEqual(self.simulacao.prazo_meses, 12)
+        self.assertTrue(self.sistema.refazer_modificacao(self.id)[0])
+        self.assertEqual(self.simulacao.prazo_meses, 24)
+
+        anterior = estados[0].timestamp - timedelta(seconds=1)
+        self.assertFalse(self.sistema.restaurar_simulacao(self.id, anterior)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Testes do diário de modificações (UC03 - DiarioWorkspace)
+
+Execute com:
+
+    python -m pytest -q
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from main import ConfiguradorSimulacao, CalculadoraSimulacao, DiarioWorkspace
+
+
+class TestDiarioWorkspace(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def _reabrir(self) -> ConfiguradorSimulacao:
+        configurador = ConfiguradorSimulacao()
+        diario = DiarioWorkspace(self.diretorio)
+        diario.abrir(configurador)
+        diario.fechar()
+        return configurador
+
+    def test_reaplica_criacao_alteracao_e_exclusao(self):
+        configurador = ConfiguradorSimulacao()
+        diario = DiarioWorkspace(self.diretorio)
+        diario.abrir(configurador)
+        id_a = configurador.criar_simulacao("A")
+        id_b = configurador.criar_simulacao("B")
+        configurador.configurar_parametros(id_a, aporte_mensal=250.0)
+        configurador.editar_nome(id_a, "A2")
+        configurador.excluir_simulacao(id_b)
+        diario.fechar()
+
+        recuperado = self._reabrir()
+        self.assertEqual(list(recuperado.simulacoes), [id_a])
+        simulacao = recuperado.simulacoes[id_a]
+        self.assertEqual(simulacao.nome, "A2")
+        self.assertEqual(simulacao.aporte_mensal, 250.0)
+        self.assertEqual([h.campo_alterado for h in simulacao.historico], ['aporte_mensal', 'nome'])
+
+    def test_simulacoes_anteriores_a_abertura_sao_registradas(self):
+        configurador = ConfiguradorSimulacao()
+        id_antes = configurador.criar_simulacao("Antes")
+        diario = DiarioWorkspace(self.diretorio)
+        diario.abrir(configurador)
+        configurador.editar_nome(id_antes, "Renomeada")
+        id_nova = configurador.criar_simulacao("Nova")
+        diario.fechar()
+
+        recuperado = self._reabrir()
+        self.assertEqual(sorted(recuperado.simulacoes), sorted([id_antes, id_nova]))
+        self.assertEqual(recuperado.simulacoes[id_antes].nome, "Renomeada")
+
+    def test_final_corrompido_e_truncado(self):
+        configurador = ConfiguradorSimulacao()
+        diario = DiarioWorkspace(self.diretorio)
+        diario.abrir(configurador)
+        id_a = configurador.criar_simulacao("A")
+        configurador.configurar_parametros(id_a, aporte_mensal=10.0)
+        diario.fechar()
+
+        caminho = os.path.join(self.diretorio, DiarioWorkspace.ARQUIVO_DIARIO)
+        tamanho_valido = os.path.getsize(caminho)
+        with open(caminho, 'ab') as arquivo:
+            arquivo.write(b'0000dead {"op":"alterar","id":"' + id_a.encode() + b'","campo":"nome"')
+
+        recuperado = self._reabrir()
+        self.assertEqual(recuperado.simulacoes[id_a].aporte_mensal, 10.0)
+        self.assertEqual(recuperado.simulacoes[id_a].nome, "A")
+        self.assertEqual(os.path.getsize(caminho), tamanho_valido)
+
+    def test_compactacao_nao_carrega_nem_grava_resultados(self):
+        configurador = ConfiguradorSimulacao()
+        calculadora = CalculadoraSimulacao(configurador)
+        diario = DiarioWorkspace(self.diretorio)
+        diario.abrir(configurador)
+        ids = [configurador.criar_simulacao(f"S{i}") for i in range(3)]
+        for id_simulacao in ids:
+            calculadora.calcular_simulacao(id_simulacao)
+        configurador.definir_orcamento_resultados(1)  # descarta os resultados
+        recalculos = configurador.obter_uso_memoria()['recalculos']
+
+        diario.compactar(em_segundo_plano=False)
+        configurador.editar_nome(ids[0], "Depois")
+        diario.fechar()
+
+        self.assertEqual(configurador.obter_uso_memoria()['recalculos'], recalculos)
+        self.assertFalse(os.path.exists(os.path.join(self.diretorio, DiarioWorkspace.ARQUIVO_COMPACTANDO)))
+        with open(os.path.join(self.diretorio, DiarioWorkspace.ARQUIVO_SNAPSHOT), encoding='utf-8') as arquivo:
+            snapshot = json.load(arquivo)
+        self.assertTrue(all(not dados['resultados'] for dados in snapshot['simulacoes']))
+
+        recuperado = self._reabrir()
+        self.assertEqual(sorted(recuperado.simulacoes), sorted(ids))
+        self.assertEqual(recuperado.simulacoes[ids[0]].nome, "Depois")
+
+    def test_falha_na_compactacao_nao_perde_registros(self):
+        configurador = ConfiguradorSimulacao()
+        diario = DiarioWorkspace(self.diretorio)
+        diario.abrir(configurador)
+        id_a = configurador.criar_simulacao("A")
+
+        # Um diretório no lugar do arquivo temporário faz a gravação falhar
+        bloqueio = os.path.join(self.diretorio, DiarioWorkspace.ARQUIVO_SNAPSHOT + '.tmp')
+        os.mkdir(bloqueio)
+        diario.compactar()
+        with self.assertRaises(OSError):
+            diario.aguardar_compactacao()
+        self.assertTrue(os.path.exists(os.path.join(self.diretorio, DiarioWorkspace.ARQUIVO_COMPACTANDO)))
+
+        configurador.editar_nome(id_a, "A2")
+        id_b = configurador.criar_simulacao("B")
+        os.rmdir(bloqueio)
+        diario.compactar(em_segundo_plano=False)
+        configurador.configurar_parametros(id_b, aporte_mensal=5.0)
+        diario.fechar()
+
+        recuperado = self._reabrir()
+        self.assertEqual(recuperado.simulacoes[id_a].nome, "A2")
+        self.assertEqual(recuperado.simulacoes[id_b].aporte_mensal, 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
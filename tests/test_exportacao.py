@@ -0,0 +1,154 @@
+"""
+Testes das exportações em lote (UC04 - ExportadorSimulacao)
+
+Execute com:
+
+    python -m pytest -q
+"""
+
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from main import COLUNAS_RESULTADO, SistemaSimulacaoInvestimentos, _texto_csv_lote
+
+
+class TestExportarDiretorio(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.destino = os.path.join(self.diretorio, "exportacao")
+        self.sistema = SistemaSimulacaoInvestimentos()
+        self.ids = [self.sistema.criar_simulacao(f"S{i}") for i in range(4)]
+        for id_simulacao in self.ids[:3]:
+            self.sistema.calcular_simulacao(id_simulacao)
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_exporta_calculadas_com_o_mesmo_conteudo_de_exportar_csv(self):
+        sucesso, relatorio = self.sistema.exportar_diretorio(self.destino, workers=1)
+        self.assertTrue(sucesso)
+        self.assertEqual(sorted(relatorio['exportadas']), self.ids[:3])
+        self.assertEqual(sorted(os.listdir(self.destino)), [f"{i}.csv" for i in self.ids[:3]])
+
+        avulso = os.path.join(self.diretorio, "avulso.csv")
+        self.sistema.exportar_csv(self.ids[0], avulso)
+        with open(avulso, encoding='utf-8') as esperado, \
+                open(os.path.join(self.destino, f"{self.ids[0]}.csv"), encoding='utf-8') as gerado:
+            self.assertEqual(gerado.read(), esperado.read())
+
+    def test_resultados_descartados_sao_recalculados_uma_vez(self):
+        self.sistema.definir_orcamento_memoria(1)
+        uso = self.sistema.obter_uso_memoria()
+        sucesso, relatorio = self.sistema.exportar_diretorio(self.destino, workers=1)
+        self.assertTrue(sucesso)
+        self.assertEqual(len(relatorio['exportadas']), 3)
+        depois = self.sistema.obter_uso_memoria()
+        self.assertEqual(depois['recalculos'] - uso['recalculos'], uso['simulacoes_descartadas'])
+        self.assertEqual(depois['simulacoes_descartadas'], uso['simulacoes_descartadas'])
+
+    def test_formato_de_grafico_invalido_e_recusado_antes_de_exportar(self):
+        sucesso, relatorio = self.sistema.exportar_diretorio(self.destino, formato_grafico='gif')
+        self.assertFalse(sucesso)
+        self.assertIn('gif', relatorio['erro'])
+        self.assertFalse(os.path.exists(self.destino))
+
+    def test_arquivos_existentes_sao_pulados(self):
+        self.sistema.exportar_diretorio(self.destino, workers=1)
+        os.remove(os.path.join(self.destino, f"{self.ids[1]}.csv"))
+        sucesso, relatorio = self.sistema.exportar_diretorio(self.destino, workers=1)
+        self.assertTrue(sucesso)
+        self.assertEqual(relatorio['exportadas'], [self.ids[1]])
+        self.assertEqual(sorted(relatorio['puladas']), [self.ids[0], self.ids[2]])
+
+
+class TestExportarCsvLote(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.sistema = SistemaSimulacaoInvestimentos()
+        self.ids = [self.sistema.criar_simulacao(f"S{i}") for i in range(3)]
+        for id_simulacao in self.ids[:2]:
+            self.sistema.calcular_simulacao(id_simulacao)
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_linhas_iguais_ao_csv_writer(self):
+        resultados = self.sistema.gerenciador.obter_simulacao(self.ids[0]).resultados
+        for id_simulacao in ("SIM0001", 'a,"b"', "100%\nx"):
+            esperado = io.StringIO(newline='')
+            csv.writer(esperado).writerows(
+                [id_simulacao, r.mes] + [f"{v:.2f}" for v in (r.aporte_mes, r.total_investido, r.juros_mes,
+                                                               r.juros_acumulados, r.saldo_final)]
+                for r in resultados)
+            self.assertEqual(_texto_csv_lote(id_simulacao, resultados), esperado.getvalue())
+
+    def test_lotes_cobrem_todas_as_linhas(self):
+        caminho = os.path.join(self.diretorio, "lote.csv")
+        sucesso, _ = self.sistema.exportador.exportar_csv_lote(caminho, linhas_por_lote=5)
+        self.assertTrue(sucesso)
+        with open(caminho, encoding='utf-8', newline='') as arquivo:
+            linhas = list(csv.reader(arquivo))
+        self.assertEqual(linhas[0][:2], ['id', 'mes'])
+        esperadas = sum(len(self.sistema.gerenciador.obter_simulacao(i).resultados) for i in self.ids[:2])
+        self.assertEqual(len(linhas) - 1, esperadas)
+        self.assertEqual({linha[0] for linha in linhas[1:]}, set(self.ids[:2]))
+
+
+class TestJsonLines(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.sistema = SistemaSimulacaoInvestimentos()
+        self.ids = [self.sistema.criar_simulacao(f"S{i}") for i in range(3)]
+        for id_simulacao in self.ids[:2]:
+            self.sistema.calcular_simulacao(id_simulacao)
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_ida_e_volta_por_simulacao_em_arquivo_comprimido(self):
+        caminho = os.path.join(self.diretorio, "simulacoes.jsonl.gz")
+        self.assertTrue(self.sistema.exportar_jsonl(caminho)[0])
+
+        outro = SistemaSimulacaoInvestimentos()
+        sucesso, ids = outro.carregar_jsonl(caminho)
+        self.assertTrue(sucesso, ids)
+        self.assertEqual(ids, self.ids)
+        for id_simulacao in self.ids:
+            self.assertEqual(outro.gerenciador.obter_simulacao(id_simulacao).to_dict(),
+                             self.sistema.gerenciador.obter_simulacao(id_simulacao).to_dict())
+
+    def test_uma_linha_por_mes_em_fluxo(self):
+        fluxo = io.StringIO()
+        self.assertTrue(self.sistema.exportar_jsonl(fluxo, por_mes=True)[0])
+        linhas = [json.loads(linha) for linha in fluxo.getvalue().splitlines()]
+        esperadas = [(i, r.mes, r.saldo_final) for i in self.ids
+                     for r in self.sistema.gerenciador.obter_simulacao(i).resultados]
+        self.assertEqual([(l['id'], l['mes'], l['saldo_final']) for l in linhas], esperadas)
+        self.assertEqual(set(linhas[0]), {'id', *COLUNAS_RESULTADO})
+
+    def test_linhas_por_mes_viram_resultados_das_simulacoes_existentes(self):
+        fluxo = io.StringIO()
+        self.sistema.exportar_jsonl(fluxo, ids_simulacoes=[self.ids[0]], por_mes=True)
+        linhas = fluxo.getvalue().replace(self.ids[0], "SIM9999") + fluxo.getvalue()
+
+        outro = SistemaSimulacaoInvestimentos()
+        id_copia = outro.criar_simulacao("Cópia")
+        self.assertEqual(id_copia, self.ids[0])
+        sucesso, ids = outro.carregar_jsonl(io.StringIO(linhas))
+        self.assertTrue(sucesso, ids)
+        self.assertEqual(ids, [id_copia])
+        self.assertEqual(outro.gerenciador.obter_simulacao(id_copia).resultados,
+                         self.sistema.gerenciador.obter_simulacao(self.ids[0]).resultados)
+        self.assertNotIn("SIM9999", outro.gerenciador.simulacoes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,225 @@
+"""
+Testes dos gráficos (UC05 - GeradorGraficos e RenderizadorGraficos)
+
+Execute com:
+
+    python -m pytest -q
+"""
+
+import math
+import shutil
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+
+from main import MATPLOTLIB_DISPONIVEL, RAIO_HOVER_PX, SistemaSimulacaoInvestimentos, _lttb
+
+
+@unittest.skipUnless(MATPLOTLIB_DISPONIVEL, "matplotlib não está instalado")
+class TestRenderizarDiretorio(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.sistema = SistemaSimulacaoInvestimentos()
+        self.ids = [self.sistema.criar_simulacao(f"S{i}") for i in range(2)]
+        for id_simulacao in self.ids:
+            self.sistema.calcular_simulacao(id_simulacao)
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def _renderizar(self, **opcoes):
+        sucesso, relatorio = self.sistema.renderizar_graficos(
+            self.diretorio, vistas=('evolucao',), formato='svg', workers=1, **opcoes)
+        self.assertTrue(sucesso)
+        return relatorio
+
+    def test_arquivos_existentes_sao_regravados_por_padrao(self):
+        self._renderizar()
+        relatorio = self._renderizar()
+        self.assertEqual(len(relatorio['gerados']), 2)
+        self.assertEqual(relatorio['pulados'], [])
+
+    def test_retomar_regrava_so_simulacoes_alteradas(self):
+        self._renderizar()
+        self.sistema.configurar_simulacao(self.ids[0], aporte_mensal=500.0)
+        self.sistema.calcular_simulacao(self.ids[0])
+
+        relatorio = self._renderizar(retomar=True)
+        self.assertEqual(relatorio['gerados'], [f"{self.ids[0]}_evolucao.svg"])
+        self.assertEqual(relatorio['pulados'], [f"{self.ids[1]}_evolucao.svg"])
+
+    def test_resultados_descartados_sao_lidos_uma_vez(self):
+        self.sistema.definir_orcamento_memoria(1)
+        uso = self.sistema.obter_uso_memoria()
+        relatorio = self._renderizar()
+        self.assertEqual(len(relatorio['gerados']), 2)
+        recalculos = self.sistema.obter_uso_memoria()['recalculos'] - uso['recalculos']
+        self.assertEqual(recalculos, uso['simulacoes_descartadas'])
+
+
+@unittest.skipUnless(MATPLOTLIB_DISPONIVEL, "matplotlib não está instalado")
+class TestFigurasEmCache(unittest.TestCase):
+
+    def setUp(self):
+        self.sistema = SistemaSimulacaoInvestimentos()
+        self.ids = [self.sistema.criar_simulacao(f"S{i}") for i in range(3)]
+        for id_simulacao in self.ids:
+            self.sistema.calcular_simulacao(id_simulacao)
+
+    def tearDown(self):
+        self.sistema.liberar_graficos()
+
+    def test_figura_e_atualizada_no_lugar(self):
+        figura = self.sistema.criar_grafico_evolucao(self.ids[0])
+        self.assertIsNotNone(figura)
+        self.assertIs(self.sistema.criar_grafico_evolucao(self.ids[0]), figura)
+
+        self.sistema.editar_nome_simulacao(self.ids[0], "Renomeada")
+        self.sistema.configurar_simulacao(self.ids[0], aporte_mensal=900.0)
+        self.sistema.calcular_simulacao(self.ids[0])
+        self.assertIs(self.sistema.criar_grafico_evolucao(self.ids[0]), figura)
+
+        saldo = figura.axes[0].get_lines()[0].get_ydata()
+        ultimo = self.sistema.gerenciador.obter_simulacao(self.ids[0]).resultados[-1]
+        self.assertEqual(saldo[-1], ultimo.saldo_final)
+        self.assertIn("Renomeada", figura._suptitle.get_text())
+
+    def test_simulacao_sem_resultados_nao_tem_figura(self):
+        id_simulacao = self.sistema.criar_simulacao("Sem cálculo")
+        self.assertIsNone(self.sistema.criar_grafico_evolucao(id_simulacao))
+        self.assertIsNone(self.sistema.criar_grafico_composicao(id_simulacao))
+
+    def test_exclusao_e_limite_liberam_figuras(self):
+        self.sistema.criar_grafico_evolucao(self.ids[0])
+        self.sistema.criar_grafico_composicao(self.ids[0])
+        self.sistema.excluir_simulacao(self.ids[0])
+        self.assertEqual(self.sistema.liberar_graficos(self.ids[0]), 0)
+
+        self.sistema.graficos.max_figuras = 1
+        primeira = self.sistema.criar_grafico_evolucao(self.ids[1])
+        self.sistema.criar_grafico_evolucao(self.ids[2])
+        self.assertIsNot(self.sistema.criar_grafico_evolucao(self.ids[1]), primeira)
+        self.assertEqual(self.sistema.liberar_graficos(), 1)
+
+
+class TestLttb(unittest.TestCase):
+
+    def setUp(self):
+        self.x = list(range(1, 361))
+        self.y = [math.sin(i / 9) * i for i in self.x]
+
+    def test_mantem_extremos_e_um_ponto_por_balde(self):
+        n = len(self.x)
+        for limite in (3, 4, 50, 120, 359):
+            indices = _lttb(self.x, self.y, limite)
+            self.assertEqual(len(indices), limite)
+            self.assertEqual((indices[0], indices[-1]), (0, n - 1))
+
+            tamanho = (n - 2) / (limite - 2)
+            for balde, indice in enumerate(indices[1:-1]):
+                self.assertGreaterEqual(indice, int(balde * tamanho) + 1)
+                self.assertLess(indice, int((balde + 1) * tamanho) + 1)
+
+    def test_series_curtas_ficam_inteiras(self):
+        for limite in (360, 1000, 2, 0):
+            self.assertEqual(_lttb(self.x, self.y, limite), list(range(360)))
+
+    def test_preserva_pico_isolado(self):
+        y = [1.0] * 360
+        y[200] = 50.0
+        self.assertIn(200, _lttb(self.x, y, 20))
+
+    @unittest.skipUnless(MATPLOTLIB_DISPONIVEL, "matplotlib não está instalado")
+    def test_linhas_do_grafico_cabem_na_largura_dos_eixos(self):
+        sistema = SistemaSimulacaoInvestimentos()
+        id_simulacao = sistema.criar_simulacao("Longa")
+        sistema.configurar_simulacao(id_simulacao, prazo_meses=360)
+        sistema.calcular_simulacao(id_simulacao)
+        figura = sistema.criar_grafico_evolucao(id_simulacao)
+
+        limite = sistema.graficos._limite_pontos(figura.axes[0])
+        self.assertLess(limite, 360)
+        for ax in figura.axes:
+            for linha in ax.get_lines():
+                meses = list(linha.get_xdata())
+                self.assertLessEqual(len(meses), limite)
+                self.assertEqual((meses[0], meses[-1]), (1, 360))
+        sistema.liberar_graficos()
+
+
+@unittest.skipUnless(MATPLOTLIB_DISPONIVEL, "matplotlib não está instalado")
+class TestLocalizarSobCursor(unittest.TestCase):
+
+    def setUp(self):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        self.sistema = SistemaSimulacaoInvestimentos()
+        self.ids = [self.sistema.criar_simulacao(f"S{i}") for i in range(3)]
+        for id_simulacao in self.ids:
+            self.sistema.configurar_simulacao(id_simulacao, prazo_meses=120)
+            self.sistema.calcular_simulacao(id_simulacao)
+        self.figura = self.sistema.criar_grafico_evolucao(self.ids[0])
+        FigureCanvasAgg(self.figura).draw()
+        self.estado = self.sistema.graficos._figuras[(self.ids[0], 'evolucao')]
+
+    def tearDown(self):
+        self.sistema.liberar_graficos()
+
+    def _distancia_minima(self, ax, x, y, series):
+        """Busca exaustiva: menor distância em pixels até um ponto das séries"""
+        meses = self.estado['series'][0]
+        return min(math.hypot(px - x, py - y)
+                   for valores in series
+                   for px, py in ax.transData.transform(list(zip(meses, valores))))
+
+    def test_bisect_encontra_o_mesmo_ponto_da_busca_exaustiva(self):
+        meses, investido, juros, saldo = self.estado['series']
+        paineis = ((self.figura.axes[0], (saldo, investido)), (self.figura.axes[1], (juros,)))
+        for ax, series in paineis:
+            for idx in range(0, len(meses), 7):
+                base_x, base_y = ax.transData.transform((meses[idx], series[0][idx]))
+                for dx, dy in ((0, 0), (2, -3), (-4, 1), (0, RAIO_HOVER_PX + 20)):
+                    x, y = base_x + dx, base_y + dy
+                    alvo = self.estado['dica'].localizar(SimpleNamespace(inaxes=ax, x=x, y=y))
+                    minima = self._distancia_minima(ax, x, y, series)
+                    if minima > RAIO_HOVER_PX:
+                        self.assertIsNone(alvo)
+                        continue
+                    self.assertIsNotNone(alvo)
+                    px, py = ax.transData.transform(alvo[1])
+                    self.assertAlmostEqual(math.hypot(px - x, py - y), minima, places=6)
+
+    def test_fora_dos_eixos_nao_localiza(self):
+        evento = SimpleNamespace(inaxes=None, x=0.0, y=0.0)
+        self.assertIsNone(self.estado['dica'].localizar(evento))
+
+    def test_barras_da_comparacao(self):
+        from matplotlib.backend_bases import MouseEvent
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        figura = self.sistema.criar_grafico_comparacao(self.ids)
+        FigureCanvasAgg(figura).draw()
+        ax = figura.axes[0]
+        anotacao = next(texto for texto in ax.texts if not texto.get_visible())
+        barras = ax.patches
+
+        def mover(x, y):
+            time.sleep(0.02)  # fora do intervalo de agrupamento dos eventos
+            px, py = ax.transData.transform((x, y))
+            figura.canvas.callbacks.process('motion_notify_event',
+                                            MouseEvent('motion_notify_event', figura.canvas, px, py))
+
+        for i, barra in enumerate(barras):
+            mover(barra.get_x() + barra.get_width() / 2, barra.get_height() / 2)
+            self.assertTrue(anotacao.get_visible())
+            self.assertTrue(anotacao.get_text().startswith(f"S{i}"))
+
+        # Entre duas barras e acima de uma barra não há dica
+        mover(barras[0].get_x() + barras[0].get_width() * 1.1, barras[0].get_height() / 2)
+        self.assertFalse(anotacao.get_visible())
+        mover(barras[1].get_x() + barras[1].get_width() / 2, barras[1].get_height() * 1.05)
+        self.assertFalse(anotacao.get_visible())
+
+
+if __name__ == "__main__":
+    unittest.main()
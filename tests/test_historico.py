@@ -0,0 +1,68 @@
+"""
+Testes do índice de histórico de modificações (UC01 - consultar_historico)
+
+Execute com:
+
+    python -m pytest -q
+"""
+
+import unittest
+from datetime import datetime, timedelta
+
+from main import ConfiguradorSimulacao, HistoricoModificacao, Simulacao
+
+
+class TestIndiceHistorico(unittest.TestCase):
+
+    def setUp(self):
+        self.configurador = ConfiguradorSimulacao()
+        self.ids = [self.configurador.criar_simulacao(f"S{i}") for i in range(4)]
+        for posicao, id_simulacao in enumerate(self.ids):
+            self.configurador.configurar_parametros(id_simulacao, taxa_fixa=2.0 + posicao)
+            self.configurador.configurar_parametros(id_simulacao, aporte_mensal=10.0 * posicao + 1)
+
+    def _ids_consultados(self, **filtros):
+        return [m['id_simulacao'] for m in self.configurador.consultar_historico(**filtros)]
+
+    def test_consulta_por_campo_em_ordem_cronologica(self):
+        consulta = self.configurador.consultar_historico('taxa_fixa')
+        self.assertEqual([m['id_simulacao'] for m in consulta], self.ids)
+        self.assertEqual([m['valor_novo'] for m in consulta], [2.0, 3.0, 4.0, 5.0])
+        self.assertTrue(all(m['variacao'] == m['valor_novo'] - m['valor_antigo'] for m in consulta))
+        timestamps = [m['timestamp'] for m in self.configurador.consultar_historico()]
+        self.assertEqual(timestamps, sorted(timestamps))
+
+    def test_consulta_por_periodo_inclusiva(self):
+        todas = self.configurador.consultar_historico()
+        meio = todas[3]['timestamp']
+        self.assertEqual(len(self.configurador.consultar_historico(inicio=meio)),
+                         sum(1 for m in todas if m['timestamp'] >= meio))
+        self.assertEqual(len(self.configurador.consultar_historico(fim=meio)),
+                         sum(1 for m in todas if m['timestamp'] <= meio))
+
+    def test_exclusao_e_recarga_atualizam_indice(self):
+        self.configurador.excluir_simulacao(self.ids[1])
+        self.assertNotIn(self.ids[1], self._ids_consultados())
+
+        # Recarregar com histórico antigo substitui as entradas e mantém a ordem
+        dados = self.configurador.simulacoes[self.ids[2]].to_dict()
+        dados['historico'] = [HistoricoModificacao(datetime.now() - timedelta(days=1),
+                                                   'taxa_fixa', 0.5, 3.0).to_dict()]
+        self.configurador.adicionar_simulacao(Simulacao.from_dict(dados))
+        self.assertEqual(self._ids_consultados(campo='taxa_fixa'), [self.ids[2], self.ids[0], self.ids[3]])
+        self.assertEqual(self._ids_consultados(campo='aporte_mensal'), [self.ids[0], self.ids[3]])
+
+    def test_remocao_nao_percorre_indice_e_compacta_pela_metade(self):
+        total = len(self.configurador._indice_historico_geral)
+        self.configurador.excluir_simulacao(self.ids[0])
+        self.assertEqual(len(self.configurador._indice_historico_geral), total)
+
+        for id_simulacao in self.ids[1:3]:
+            self.configurador.excluir_simulacao(id_simulacao)
+        vivas = len(self.configurador.consultar_historico())
+        self.assertEqual(vivas, 2)
+        self.assertLessEqual(len(self.configurador._indice_historico_geral), 2 * vivas)
+
+
+if __name__ == "__main__":
+    unittest.main()
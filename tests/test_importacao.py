@@ -0,0 +1,54 @@
+"""
+Testes da importação de curvas de taxas e planos em CSV (UC03)
+
+Execute com:
+
+    python -m pytest -q
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from main import ConfiguradorSimulacao, GerenciadorSimulacoes, _lista_taxas
+
+
+class TestImportarTaxasCsv(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.gerenciador = GerenciadorSimulacoes(ConfiguradorSimulacao())
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def _importar(self, conteudo: str):
+        caminho = os.path.join(self.diretorio, "taxas.csv")
+        with open(caminho, 'w', encoding='utf-8', newline='') as arquivo:
+            arquivo.write(conteudo)
+        return self.gerenciador.importar_taxas_csv(caminho)
+
+    def test_linhas_em_branco_sao_ignoradas(self):
+        self.assertEqual(self._importar("mes,taxa\n1,0.5\n\n2,0.6\n\n\n"), (True, [0.5, 0.6]))
+
+    def test_sem_cabecalho(self):
+        self.assertEqual(self._importar("0.5\n0.6\n"), (True, [0.5, 0.6]))
+
+    def test_primeiro_valor_invalido_e_erro(self):
+        sucesso, mensagem = self._importar("abc\n0.5\n")
+        self.assertFalse(sucesso)
+        self.assertIn("linha 1", mensagem)
+
+    def test_linha_de_erro_conta_linhas_em_branco(self):
+        sucesso, mensagem = self._importar("taxa\n\n0.5\n\n150\n")
+        self.assertFalse(sucesso)
+        self.assertIn("linha 5", mensagem)
+
+    def test_lista_de_taxas_com_virgula_decimal(self):
+        self.assertEqual(_lista_taxas("0,5;0,6"), [0.5, 0.6])
+        self.assertEqual(_lista_taxas("0.50, 0.60"), [0.5, 0.6])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Testes da inicialização sob demanda do sistema (importações e subsistemas)
+
+Execute com:
+
+    python -m pytest -q
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from main import MATPLOTLIB_DISPONIVEL, SistemaSimulacaoInvestimentos
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULOS_PESADOS = ('matplotlib', 'numpy', 'pyarrow', 'asyncio', 'csv', 'sqlite3', 'concurrent.futures')
+
+# Roda em um interpretador novo: o processo dos testes já importou de tudo
+ROTEIRO = f"""
+import json, sys
+import main
+sistema = main.SistemaSimulacaoInvestimentos()
+id_simulacao = sistema.criar_simulacao("A")
+sistema.calcular_simulacao(id_simulacao)
+sistema.liberar_graficos()
+print(json.dumps([m for m in {MODULOS_PESADOS!r} if m in sys.modules]))
+"""
+
+
+class TestInicializacao(unittest.TestCase):
+
+    def test_calcular_nao_importa_dependencias_pesadas(self):
+        saida = subprocess.run([sys.executable, '-c', ROTEIRO], cwd=RAIZ, capture_output=True,
+                               text=True, check=True).stdout
+        self.assertEqual(json.loads(saida.splitlines()[-1]), [])
+
+    def test_subsistemas_sao_criados_no_primeiro_acesso(self):
+        sistema = SistemaSimulacaoInvestimentos()
+        self.assertEqual(sistema.liberar_graficos(), 0)
+        self.assertIsNone(sistema._graficos)
+        self.assertIsNone(sistema._comparador)
+        self.assertIsNone(sistema._renderizador)
+
+        comparador = sistema.comparador
+        self.assertIs(sistema.comparador, comparador)
+        if MATPLOTLIB_DISPONIVEL:
+            graficos = sistema.graficos
+            self.assertIsNotNone(graficos)
+            self.assertIs(sistema.graficos, graficos)
+
+
+if __name__ == "__main__":
+    unittest.main()
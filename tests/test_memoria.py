@@ -0,0 +1,84 @@
+"""
+Testes do orçamento de memória dos resultados (UC01/UC02 - descarte LRU e recálculo)
+
+Execute com:
+
+    python -m pytest -q
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from main import ConfiguradorSimulacao, CalculadoraSimulacao, SistemaSimulacaoInvestimentos
+
+
+class TestOrcamentoResultados(unittest.TestCase):
+
+    def setUp(self):
+        self.configurador = ConfiguradorSimulacao()
+        self.calculadora = CalculadoraSimulacao(self.configurador)
+        self.ids = [self.configurador.criar_simulacao(f"S{i}") for i in range(5)]
+        for posicao, id_simulacao in enumerate(self.ids):
+            self.configurador.configurar_parametros(id_simulacao, aporte_mensal=100.0 + posicao)
+            self.calculadora.calcular_simulacao(id_simulacao)
+        self.esperados = {i: list(self.configurador.simulacoes[i].resultados) for i in self.ids}
+        self.por_simulacao = self.configurador.obter_uso_memoria()['uso_bytes'] // len(self.ids)
+
+    def _conferir_uso(self):
+        uso = self.configurador.obter_uso_memoria()
+        self.assertEqual(uso['uso_bytes'], sum(self.configurador._uso_resultados.values()))
+        return uso
+
+    def test_descarta_menos_usadas_ate_caber(self):
+        self.configurador.obter_simulacao(self.ids[0])  # vira a mais recente
+        self.configurador.definir_orcamento_resultados(2 * self.por_simulacao)
+
+        uso = self._conferir_uso()
+        self.assertLessEqual(uso['uso_bytes'], 2 * self.por_simulacao)
+        self.assertEqual(list(self.configurador._uso_resultados), [self.ids[4], self.ids[0]])
+        self.assertEqual(uso['simulacoes_descartadas'], 3)
+        self.assertEqual(uso['descartes'], 3)
+
+    def test_resultado_descartado_e_recalculado_igual(self):
+        self.configurador.definir_orcamento_resultados(1)
+        recalculos = self.configurador.obter_uso_memoria()['recalculos']
+        for id_simulacao in self.ids:
+            self.assertEqual(self.configurador.obter_simulacao(id_simulacao).resultados,
+                             self.esperados[id_simulacao])
+            uso = self._conferir_uso()
+            self.assertEqual(uso['simulacoes_em_memoria'], 1)
+        self.assertEqual(self.configurador.obter_uso_memoria()['recalculos'], recalculos + len(self.ids))
+
+    def test_uso_acompanha_exclusao_e_recarga(self):
+        self.configurador.excluir_simulacao(self.ids[1])
+        self._conferir_uso()
+        simulacao = self.configurador.simulacoes[self.ids[2]]
+        self.configurador.adicionar_simulacao(simulacao)
+        uso = self._conferir_uso()
+        self.assertEqual(uso['simulacoes_em_memoria'], len(self.ids) - 1)
+
+
+class TestPendentesNaoSaoDescartes(unittest.TestCase):
+
+    def test_carga_sob_demanda_conta_como_pendente(self):
+        diretorio = tempfile.mkdtemp()
+        try:
+            banco = os.path.join(diretorio, "workspace.db")
+            sistema = SistemaSimulacaoInvestimentos()
+            for i in range(3):
+                sistema.calcular_simulacao(sistema.criar_simulacao(f"S{i}"))
+            sistema.salvar_workspace_sqlite(banco)
+
+            carregado = SistemaSimulacaoInvestimentos()
+            carregado.carregar_workspace_sqlite(banco)
+            uso = carregado.obter_uso_memoria()
+            self.assertEqual(uso['simulacoes_pendentes'], 3)
+            self.assertEqual(uso['simulacoes_descartadas'], 0)
+        finally:
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+"""
+Testes da gravação concorrente em diretório compartilhado (UC03)
+
+Execute com:
+
+    python -m pytest -q
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from main import (COLUNAS_RESULTADO, ConfiguradorSimulacao, GerenciadorSimulacoes,
+                  SistemaSimulacaoInvestimentos, _caminho_temporario, _ler_simulacao_json,
+                  _travar_arquivo)
+
+
+class TestDiretorioCompartilhado(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.configurador = ConfiguradorSimulacao()
+        self.arquivos = GerenciadorSimulacoes(self.configurador)
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_carga_de_diretorio_ignora_temporario_em_gravacao(self):
+        id_simulacao = self.configurador.criar_simulacao("A")
+        caminho = os.path.join(self.diretorio, f"{id_simulacao}.json")
+        self.arquivos.salvar_simulacao(id_simulacao, caminho)
+        # Simula outro processo no meio de uma gravação do mesmo arquivo
+        shutil.copy(caminho, _caminho_temporario(caminho))
+
+        for metodo in ('carregar_diretorio', 'carregar_workspace'):
+            outro = GerenciadorSimulacoes(ConfiguradorSimulacao())
+            sucesso, relatorio = getattr(outro, metodo)(self.diretorio, workers=1)
+            self.assertTrue(sucesso)
+            self.assertEqual(relatorio['falhas'], {})
+            self.assertEqual(relatorio['ids_trocados'], {})
+            self.assertEqual(list(outro.configurador.simulacoes), [id_simulacao])
+
+    def test_temporario_preserva_extensao_de_compressao(self):
+        temporario = _caminho_temporario(os.path.join(self.diretorio, "SIM0001.json.gz"))
+        self.assertTrue(os.path.basename(temporario).startswith('.'))
+        self.assertTrue(temporario.endswith('.tmp.gz'))
+
+    def test_trava_nao_deixa_arquivo_lock(self):
+        id_simulacao = self.configurador.criar_simulacao("A")
+        caminho = os.path.join(self.diretorio, f"{id_simulacao}.json")
+        with _travar_arquivo(caminho):
+            self.assertTrue(os.path.exists(caminho + '.lock'))
+        sucesso, _ = self.arquivos.salvar_simulacao(id_simulacao, caminho)
+        self.assertTrue(sucesso)
+        self.assertEqual(os.listdir(self.diretorio), [f"{id_simulacao}.json"])
+
+
+class TestSalvarWorkspace(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.sistema = SistemaSimulacaoInvestimentos()
+        self.ids = [self.sistema.criar_simulacao(f"S{i}") for i in range(3)]
+        self.assertTrue(self.sistema.salvar_workspace(self.diretorio)[0])
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def _alterar_em_outro_processo(self, id_simulacao: str) -> None:
+        outro = SistemaSimulacaoInvestimentos()
+        self.assertTrue(outro.carregar_workspace(self.diretorio, workers=1)[0])
+        outro.editar_nome_simulacao(id_simulacao, "Alheia")
+        self.assertTrue(outro.salvar_workspace(self.diretorio)[0])
+
+    def test_salva_so_alteradas_e_remove_excluidas(self):
+        self.sistema.editar_nome_simulacao(self.ids[0], "Nova")
+        self.sistema.excluir_simulacao(self.ids[1])
+        self.assertTrue(self.sistema.salvar_workspace(self.diretorio)[0])
+        self.assertEqual(self.sistema.gerenciador.obter_pendencias(), ([], []))
+        self.assertEqual(sorted(os.listdir(self.diretorio)),
+                         sorted(f"{i}.json" for i in (self.ids[0], self.ids[2])))
+
+        relido = SistemaSimulacaoInvestimentos()
+        relido.carregar_workspace(self.diretorio, workers=1)
+        self.assertEqual(relido.gerenciador.simulacoes[self.ids[0]].nome, "Nova")
+
+    def test_nao_sobrescreve_alteracao_de_outro_processo(self):
+        self._alterar_em_outro_processo(self.ids[0])
+        self.sistema.editar_nome_simulacao(self.ids[0], "Minha")
+        self.sistema.editar_nome_simulacao(self.ids[2], "Outra")
+
+        sucesso, mensagem = self.sistema.salvar_workspace(self.diretorio)
+        self.assertFalse(sucesso)
+        self.assertIn(self.ids[0], mensagem)
+        self.assertEqual(self.sistema.gerenciador.obter_pendencias(), ([self.ids[0]], []))
+
+        self.assertTrue(self.sistema.salvar_workspace(self.diretorio, forcar=True)[0])
+        relido = SistemaSimulacaoInvestimentos()
+        relido.carregar_workspace(self.diretorio, workers=1)
+        self.assertEqual(relido.gerenciador.simulacoes[self.ids[0]].nome, "Minha")
+        self.assertEqual(relido.gerenciador.simulacoes[self.ids[2]].nome, "Outra")
+
+    def test_nao_remove_arquivo_alterado_por_outro_processo(self):
+        self._alterar_em_outro_processo(self.ids[1])
+        self.sistema.excluir_simulacao(self.ids[1])
+        self.assertFalse(self.sistema.salvar_workspace(self.diretorio)[0])
+        self.assertTrue(os.path.exists(os.path.join(self.diretorio, f"{self.ids[1]}.json")))
+
+
+class TestCarregarDiretorio(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.sistema = SistemaSimulacaoInvestimentos()
+        self.ids = [self.sistema.criar_simulacao(f"S{i}") for i in range(2)]
+        for id_simulacao in self.ids:
+            self.sistema.calcular_simulacao(id_simulacao)
+            self.sistema.salvar_simulacao(id_simulacao, os.path.join(self.diretorio, f"{id_simulacao}.json"))
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_leitura_devolve_dicionario_com_resultados_em_colunas(self):
+        caminho = os.path.join(self.diretorio, f"{self.ids[0]}.json")
+        # Formato antigo: um objeto por mês
+        with open(caminho) as arquivo:
+            dados = json.load(arquivo)
+        colunas = dados['resultados']
+        dados['resultados'] = [dict(zip(COLUNAS_RESULTADO, linha))
+                               for linha in zip(*(colunas[c] for c in COLUNAS_RESULTADO))]
+        with open(caminho, 'w') as arquivo:
+            json.dump(dados, arquivo)
+
+        lido, dados_lidos, versao, erro = _ler_simulacao_json(caminho)
+        self.assertEqual(lido, caminho)
+        self.assertIsNone(erro)
+        self.assertIsNotNone(versao)
+        self.assertIs(type(dados_lidos), dict)
+        self.assertEqual(dados_lidos['resultados'], colunas)
+
+    def test_carga_paralela_monta_simulacoes_iguais_as_salvas(self):
+        outro = SistemaSimulacaoInvestimentos()
+        sucesso, relatorio = outro.carregar_diretorio(self.diretorio, workers=2)
+        self.assertTrue(sucesso)
+        self.assertEqual(relatorio['carregadas'], self.ids)
+        for id_simulacao in self.ids:
+            original = self.sistema.gerenciador.obter_simulacao(id_simulacao)
+            carregada = outro.gerenciador.obter_simulacao(id_simulacao)
+            self.assertEqual(carregada.nome, original.nome)
+            self.assertEqual(carregada.resultados, original.resultados)
+
+    def test_falha_quando_nenhum_arquivo_carrega(self):
+        for nome in os.listdir(self.diretorio):
+            with open(os.path.join(self.diretorio, nome), 'w') as arquivo:
+                arquivo.write('{"nome": "sem os demais campos"}' if nome.startswith(self.ids[0]) else '{')
+
+        outro = SistemaSimulacaoInvestimentos()
+        for workers in (1, 2):
+            sucesso, relatorio = outro.carregar_diretorio(self.diretorio, workers=workers)
+            self.assertFalse(sucesso)
+            self.assertEqual(relatorio['carregadas'], [])
+            self.assertEqual(len(relatorio['falhas']), 2)
+        self.assertFalse(outro.carregar_workspace(self.diretorio, workers=1)[0])
+        self.assertEqual(outro.gerenciador.simulacoes, {})
+
+    def test_diretorio_vazio_carrega_sem_falha(self):
+        vazio = tempfile.mkdtemp(dir=self.diretorio)
+        sucesso, relatorio = SistemaSimulacaoInvestimentos().carregar_diretorio(vazio)
+        self.assertTrue(sucesso)
+        self.assertEqual(relatorio['carregadas'], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+Testes do snapshot binário do workspace (capturar_snapshot/restaurar_snapshot)
+
+Execute com:
+
+    python -m pytest -q
+"""
+
+import unittest
+
+from main import ConfiguradorSimulacao, CalculadoraSimulacao, capturar_snapshot, restaurar_snapshot
+
+
+class TestSnapshotWorkspace(unittest.TestCase):
+
+    def setUp(self):
+        self.configurador = ConfiguradorSimulacao()
+        calculadora = CalculadoraSimulacao(self.configurador)
+        self.ids = [self.configurador.criar_simulacao(f"S{i}") for i in range(3)]
+        for id_simulacao in self.ids:
+            calculadora.calcular_simulacao(id_simulacao)
+        self.esperados = {id_sim: list(self.configurador.simulacoes[id_sim].resultados)
+                          for id_sim in self.ids}
+
+    def test_captura_nao_materializa_resultados_descartados(self):
+        self.configurador.definir_orcamento_resultados(1)  # só a última fica em memória
+        uso_antes = self.configurador.obter_uso_memoria()
+        ordem_antes = list(self.configurador._uso_resultados)
+
+        metadados, buffers = capturar_snapshot(self.configurador)
+
+        uso_depois = self.configurador.obter_uso_memoria()
+        self.assertEqual(list(self.configurador._uso_resultados), ordem_antes)
+        self.assertEqual(uso_depois['simulacoes_descartadas'], uso_antes['simulacoes_descartadas'])
+        self.assertEqual(uso_depois['descartes'], uso_antes['descartes'])
+
+        restaurado = ConfiguradorSimulacao()
+        restaurar_snapshot(restaurado, metadados, buffers)
+        for id_simulacao in self.ids:
+            self.assertEqual(restaurado.consultar_resultados(id_simulacao), self.esperados[id_simulacao])
+
+    def test_snapshot_restaurado_e_recapturado_sem_abrir(self):
+        restaurado = ConfiguradorSimulacao()
+        restaurar_snapshot(restaurado, *capturar_snapshot(self.configurador))
+        pendentes = restaurado.obter_uso_memoria()['simulacoes_pendentes']
+
+        copia = ConfiguradorSimulacao()
+        restaurar_snapshot(copia, *capturar_snapshot(restaurado))
+
+        self.assertEqual(restaurado.obter_uso_memoria()['simulacoes_pendentes'], pendentes)
+        for id_simulacao in self.ids:
+            self.assertEqual(copia.obter_simulacao(id_simulacao).resultados, self.esperados[id_simulacao])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Testes do workspace em banco SQLite (UC03 - RepositorioSQLite)
+
+Execute com:
+
+    python -m pytest -q
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from main import SistemaSimulacaoInvestimentos, TipoTaxa
+
+
+class TestRepositorioSQLite(unittest.TestCase):
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.banco = os.path.join(self.diretorio, "workspace.db")
+        self.sistema = SistemaSimulacaoInvestimentos()
+        self.ids = [self.sistema.criar_simulacao(f"S{i}") for i in range(3)]
+        self.sistema.configurar_simulacao(self.ids[1], tipo_taxa=TipoTaxa.VARIAVEL, prazo_meses=3,
+                                          taxas_variaveis=[0.5, 0.6, 0.7])
+        for id_simulacao in self.ids:
+            self.sistema.calcular_simulacao(id_simulacao)
+        self.assertTrue(self.sistema.salvar_workspace_sqlite(self.banco)[0])
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def _carregar(self) -> SistemaSimulacaoInvestimentos:
+        sistema = SistemaSimulacaoInvestimentos()
+        sucesso, ids = sistema.carregar_workspace_sqlite(self.banco)
+        self.assertTrue(sucesso)
+        self.assertEqual(ids, self.ids)
+        return sistema
+
+    def test_ida_e_volta(self):
+        sistema = self._carregar()
+        for id_simulacao in self.ids:
+            original = self.sistema.gerenciador.obter_simulacao(id_simulacao)
+            lida = sistema.gerenciador.obter_simulacao(id_simulacao)
+            self.assertEqual(lida.to_dict(), original.to_dict())
+
+    def test_salvar_nao_abre_resultados_intactos(self):
+        sistema = self._carregar()
+        uso = sistema.obter_uso_memoria()
+        self.assertTrue(sistema.salvar_workspace_sqlite(self.banco)[0])
+        self.assertEqual(sistema.obter_uso_memoria(), uso)
+
+        relido = self._carregar()
+        for id_simulacao in self.ids:
+            self.assertEqual(relido.gerenciador.obter_simulacao(id_simulacao).resultados,
+                             self.sistema.gerenciador.obter_simulacao(id_simulacao).resultados)
+
+    def test_alteracoes_e_exclusoes_sao_gravadas(self):
+        sistema = self._carregar()
+        sistema.configurar_simulacao(self.ids[0], aporte_mensal=321.0)
+        sistema.calcular_simulacao(self.ids[0])
+        sistema.excluir_simulacao(self.ids[2])
+        self.assertTrue(sistema.salvar_workspace_sqlite(self.banco)[0])
+
+        relido = SistemaSimulacaoInvestimentos()
+        sucesso, ids = relido.carregar_workspace_sqlite(self.banco)
+        self.assertTrue(sucesso)
+        self.assertEqual(ids, self.ids[:2])
+        simulacao = relido.gerenciador.obter_simulacao(self.ids[0])
+        self.assertEqual(simulacao.aporte_mensal, 321.0)
+        self.assertEqual(simulacao.resultados,
+                         sistema.gerenciador.obter_simulacao(self.ids[0]).resultados)
+
+
+if __name__ == "__main__":
+    unittest.main()